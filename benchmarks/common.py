@@ -0,0 +1,34 @@
+import os
+
+# Benchmarks measure the SDK itself, keep telemetry and metric export quiet
+os.environ.setdefault("ELIXIR_TELEMETRY_ENABLED", "false")
+os.environ.setdefault("ELIXIR_METRICS_ENABLED", "false")
+os.environ.setdefault("ELIXIR_SUPPRESS_WARNINGS", "true")
+
+from typing import Optional, Sequence  # noqa: E402
+
+from opentelemetry.sdk.trace import ReadableSpan  # noqa: E402
+from opentelemetry.sdk.trace.export import (  # noqa: E402
+    SpanExporter,
+    SpanExportResult,
+)
+
+from elixir import Elixir  # noqa: E402
+
+
+class NullSpanExporter(SpanExporter):
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        return SpanExportResult.SUCCESS
+
+
+def init_elixir(
+    exporter: Optional[SpanExporter] = None, disable_batch: bool = True, **kwargs
+) -> SpanExporter:
+    exporter = exporter or NullSpanExporter()
+    Elixir.init(
+        app_name="benchmark",
+        disable_batch=disable_batch,
+        _test_exporter=exporter,
+        **kwargs,
+    )
+    return exporter
@@ -0,0 +1,226 @@
+"""Per-call overhead benchmark for the observe/aobserve decorators.
+
+Each case times a decorated entity against the same undecorated function and
+reports the per-call overhead in nanoseconds. Span processor modes run in
+separate processes since the tracer provider can only be set once.
+Timings depend on the machine, so the baseline is a previous run recorded with
+`--output` on the same one. The check fails when the baseline is missing or
+lacks a case.
+
+    python -m benchmarks.decorator_overhead --output results.json
+    python -m benchmarks.decorator_overhead --baseline results.json --tolerance 0.25
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.common import init_elixir
+from elixir.decorators import aobserve, observe
+
+MODES = ["uninitialized", "simple", "batch"]
+
+SMALL_PAYLOAD = {"query": "what is my copay?", "top_k": 5}
+LARGE_PAYLOAD = {
+    "query": "what is my copay?",
+    "context": ["lorem ipsum dolor sit amet " * 40 for _ in range(500)],
+}
+
+
+def _sync(payload):
+    return payload
+
+
+async def _async(payload):
+    return payload
+
+
+def _generator(payload):
+    yield payload
+    yield payload
+    yield payload
+
+
+def _nested_chain(depth: int) -> Callable:
+    fn = _sync
+    for level in range(depth):
+        fn = observe(name=f"level_{level}")(fn)
+    return fn
+
+
+def _time_sync(fn: Callable, payload, iterations: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        fn(payload)
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def _time_generator(fn: Callable, payload, iterations: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        for _ in fn(payload):
+            pass
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def _time_async(fn: Callable, payload, iterations: int) -> float:
+    async def loop():
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            await fn(payload)
+        return (time.perf_counter_ns() - start) / iterations
+
+    return asyncio.run(loop())
+
+
+def _measure(timer, plain, decorated, payload, iterations, repeat) -> Dict:
+    # Best of `repeat` runs filters out scheduler noise
+    plain_ns = min(timer(plain, payload, iterations) for _ in range(repeat))
+    decorated_ns = min(timer(decorated, payload, iterations) for _ in range(repeat))
+    return {
+        "plain_ns": round(plain_ns, 1),
+        "decorated_ns": round(decorated_ns, 1),
+        "overhead_ns": round(decorated_ns - plain_ns, 1),
+    }
+
+
+def run_mode(mode: str, iterations: int, repeat: int) -> List[Dict]:
+    exporter = None
+    if mode != "uninitialized":
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+            InMemorySpanExporter,
+        )
+
+        exporter = init_elixir(
+            exporter=InMemorySpanExporter(), disable_batch=mode == "simple"
+        )
+
+    cases = [
+        ("sync", _time_sync, _sync, observe(name="sync")(_sync)),
+        ("async", _time_async, _async, aobserve(name="async")(_async)),
+        (
+            "generator",
+            _time_generator,
+            _generator,
+            observe(name="generator")(_generator),
+        ),
+        ("nested_chain_4", _time_sync, _sync, _nested_chain(4)),
+    ]
+
+    results = []
+    for case, timer, plain, decorated in cases:
+        for payload_name, payload in (
+            ("small", SMALL_PAYLOAD),
+            ("large", LARGE_PAYLOAD),
+        ):
+            result = _measure(timer, plain, decorated, payload, iterations, repeat)
+            result.update({"mode": mode, "case": case, "payload": payload_name})
+            results.append(result)
+            if exporter is not None:
+                exporter.clear()
+    return results
+
+
+def _run_isolated(mode: str, iterations: int, repeat: int) -> List[Dict]:
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.decorator_overhead",
+            "--mode",
+            mode,
+            "--iterations",
+            str(iterations),
+            "--repeat",
+            str(repeat),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output[output.index("{") :])["results"]
+
+
+def _key(result: Dict) -> str:
+    return f"{result['mode']}/{result['case']}/{result['payload']}"
+
+
+def check_regressions(
+    results: List[Dict], baseline: List[Dict], tolerance: float, slack_ns: float
+) -> List[str]:
+    baseline_by_key = {_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        previous = baseline_by_key.get(_key(result))
+        if previous is None:
+            regressions.append(f"{_key(result)}: missing from the baseline")
+            continue
+        limit = previous["overhead_ns"] * (1 + tolerance) + slack_ns
+        if result["overhead_ns"] > limit:
+            regressions.append(
+                f"{_key(result)}: {result['overhead_ns']}ns > {limit:.1f}ns"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=MODES + ["all"], default="all")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed relative overhead increase over the baseline",
+    )
+    parser.add_argument(
+        "--slack-ns",
+        type=float,
+        default=500,
+        help="allowed absolute overhead increase, absorbs noise on tiny cases",
+    )
+    args = parser.parse_args()
+
+    if args.baseline and not os.path.exists(args.baseline):
+        print(
+            f"No baseline at {args.baseline}, record one with --output",
+            file=sys.stderr,
+        )
+        return 2
+
+    if args.mode == "all":
+        results = []
+        for mode in MODES:
+            results.extend(_run_isolated(mode, args.iterations, args.repeat))
+    else:
+        results = run_mode(args.mode, args.iterations, args.repeat)
+
+    report = {"python": sys.version.split()[0], "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = check_regressions(
+            results, baseline, args.tolerance, args.slack_ns
+        )
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
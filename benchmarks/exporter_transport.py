@@ -0,0 +1,145 @@
+"""Span export transport benchmark against a local stand-in collector.
+
+Exports batches of spans carrying large prompts over OTLP/HTTP with and without
+gzip, and with pooled connections versus a new connection per export. Reports
+the bytes received by the collector and the export latency.
+
+    python -m benchmarks.exporter_transport --batches 50 --output results.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+import benchmarks.common  # noqa: F401, quiets telemetry
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+
+from elixir.config.transport import Compression, ExporterOptions
+from elixir.tracing.tracing import init_spans_exporter
+
+PROMPT = "You are a helpful assistant. Summarize the following call transcript. " * 200
+
+
+class StandInCollector:
+    """Accepts OTLP/HTTP exports and counts the bytes and connections."""
+
+    def __init__(self):
+        self.bytes_received = 0
+        self.connections = 0
+
+        collector = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                collector.connections += 1
+
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                self.rfile.read(length)
+                collector.bytes_received += length
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.endpoint = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def reset(self) -> None:
+        self.bytes_received = 0
+        self.connections = 0
+
+
+def make_batch(size: int) -> List[ReadableSpan]:
+    tracer = TracerProvider().get_tracer("benchmark")
+    spans = []
+    for i in range(size):
+        span = tracer.start_span(
+            "openai.chat",
+            attributes={
+                "gen_ai.prompt.0.content": f"{i} {PROMPT}",
+                "gen_ai.completion.0.content": f"{i} {PROMPT[:2000]}",
+            },
+        )
+        span.end()
+        spans.append(span)
+    return spans
+
+
+def measure(
+    collector: StandInCollector,
+    compression: str,
+    reuse_connections: bool,
+    batches: int,
+    batch_size: int,
+) -> Dict:
+    exporter = init_spans_exporter(
+        collector.endpoint, {}, ExporterOptions(compression=compression)
+    )
+    if not reuse_connections:
+        exporter._session.headers["Connection"] = "close"
+    batch = make_batch(batch_size)
+
+    collector.reset()
+    latencies = []
+    for _ in range(batches):
+        start = time.perf_counter()
+        exporter.export(batch)
+        latencies.append(time.perf_counter() - start)
+    exporter.shutdown()
+
+    latencies.sort()
+    return {
+        "compression": compression,
+        "reuse_connections": reuse_connections,
+        "bytes_per_batch": collector.bytes_received // batches,
+        "connections": collector.connections,
+        "latency_mean_ms": round(statistics.mean(latencies) * 1000, 3),
+        "latency_p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batches", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    collector = StandInCollector()
+    results = [
+        measure(collector, compression, reuse, args.batches, args.batch_size)
+        for compression, reuse in [
+            (Compression.NONE, True),
+            (Compression.GZIP, True),
+            (Compression.GZIP, False),
+        ]
+    ]
+    collector.server.shutdown()
+
+    report = {
+        "results": results,
+        "gzip_bytes_ratio": round(
+            results[1]["bytes_per_batch"] / results[0]["bytes_per_batch"], 4
+        ),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
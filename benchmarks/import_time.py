@@ -0,0 +1,85 @@
+"""Startup benchmark comparing eager and lazy instrumentation.
+
+Runs `Elixir.init` in a fresh interpreter under `python -X importtime` for
+both modes and reports the wall time of init and the cumulative import time
+of everything it pulled in.
+
+    python -m benchmarks.import_time
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from typing import Dict
+
+INIT_CODE = """
+import time
+from benchmarks.common import init_elixir
+
+start = time.perf_counter()
+init_elixir(lazy_instrumentation={lazy})
+print("init_seconds", time.perf_counter() - start)
+"""
+
+# import time:  self [us] | cumulative | imported package
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(lazy: bool) -> Dict:
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", INIT_CODE.format(lazy=lazy)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    init_seconds = float(
+        next(
+            line.split()[1]
+            for line in output.stdout.splitlines()
+            if line.startswith("init_seconds")
+        )
+    )
+
+    modules = 0
+    import_us = 0
+    for line in output.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match is None:
+            continue
+        modules += 1
+        # Top level imports only, nested ones are part of their cumulative time
+        if len(match.group(3)) == 1:
+            import_us += int(match.group(2))
+
+    return {
+        "lazy": lazy,
+        "init_seconds": round(init_seconds, 4),
+        "import_seconds": round(import_us / 1e6, 4),
+        "modules_imported": modules,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    results = [measure(lazy=False), measure(lazy=True)]
+    report = {
+        "results": results,
+        "init_speedup": round(
+            results[0]["init_seconds"] / max(results[1]["init_seconds"], 1e-9), 1
+        ),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
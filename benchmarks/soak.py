@@ -0,0 +1,77 @@
+"""Soak benchmark for the observe decorators.
+
+Runs a large number of nested decorated calls and samples traced memory along
+the way, failing if the footprint keeps growing or the active context leaks.
+
+    python -m benchmarks.soak --calls 1000000
+"""
+
+import argparse
+import json
+import sys
+import tracemalloc
+
+from opentelemetry import context as context_api
+
+from benchmarks.common import init_elixir
+from elixir.decorators import observe
+
+
+@observe(name="task")
+def task(value: int):
+    return value
+
+
+@observe(name="workflow")
+def workflow(value: int):
+    return task(value)
+
+
+def run(calls: int, samples: int) -> dict:
+    interval = max(calls // samples, 1)
+    before = context_api.get_current()
+
+    # Warm up caches and lazily created objects before measuring
+    for i in range(1000):
+        workflow(i)
+
+    tracemalloc.start()
+    memory = []
+    for i in range(calls):
+        workflow(i)
+        if i % interval == 0:
+            memory.append(tracemalloc.get_traced_memory()[0])
+    memory.append(tracemalloc.get_traced_memory()[0])
+    tracemalloc.stop()
+
+    return {
+        "calls": calls,
+        "memory_bytes": memory,
+        "memory_growth_bytes": memory[-1] - memory[0],
+        "context_restored": context_api.get_current() is before,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument(
+        "--max-growth-bytes",
+        type=int,
+        default=256 * 1024,
+        help="fail if traced memory grows more than this over the run",
+    )
+    args = parser.parse_args()
+
+    init_elixir()
+    result = run(args.calls, args.samples)
+    print(json.dumps(result, indent=2))
+
+    if not result["context_restored"]:
+        return 1
+    return 0 if result["memory_growth_bytes"] <= args.max_growth_bytes else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
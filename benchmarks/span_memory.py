@@ -0,0 +1,107 @@
+"""Peak memory benchmark for a burst of spans carrying large prompts.
+
+Starts a batch span processor that doesn't export during the burst, so every
+span stays queued, then records spans with a distinct prompt of `--prompt-kb`
+each. Runs in a fresh interpreter with and without attribute limits and
+reports the peak RSS of each.
+
+    python -m benchmarks.span_memory --spans 2000 --prompt-kb 100
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from typing import Dict
+
+BURST_CODE = """
+import resource
+import sys
+
+from benchmarks.common import init_elixir
+from elixir.tracing.tracing import TracerWrapper
+
+
+def peak_rss_bytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+init_elixir(
+    disable_batch=False,
+    max_queue_size={spans},
+    max_export_batch_size={spans},
+    schedule_delay_millis=3_600_000,
+    **{limits},
+)
+tracer = TracerWrapper.instance.get_tracer()
+prompt = "You are a helpful assistant. Summarize the call transcript. " * (
+    {prompt_kb} * 1024 // 60
+)
+
+before = peak_rss_bytes()
+for i in range({spans}):
+    with tracer.start_as_current_span(
+        "openai.chat", attributes={{"gen_ai.prompt.0.content": f"{{i}} {{prompt}}"}}
+    ) as span:
+        span.set_attribute("gen_ai.completion.0.content", f"{{i}} {{prompt[:4096]}}")
+print("peak_rss_bytes", before, peak_rss_bytes())
+"""
+
+LIMITS = {
+    "unlimited": {},
+    "limited": {
+        "max_attribute_bytes": 16 * 1024,
+        "attribute_key_limits": {"gen_ai.prompt.*": 4 * 1024},
+    },
+}
+
+
+def measure(mode: str, spans: int, prompt_kb: int) -> Dict:
+    code = BURST_CODE.format(
+        spans=spans, prompt_kb=prompt_kb, limits=repr(LIMITS[mode])
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+    before, after = next(
+        map(int, line.split()[1:])
+        for line in output.stdout.splitlines()
+        if line.startswith("peak_rss_bytes")
+    )
+    return {
+        "mode": mode,
+        "limits": LIMITS[mode],
+        "peak_rss_mb": round(after / 2**20, 1),
+        "burst_rss_growth_mb": round((after - before) / 2**20, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--spans", type=int, default=2000)
+    parser.add_argument("--prompt-kb", type=int, default=100)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    results = [measure(mode, args.spans, args.prompt_kb) for mode in LIMITS]
+    report = {
+        "spans": args.spans,
+        "prompt_kb": args.prompt_kb,
+        "results": results,
+        "growth_ratio": round(
+            results[1]["burst_rss_growth_mb"]
+            / max(results[0]["burst_rss_growth_mb"], 0.1),
+            4,
+        ),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
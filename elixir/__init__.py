@@ -2,15 +2,31 @@ import json
 import os
 import sys
 
-from typing import Optional, Set
+from typing import Optional, Sequence, Set, Union
 from colorama import Fore
 from opentelemetry.sdk.resources import SERVICE_NAME
 from opentelemetry.sdk.trace.export import SpanExporter
 from opentelemetry.sdk.metrics.export import MetricReader
+from opentelemetry.sdk.metrics.view import View
 
 from elixir.api.requests import post_body_request, post_file_request
-from elixir.config.constants import get_collector_url
+from elixir.config.constants import (
+    get_collector_url,
+    get_metrics_export_interval,
+    get_metrics_temporality,
+)
+from elixir.config.transport import ExporterOptions
+from elixir.metrics.cardinality import DEFAULT_MAX_SERIES
 from elixir.metrics.metrics import MetricsWrapper
+from elixir.metrics.pipeline import pipeline_stats
+from elixir.metrics.readers import Temporality
+from elixir.metrics.views import (
+    DEFAULT_EXPONENTIAL_MAX_SCALE,
+    DEFAULT_EXPONENTIAL_MAX_SIZE,
+    HistogramAggregation,
+    HistogramOptions,
+)
+from elixir.startup import StartupReport, get_startup_report, reset_startup_report
 from elixir.telemetry import Telemetry
 from elixir.instruments import Instruments
 from elixir.config import (
@@ -19,8 +35,14 @@ from elixir.config import (
 )
 from elixir.tracing.tracing import (
     TracerWrapper,
+    init_sampler,
     set_association_properties,
 )
+from elixir.tracing.context_manager import AssociationScope
+from elixir.tracing.deferred import CopyPolicy
+from elixir.tracing.limits import AttributeLimits
+from elixir.tracing.serialization import DEFAULT_MAX_BYTES, EntitySerializer
+from elixir.tracing.spool import DEFAULT_MAX_SPOOL_BYTES
 from typing import Dict
 
 
@@ -37,14 +59,50 @@ class Elixir:
         should_enrich_metrics: bool = True,
         resource_attributes: dict = {},
         instruments: Optional[Set[Instruments]] = None,
+        max_entity_bytes: int = DEFAULT_MAX_BYTES,
+        sampling_ratio: Optional[float] = None,
+        defer_serialization: bool = False,
+        payload_copy_policy: str = CopyPolicy.NONE,
+        lazy_instrumentation: bool = False,
+        emit_startup_span: bool = False,
+        adaptive_batching: bool = False,
+        max_queue_size: Optional[int] = None,
+        max_export_batch_size: Optional[int] = None,
+        schedule_delay_millis: Optional[float] = None,
+        export_timeout_millis: Optional[float] = None,
+        spool_directory: Optional[str] = None,
+        spool_max_bytes: int = DEFAULT_MAX_SPOOL_BYTES,
+        exporter_protocol: Optional[str] = None,
+        exporter_compression: Optional[str] = None,
+        exporter_timeout: Optional[float] = None,
+        exporter_keepalive_time_ms: Optional[int] = None,
+        max_span_attributes: Optional[int] = None,
+        max_attribute_bytes: Optional[int] = None,
+        attribute_key_limits: Optional[Dict[str, int]] = None,
+        metrics_export_interval_millis: Optional[float] = None,
+        adaptive_metrics_export: bool = False,
+        metrics_temporality: str = Temporality.CUMULATIVE,
+        histogram_aggregation: str = HistogramAggregation.EXPLICIT,
+        exponential_histogram_max_scale: int = DEFAULT_EXPONENTIAL_MAX_SCALE,
+        exponential_histogram_max_size: int = DEFAULT_EXPONENTIAL_MAX_SIZE,
+        metric_views: Sequence[View] = (),
+        metric_association_keys: Optional[Set[str]] = None,
+        max_metric_series: int = DEFAULT_MAX_SERIES,
         _test_exporter: SpanExporter = None,
         _test_metrics_reader: MetricReader = None,
     ) -> None:
-        Telemetry()
+        startup_report = reset_startup_report()
+        with startup_report.measure("telemetry"):
+            Telemetry()
 
         Elixir.api_endpoint = get_collector_url()
         Elixir.api_key = os.getenv("ELIXIR_API_KEY") or api_key
-        Elixir.association_properties = {}
+        exporter_options = ExporterOptions(
+            protocol=exporter_protocol,
+            compression=exporter_compression,
+            timeout=exporter_timeout,
+            keepalive_time_ms=exporter_keepalive_time_ms,
+        )
 
         if not is_tracing_enabled():
             print(Fore.YELLOW + "Tracing is disabled" + Fore.RESET)
@@ -57,13 +115,30 @@ class Elixir:
             # Tracer init
             resource_attributes.update({SERVICE_NAME: app_name})
             TracerWrapper.set_static_params(
-                resource_attributes, Elixir.api_endpoint, headers
+                resource_attributes, Elixir.api_endpoint, headers, exporter_options
             )
             Elixir.__tracer_wrapper = TracerWrapper(
                 disable_batch=disable_batch,
                 should_enrich_metrics=should_enrich_metrics,
                 instruments=instruments,
                 exporter=_test_exporter,
+                entity_serializer=EntitySerializer(max_bytes=max_entity_bytes),
+                sampler=init_sampler(sampling_ratio),
+                defer_serialization=defer_serialization,
+                payload_copy_policy=payload_copy_policy,
+                lazy_instrumentation=lazy_instrumentation,
+                adaptive_batching=adaptive_batching,
+                max_queue_size=max_queue_size,
+                max_export_batch_size=max_export_batch_size,
+                schedule_delay_millis=schedule_delay_millis,
+                export_timeout_millis=export_timeout_millis,
+                spool_directory=spool_directory,
+                spool_max_bytes=spool_max_bytes,
+                attribute_limits=AttributeLimits(
+                    max_attributes=max_span_attributes,
+                    max_attribute_bytes=max_attribute_bytes,
+                    key_limits=attribute_key_limits,
+                ),
             )
 
         if not is_metrics_enabled():
@@ -75,10 +150,51 @@ class Elixir:
             }
 
             MetricsWrapper.set_static_params(
-                resource_attributes, Elixir.api_endpoint, metrics_headers
+                resource_attributes,
+                Elixir.api_endpoint,
+                metrics_headers,
+                exporter_options,
             )
 
-            Elixir.__metrics_wrapper = MetricsWrapper(reader=_test_metrics_reader)
+            Elixir.__metrics_wrapper = MetricsWrapper(
+                reader=_test_metrics_reader,
+                export_interval_millis=get_metrics_export_interval()
+                or metrics_export_interval_millis,
+                adaptive_export=adaptive_metrics_export,
+                temporality=get_metrics_temporality() or metrics_temporality,
+                histogram_options=HistogramOptions(
+                    aggregation=histogram_aggregation,
+                    max_scale=exponential_histogram_max_scale,
+                    max_size=exponential_histogram_max_size,
+                ),
+                views=metric_views,
+                association_keys=metric_association_keys,
+                max_series=max_metric_series,
+            )
+
+        if emit_startup_span and is_tracing_enabled():
+            startup_report.record_spans(TracerWrapper.instance.get_tracer())
+
+    def startup_report() -> StartupReport:
+        return get_startup_report()
+
+    def pipeline_stats() -> dict:
+        stats = pipeline_stats.snapshot()
+        entity_metrics = MetricsWrapper.get_entity_metrics()
+        stats["metric_series_dropped"] = (
+            entity_metrics.dropped_series() if entity_metrics is not None else {}
+        )
+        return stats
+
+    def enable_instrument(instrument: Union[str, Instruments]) -> bool:
+        if not TracerWrapper.verify_initialized():
+            return False
+        return TracerWrapper.instance.enable_instrument(instrument)
+
+    def disable_instrument(instrument: Union[str, Instruments]) -> bool:
+        if not TracerWrapper.verify_initialized():
+            return False
+        return TracerWrapper.instance.disable_instrument(instrument)
 
     def track_user(user_id: str, user_properties: Optional[dict] = None) -> None:
         association_properties = {"user_id": user_id}
@@ -97,8 +213,24 @@ class Elixir:
         Elixir.set_association_properties(association_properties)
 
     def set_association_properties(properties: dict) -> None:
-        Elixir.association_properties = Elixir.association_properties | properties
-        set_association_properties(Elixir.association_properties)
+        set_association_properties(properties)
+
+    def conversation(
+        conversation_id: str,
+        user_id: Optional[str] = None,
+        conversation_properties: Optional[dict] = None,
+        user_properties: Optional[dict] = None,
+    ) -> AssociationScope:
+        association_properties = {"conversation_id": conversation_id}
+        if conversation_properties:
+            association_properties["conversation_properties"] = json.dumps(
+                conversation_properties
+            )
+        if user_id:
+            association_properties["user_id"] = user_id
+        if user_properties:
+            association_properties["user_properties"] = json.dumps(user_properties)
+        return AssociationScope(association_properties)
 
     async def upload_audio(
         conversation_id: str,
@@ -1,4 +1,6 @@
+import logging
 import os
+from typing import Optional
 
 
 def get_base_url() -> bool:
@@ -7,3 +9,18 @@ def get_base_url() -> bool:
 
 def get_collector_url() -> bool:
     return os.getenv("ELIXIR_COLLECTOR_URL") or "https://api.tryelixir.ai/ingestion"
+
+
+def get_metrics_export_interval() -> Optional[float]:
+    value = os.getenv("ELIXIR_METRICS_EXPORT_INTERVAL")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        logging.warning(f"Ignoring invalid ELIXIR_METRICS_EXPORT_INTERVAL: {value}")
+        return None
+
+
+def get_metrics_temporality() -> Optional[str]:
+    return os.getenv("ELIXIR_METRICS_TEMPORALITY")
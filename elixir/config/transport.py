@@ -0,0 +1,164 @@
+import os
+from typing import Any, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import grpc
+import requests
+from grpc import Compression as GRPCCompression
+from opentelemetry.exporter.otlp.proto.grpc.exporter import environ_to_compression
+from opentelemetry.exporter.otlp.proto.http import Compression as HTTPCompression
+from opentelemetry.sdk.environment_variables import (
+    OTEL_EXPORTER_OTLP_CERTIFICATE,
+    OTEL_EXPORTER_OTLP_COMPRESSION,
+    OTEL_EXPORTER_OTLP_INSECURE,
+)
+from requests.adapters import HTTPAdapter
+
+
+class Protocol:
+    GRPC = "grpc"
+    HTTP = "http/protobuf"
+
+
+class Compression:
+    GZIP = "gzip"
+    NONE = "none"
+
+
+PROTOCOLS = (Protocol.GRPC, Protocol.HTTP)
+COMPRESSIONS = (Compression.GZIP, Compression.NONE)
+
+# Connections kept open to the collector per exporter. Export runs on a single
+# worker thread, the spare ones cover force_flush calls from other threads.
+DEFAULT_POOL_MAXSIZE = 4
+# gRPC's own default for how long to wait for a keepalive ping to be answered
+DEFAULT_KEEPALIVE_TIMEOUT_MS = 20_000
+
+
+class ExporterOptions:
+    """How span and metric exporters talk to the collector.
+
+    `protocol` defaults to HTTP when the endpoint contains "http" and gRPC
+    otherwise. `compression` unset leaves it to the OTLP exporters, which read
+    `OTEL_EXPORTER_OTLP_COMPRESSION` and send uncompressed by default.
+    `timeout` is in seconds, unset uses the OTLP default of 10.
+
+    `keepalive_time_ms` makes the gRPC channel ping an idle collector
+    connection so it is not dropped between exports. `grpc_channel_options`
+    are passed to the gRPC channel as they are.
+    """
+
+    __slots__ = (
+        "protocol",
+        "compression",
+        "timeout",
+        "pool_maxsize",
+        "keepalive_time_ms",
+        "keepalive_timeout_ms",
+        "grpc_channel_options",
+    )
+
+    def __init__(
+        self,
+        protocol: Optional[str] = None,
+        compression: Optional[str] = None,
+        timeout: Optional[float] = None,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        keepalive_time_ms: Optional[int] = None,
+        keepalive_timeout_ms: int = DEFAULT_KEEPALIVE_TIMEOUT_MS,
+        grpc_channel_options: Sequence[Tuple[str, Any]] = (),
+    ):
+        if protocol is not None and protocol not in PROTOCOLS:
+            raise ValueError(f"protocol must be one of {', '.join(PROTOCOLS)}")
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f"compression must be one of {', '.join(COMPRESSIONS)}")
+        if keepalive_time_ms is not None and keepalive_time_ms <= 0:
+            raise ValueError("keepalive_time_ms must be greater than 0")
+
+        self.protocol = protocol
+        self.compression = compression
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.keepalive_time_ms = keepalive_time_ms
+        self.keepalive_timeout_ms = keepalive_timeout_ms
+        self.grpc_channel_options = tuple(grpc_channel_options)
+
+    def protocol_for(self, endpoint: str) -> str:
+        if self.protocol is not None:
+            return self.protocol
+        return Protocol.HTTP if "http" in endpoint.lower() else Protocol.GRPC
+
+    def http_compression(self) -> Optional[HTTPCompression]:
+        if self.compression is None:
+            return None
+        if self.compression == Compression.GZIP:
+            return HTTPCompression.Gzip
+        return HTTPCompression.NoCompression
+
+    def grpc_compression(self) -> Optional[GRPCCompression]:
+        if self.compression is None:
+            return None
+        if self.compression == Compression.GZIP:
+            return GRPCCompression.Gzip
+        return GRPCCompression.NoCompression
+
+    def channel_options(self) -> List[Tuple[str, Any]]:
+        options = []
+        if self.keepalive_time_ms is not None:
+            options += [
+                ("grpc.keepalive_time_ms", self.keepalive_time_ms),
+                ("grpc.keepalive_timeout_ms", self.keepalive_timeout_ms),
+            ]
+        return options + list(self.grpc_channel_options)
+
+    def grpc_channel(self, endpoint: str) -> Optional[grpc.Channel]:
+        """A channel to `endpoint` with the channel options, None without any.
+
+        The OTLP gRPC exporters in the pinned version build their channel
+        without options. This one is set up the same way, secure unless the
+        endpoint or `OTEL_EXPORTER_OTLP_INSECURE` says otherwise.
+        """
+        options = self.channel_options()
+        if not options:
+            return None
+
+        compression = self.grpc_compression()
+        if compression is None:
+            compression = environ_to_compression(OTEL_EXPORTER_OTLP_COMPRESSION)
+        parsed = urlparse(endpoint)
+        target = parsed.netloc or endpoint
+        if _grpc_insecure(parsed.scheme):
+            return grpc.insecure_channel(
+                target, options=options, compression=compression
+            )
+        return grpc.secure_channel(
+            target, _grpc_credentials(), options=options, compression=compression
+        )
+
+    def http_session(self) -> requests.Session:
+        # One session per exporter, the exporters set their headers on it
+        session = requests.Session()
+        # Retries are left to the exporter and the span spool
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.pool_maxsize, max_retries=0
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+
+def _grpc_insecure(scheme: str) -> bool:
+    if scheme == "https":
+        return False
+    insecure = os.getenv(OTEL_EXPORTER_OTLP_INSECURE)
+    if insecure is not None:
+        return insecure.lower() == "true"
+    return scheme == "http"
+
+
+def _grpc_credentials() -> grpc.ChannelCredentials:
+    certificate_file = os.getenv(OTEL_EXPORTER_OTLP_CERTIFICATE)
+    if not certificate_file:
+        return grpc.ssl_channel_credentials()
+    with open(certificate_file, "rb") as f:
+        return grpc.ssl_channel_credentials(f.read())
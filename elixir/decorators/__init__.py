@@ -1,4 +1,5 @@
-from typing import Optional
+import inspect
+from typing import Iterable, Optional
 
 
 from elixir.decorators.base import (
@@ -7,18 +8,38 @@ from elixir.decorators.base import (
     entity_class,
     entity_method,
 )
+from elixir.decorators.base import no_observe  # noqa: F401
 
 
-def observe(name: Optional[str] = None, method_name: Optional[str] = None):
-    if method_name is None:
-        return entity_method(name=name)
-    else:
+def observe(
+    name: Optional[str] = None,
+    method_name: Optional[str] = None,
+    methods: Optional[Iterable[str]] = None,
+):
+    if method_name is not None:
         return entity_class(name=name, method_name=method_name)
 
+    def decorate(target):
+        # Classes get every public method (or `methods`) instrumented
+        if inspect.isclass(target):
+            return entity_class(name=name, methods=methods)(target)
+        return entity_method(name=name)(target)
+
+    return decorate
+
 
 # Async Decorators
-def aobserve(name: Optional[str] = None, method_name: Optional[str] = None):
-    if method_name is None:
-        return aentity_method(name=name)
-    else:
+def aobserve(
+    name: Optional[str] = None,
+    method_name: Optional[str] = None,
+    methods: Optional[Iterable[str]] = None,
+):
+    if method_name is not None:
         return aentity_class(name=name, method_name=method_name)
+
+    def decorate(target):
+        if inspect.isclass(target):
+            return aentity_class(name=name, methods=methods)(target)
+        return aentity_method(name=name)(target)
+
+    return decorate
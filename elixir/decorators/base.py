@@ -1,58 +1,83 @@
-import json
+from collections import abc
 from functools import wraps
-import types
-from typing import Any, Callable, Optional
+import inspect
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 
 from opentelemetry import trace
 from opentelemetry import context as context_api
+from opentelemetry.trace import Status, StatusCode
 
+from elixir.decorators.metadata import EntityMetadata
+from elixir.metrics.entity import ERROR_TYPE
+from elixir.metrics.metrics import MetricsWrapper
 from elixir.telemetry import Telemetry
-from elixir.tracing.context_manager import get_tracer
-from elixir.tracing.semconv import SpanAttributes
-from elixir.tracing.tracing import (
-    TracerWrapper,
-    set_entity_name,
-    get_chained_entity_name,
-)
+from elixir.tracing.semconv import ElixirContextValues, SpanAttributes, StreamStatus
+from elixir.tracing.tracing import TracerWrapper, set_entity_name
 from elixir.utils.string import camel_to_snake
 
 
 def entity_method(name: Optional[str] = None):
     def decorate(fn):
-        @wraps(fn)
-        def wrap(*args, **kwargs):
-            if not TracerWrapper.verify_initialized():
-                return fn(*args, **kwargs)
+        return _entity_method(fn, EntityMetadata(fn, name))
 
-            span_name = _get_span_name(name=name, fn=fn)
+    return decorate
 
-            with get_tracer() as tracer:
-                span = _create_span(
-                    tracer=tracer,
-                    span_name=span_name,
-                    entity_name=name,
-                    args=args,
-                    kwargs=kwargs,
-                )
 
-                res = fn(*args, **kwargs)
+def _entity_method(fn: Callable, metadata: EntityMetadata):
+    @wraps(fn)
+    def wrap(*args, **kwargs):
+        if not TracerWrapper.verify_initialized():
+            return fn(*args, **kwargs)
 
-                # span will be ended in the generator
-                if isinstance(res, types.GeneratorType):
-                    return _handle_generator(span, fn, args, kwargs)
+        span, ctx = _create_span(metadata=metadata, args=args, kwargs=kwargs)
 
-                _trace_output(span, res)
+        start = time.perf_counter()
+        token = context_api.attach(ctx)
+        try:
+            res = fn(*args, **kwargs)
+        except Exception as e:
+            _record_call(ctx, start)
+            _trace_exception(span, ctx, e)
+            span.end()
+            raise
+        except BaseException:
+            # cancellation and interrupts aren't errors of the entity
+            _record_call(ctx, start)
+            span.end()
+            raise
+        finally:
+            context_api.detach(token)
 
-                return res
+        # span will be ended in the generator
+        # also catches the streams of observed entities returned as is
+        if isinstance(res, abc.Generator):
+            return _TracedGenerator(span, ctx, res, start)
 
-        return wrap
+        _record_call(ctx, start)
 
-    return decorate
+        # sampled out, skip output capture
+        if not span.is_recording():
+            span.end()
+            return res
+
+        _trace_output(span, res)
+
+        return res
+
+    return wrap
 
 
-def entity_class(name: Optional[str], method_name: str):
+def entity_class(
+    name: Optional[str],
+    method_name: Optional[str] = None,
+    methods: Optional[Iterable[str]] = None,
+):
     def decorator(cls):
         task_name = name if name else camel_to_snake(cls.__name__)
+        if method_name is None:
+            return _entity_class(cls, task_name, methods)
+
         method = getattr(cls, method_name)
         setattr(cls, method_name, entity_method(name=task_name)(method))
         return cls
@@ -60,11 +85,45 @@ def entity_class(name: Optional[str], method_name: str):
     return decorator
 
 
-def _handle_generator(span, fn, args, kwargs):
-    for part in fn(*args, **kwargs):
-        yield part
-
-    span.end()
+def _handle_generator(
+    span: trace.Span,
+    ctx: context_api.Context,
+    gen: abc.Generator,
+    start: float,
+):
+    recorder = _StreamRecorder(span)
+    status = StreamStatus.CLOSED
+    # Delegates like `yield from`, passing sent values and thrown exceptions
+    # on to the entity's generator
+    sent, thrown = None, None
+    try:
+        while True:
+            # the entity context is only current while the generator runs
+            token = context_api.attach(ctx)
+            try:
+                part = gen.throw(thrown) if thrown is not None else gen.send(sent)
+            except StopIteration as e:
+                result = e.value
+                break
+            finally:
+                context_api.detach(token)
+            recorder.record(part)
+            try:
+                sent, thrown = (yield part), None
+            except GeneratorExit:
+                raise
+            except BaseException as e:
+                sent, thrown = None, e
+        status = StreamStatus.COMPLETED
+        return result
+    except Exception as e:
+        status = StreamStatus.ERROR
+        _trace_exception(span, ctx, e)
+        raise
+    finally:
+        gen.close()
+        _record_call(ctx, start)
+        recorder.end(status)
 
 
 # Async Decorators
@@ -72,40 +131,68 @@ def _handle_generator(span, fn, args, kwargs):
 
 def aentity_method(name: Optional[str] = None):
     def decorate(fn):
-        @wraps(fn)
-        async def wrap(*args, **kwargs):
-            if not TracerWrapper.verify_initialized():
-                return await fn(*args, **kwargs)
+        return _aentity_method(fn, EntityMetadata(fn, name))
+
+    return decorate
 
-            span_name = _get_span_name(name=name, fn=fn)
 
-            with get_tracer() as tracer:
-                span = _create_span(
-                    tracer=tracer,
-                    span_name=span_name,
-                    entity_name=name,
-                    args=args,
-                    kwargs=kwargs,
-                )
+def _aentity_method(fn: Callable, metadata: EntityMetadata):
+    if inspect.isasyncgenfunction(fn):
+        return _aentity_generator(metadata=metadata, fn=fn)
 
-                res = await fn(*args, **kwargs)
+    @wraps(fn)
+    async def wrap(*args, **kwargs):
+        if not TracerWrapper.verify_initialized():
+            return await fn(*args, **kwargs)
 
-                # span will be ended in the generator
-                if isinstance(res, types.AsyncGeneratorType):
-                    return await _ahandle_generator(span, fn, args, kwargs)
+        span, ctx = _create_span(metadata=metadata, args=args, kwargs=kwargs)
 
-                _trace_output(span, res)
+        start = time.perf_counter()
+        token = context_api.attach(ctx)
+        try:
+            res = await fn(*args, **kwargs)
+        except Exception as e:
+            _record_call(ctx, start)
+            _trace_exception(span, ctx, e)
+            span.end()
+            raise
+        except BaseException:
+            # cancellation and interrupts aren't errors of the entity
+            _record_call(ctx, start)
+            span.end()
+            raise
+        finally:
+            context_api.detach(token)
 
-                return res
+        # span will be ended in the generator
+        # also catches the streams of observed entities returned as is
+        if isinstance(res, abc.AsyncGenerator):
+            return _TracedAsyncGenerator(span, ctx, res, start)
 
-        return wrap
+        _record_call(ctx, start)
 
-    return decorate
+        # sampled out, skip output capture
+        if not span.is_recording():
+            span.end()
+            return res
+
+        _trace_output(span, res)
+
+        return res
+
+    return wrap
 
 
-def aentity_class(name: Optional[str], method_name: str):
+def aentity_class(
+    name: Optional[str],
+    method_name: Optional[str] = None,
+    methods: Optional[Iterable[str]] = None,
+):
     def decorator(cls):
         task_name = name if name else camel_to_snake(cls.__name__)
+        if method_name is None:
+            return _entity_class(cls, task_name, methods)
+
         method = getattr(cls, method_name)
         setattr(cls, method_name, aentity_method(name=task_name)(method))
         return cls
@@ -113,51 +200,340 @@ def aentity_class(name: Optional[str], method_name: str):
     return decorator
 
 
-async def _ahandle_generator(span, fn, args, kwargs):
-    async for part in fn(*args, **kwargs):
-        yield part
+def _aentity_generator(metadata: EntityMetadata, fn: Callable):
+    # Returns the wrapping async generator directly so the first chunk isn't
+    # delayed by an extra await
+    @wraps(fn)
+    def wrap(*args, **kwargs):
+        if not TracerWrapper.verify_initialized():
+            return fn(*args, **kwargs)
 
-    span.end()
+        span, ctx = _create_span(metadata=metadata, args=args, kwargs=kwargs)
+
+        # span will be ended in the generator
+        return _TracedAsyncGenerator(
+            span, ctx, fn(*args, **kwargs), time.perf_counter()
+        )
+
+    return wrap
+
+
+async def _ahandle_generator(
+    span: trace.Span,
+    ctx: context_api.Context,
+    agen: abc.AsyncGenerator,
+    start: float,
+):
+    recorder = _StreamRecorder(span)
+    status = StreamStatus.CLOSED
+    # Passes sent values and thrown exceptions on, like `_handle_generator`
+    sent, thrown = None, None
+    try:
+        while True:
+            # the entity context is only current while the generator runs
+            token = context_api.attach(ctx)
+            try:
+                if thrown is not None:
+                    part = await agen.athrow(thrown)
+                else:
+                    part = await agen.asend(sent)
+            except StopAsyncIteration:
+                break
+            finally:
+                context_api.detach(token)
+            recorder.record(part)
+            try:
+                sent, thrown = (yield part), None
+            except GeneratorExit:
+                raise
+            except BaseException as e:
+                sent, thrown = None, e
+        status = StreamStatus.COMPLETED
+    except Exception as e:
+        status = StreamStatus.ERROR
+        _trace_exception(span, ctx, e)
+        raise
+    finally:
+        await agen.aclose()
+        _record_call(ctx, start)
+        recorder.end(status)
 
 
 # Shared helpers
 
 
-def _get_span_name(name: str, fn: Callable) -> str:
-    return name or fn.__name__
+def no_observe(fn: Callable) -> Callable:
+    """Excludes a method from whole-class instrumentation."""
+    fn.__elixir_ignore__ = True
+    return fn
+
+
+def _entity_class(cls: type, task_name: str, methods: Optional[Iterable[str]]):
+    if methods is None:
+        members = [
+            (member_name, member)
+            for member_name, member in vars(cls).items()
+            if not member_name.startswith("_")
+        ]
+    else:
+        members = [
+            (member_name, inspect.getattr_static(cls, member_name))
+            for member_name in methods
+        ]
+
+    # One metadata table per class, shared by all of its wrapped methods
+    entities: Dict[str, EntityMetadata] = {}
+    for member_name, member in members:
+        is_descriptor = isinstance(member, (staticmethod, classmethod))
+        fn = member.__func__ if is_descriptor else member
+        if not inspect.isfunction(fn) or getattr(fn, "__elixir_ignore__", False):
+            continue
+
+        metadata = entities[member_name] = EntityMetadata(
+            fn, f"{task_name}.{member_name}"
+        )
+        if inspect.iscoroutinefunction(fn) or inspect.isasyncgenfunction(fn):
+            wrapped = _aentity_method(fn, metadata)
+        else:
+            wrapped = _entity_method(fn, metadata)
+        setattr(cls, member_name, type(member)(wrapped) if is_descriptor else wrapped)
+
+    cls.__elixir_entities__ = entities
+    return cls
+
+
+class _TracedGenerator(abc.Generator):
+    """The generator returned for a streamed entity.
+
+    Closing or dropping a generator before its first `next()` skips its
+    `finally` block, so the span is ended here in that case.
+    """
+
+    __slots__ = ("_span", "_ctx", "_gen", "_start", "_stream", "_started")
+
+    def __init__(self, span, ctx, gen: abc.Generator, start: float):
+        self._span = span
+        self._ctx = ctx
+        self._gen = gen
+        self._start = start
+        self._stream = _handle_generator(span, ctx, gen, start)
+        self._started = False
+
+    def send(self, value):
+        self._started = True
+        return self._stream.send(value)
+
+    def throw(self, *args):
+        self._end_unstarted()
+        return self._stream.throw(*args)
+
+    def close(self):
+        self._end_unstarted()
+        self._stream.close()
+
+    def __del__(self):
+        self._end_unstarted()
+
+    def _end_unstarted(self):
+        if self._started:
+            return
+        self._started = True
+        self._gen.close()
+        _record_call(self._ctx, self._start)
+        _StreamRecorder(self._span).end(StreamStatus.CLOSED)
+
+
+class _TracedAsyncGenerator(abc.AsyncGenerator):
+    """The async generator returned for a streamed entity.
+
+    Like `_TracedGenerator`, ends the span if the generator is closed or
+    dropped before its first `__anext__()`.
+    """
+
+    __slots__ = ("_span", "_ctx", "_agen", "_start", "_stream", "_started")
+
+    def __init__(self, span, ctx, agen: abc.AsyncGenerator, start: float):
+        self._span = span
+        self._ctx = ctx
+        self._agen = agen
+        self._start = start
+        self._stream = _ahandle_generator(span, ctx, agen, start)
+        self._started = False
+
+    def asend(self, value):
+        self._started = True
+        return self._stream.asend(value)
+
+    def athrow(self, *args):
+        self._end_unstarted()
+        return self._stream.athrow(*args)
+
+    async def aclose(self):
+        if not self._started:
+            self._end_unstarted()
+            await self._agen.aclose()
+        await self._stream.aclose()
+
+    def __del__(self):
+        self._end_unstarted()
+
+    def _end_unstarted(self):
+        if self._started:
+            return
+        self._started = True
+        _record_call(self._ctx, self._start)
+        _StreamRecorder(self._span).end(StreamStatus.CLOSED)
+
+
+class _StreamRecorder:
+    """Aggregates chunk timing for a streamed entity without buffering chunks."""
+
+    __slots__ = (
+        "span",
+        "start",
+        "last",
+        "time_to_first_chunk",
+        "chunks",
+        "bytes",
+        "latency_min",
+        "latency_max",
+        "latency_total",
+    )
+
+    def __init__(self, span: trace.Span):
+        self.span = span
+        self.start = self.last = time.perf_counter()
+        self.time_to_first_chunk = None
+        self.chunks = 0
+        self.bytes = 0
+        self.latency_min = None
+        self.latency_max = None
+        self.latency_total = 0.0
+
+    def record(self, chunk: Any):
+        now = time.perf_counter()
+        if self.chunks == 0:
+            self.time_to_first_chunk = now - self.start
+        else:
+            latency = now - self.last
+            self.latency_total += latency
+            if self.latency_min is None or latency < self.latency_min:
+                self.latency_min = latency
+            if self.latency_max is None or latency > self.latency_max:
+                self.latency_max = latency
+        self.last = now
+        self.chunks += 1
+        self.bytes += _chunk_size(chunk)
+
+    def end(self, status: str):
+        attributes = {
+            SpanAttributes.ELIXIR_STREAM_STATUS: status,
+            SpanAttributes.ELIXIR_STREAM_CHUNKS: self.chunks,
+            SpanAttributes.ELIXIR_STREAM_BYTES: self.bytes,
+        }
+        if self.time_to_first_chunk is not None:
+            attributes[SpanAttributes.ELIXIR_STREAM_TIME_TO_FIRST_CHUNK] = (
+                self.time_to_first_chunk
+            )
+        if self.chunks > 1:
+            attributes[SpanAttributes.ELIXIR_STREAM_CHUNK_LATENCY_MIN] = (
+                self.latency_min
+            )
+            attributes[SpanAttributes.ELIXIR_STREAM_CHUNK_LATENCY_MAX] = (
+                self.latency_max
+            )
+            attributes[SpanAttributes.ELIXIR_STREAM_CHUNK_LATENCY_MEAN] = (
+                self.latency_total / (self.chunks - 1)
+            )
+        self.span.set_attributes(attributes)
+        self.span.end()
+
+
+def _chunk_size(chunk: Any) -> int:
+    if isinstance(chunk, str):
+        return len(chunk) if chunk.isascii() else len(chunk.encode("utf-8"))
+    if isinstance(chunk, (bytes, bytearray)):
+        return len(chunk)
+    return 0
 
 
 def _create_span(
-    tracer: trace.Tracer,
-    span_name: str,
-    entity_name: str,
+    metadata: EntityMetadata,
     args: tuple,
     kwargs: dict,
-) -> trace.Span:
-    span = tracer.start_span(span_name)
-    ctx = trace.set_span_in_context(span)
-    context_api.attach(ctx)
+) -> Tuple[trace.Span, context_api.Context]:
+    span = TracerWrapper.instance.get_tracer().start_span(metadata.span_name)
+
+    chained_entity_name = metadata.chained_name(
+        context_api.get_value(ElixirContextValues.ENTITY_NAME)
+    )
+    ctx = set_entity_name(chained_entity_name, trace.set_span_in_context(span))
 
-    chained_entity_name = get_chained_entity_name(entity_name)
-    set_entity_name(chained_entity_name)
+    # sampled out, skip input capture
+    if not span.is_recording():
+        return span, ctx
 
     span.set_attribute(SpanAttributes.ELIXIR_ENTITY_NAME, chained_entity_name)
 
+    deferred_payloads = TracerWrapper.instance.deferred_payloads
+    if deferred_payloads is not None:
+        deferred_payloads.defer(
+            span,
+            SpanAttributes.ELIXIR_ENTITY_INPUT,
+            deferred_payloads.snapshot_inputs(metadata.bind(args, kwargs)),
+        )
+        return span, ctx
+
     try:
         span.set_attribute(
             SpanAttributes.ELIXIR_ENTITY_INPUT,
-            json.dumps({"args": args, "kwargs": kwargs}),
+            TracerWrapper.instance.entity_serializer.serialize(
+                metadata.bind(args, kwargs)
+            ),
         )
-    except TypeError as e:
+    except Exception as e:
         Telemetry().log_exception(e)
 
-    return span
+    return span, ctx
+
+
+def _record_call(ctx: context_api.Context, start: float):
+    duration = time.perf_counter() - start
+    entity_metrics = MetricsWrapper.get_entity_metrics()
+    if entity_metrics is not None:
+        entity_metrics.record_call(
+            context_api.get_value(ElixirContextValues.ENTITY_NAME, ctx), duration, ctx
+        )
+
+
+def _trace_exception(span: trace.Span, ctx: context_api.Context, e: BaseException):
+    if span.is_recording():
+        span.record_exception(e)
+        span.set_status(Status(StatusCode.ERROR, f"{type(e).__name__}: {e}"))
+        span.set_attribute(ERROR_TYPE, type(e).__qualname__)
+
+    entity_metrics = MetricsWrapper.get_entity_metrics()
+    if entity_metrics is not None:
+        entity_metrics.record_error(
+            context_api.get_value(ElixirContextValues.ENTITY_NAME, ctx), e, ctx
+        )
 
 
 def _trace_output(span: trace.Span, res: Any):
+    deferred_payloads = TracerWrapper.instance.deferred_payloads
+    if deferred_payloads is not None:
+        deferred_payloads.defer(
+            span, SpanAttributes.ELIXIR_ENTITY_OUTPUT, deferred_payloads.snapshot(res)
+        )
+        span.end()
+        return
+
     try:
-        span.set_attribute(SpanAttributes.ELIXIR_ENTITY_OUTPUT, json.dumps(res))
-    except TypeError as e:
+        span.set_attribute(
+            SpanAttributes.ELIXIR_ENTITY_OUTPUT,
+            TracerWrapper.instance.entity_serializer.serialize(res),
+        )
+    except Exception as e:
         Telemetry().log_exception(e)
 
     span.end()
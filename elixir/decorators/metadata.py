@@ -0,0 +1,79 @@
+import inspect
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Receivers are implied by the entity and not worth capturing
+UNCAPTURED_PARAMS = frozenset(["self", "cls"])
+
+# Bounds the per-entity cache of chained names, parents are usually few
+MAX_CHAINED_NAMES = 64
+
+
+class EntityMetadata:
+    """Everything about a decorated function that can be computed once.
+
+    Built at decoration time so each call only binds its arguments to the
+    precomputed parameter names and looks up its chained entity name.
+    """
+
+    __slots__ = (
+        "span_name",
+        "entity_name",
+        "positional",
+        "positional_count",
+        "var_positional",
+        "_chained_names",
+    )
+
+    def __init__(self, fn: Callable, name: Optional[str] = None):
+        self.span_name = name or fn.__name__
+        self.entity_name = self.span_name
+        self._chained_names: Dict[str, str] = {}
+
+        try:
+            parameters = list(inspect.signature(fn).parameters.values())
+        except (TypeError, ValueError):
+            parameters = []
+
+        positional = [
+            parameter
+            for parameter in parameters
+            if parameter.kind
+            in (
+                inspect.Parameter.POSITIONAL_ONLY,
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            )
+        ]
+        self.positional: Tuple[Tuple[int, str], ...] = tuple(
+            (index, parameter.name)
+            for index, parameter in enumerate(positional)
+            if parameter.name not in UNCAPTURED_PARAMS
+        )
+        self.positional_count = len(positional)
+        self.var_positional = next(
+            (
+                parameter.name
+                for parameter in parameters
+                if parameter.kind == inspect.Parameter.VAR_POSITIONAL
+            ),
+            "args",
+        )
+
+    def bind(self, args: tuple, kwargs: dict) -> Dict[str, Any]:
+        count = len(args)
+        inputs = {name: args[index] for index, name in self.positional if index < count}
+        if count > self.positional_count:
+            inputs[self.var_positional] = args[self.positional_count :]
+        if kwargs:
+            inputs.update(kwargs)
+        return inputs
+
+    def chained_name(self, parent: Optional[str]) -> str:
+        if parent is None:
+            return self.entity_name
+
+        chained_name = self._chained_names.get(parent)
+        if chained_name is None:
+            chained_name = f"{parent}.{self.entity_name}"
+            if len(self._chained_names) < MAX_CHAINED_NAMES:
+                self._chained_names[parent] = chained_name
+        return chained_name
@@ -6,7 +6,9 @@ class Instruments(Enum):
     ANTHROPIC = "anthropic"
     COHERE = "cohere"
     PINECONE = "pinecone"
+    QDRANT = "qdrant"
     CHROMA = "chroma"
+    HAYSTACK = "haystack"
     LANGCHAIN = "langchain"
     MISTRAL = "mistral"
     OLLAMA = "ollama"
@@ -0,0 +1,59 @@
+import threading
+from typing import Dict, Hashable, Set
+
+# Attribute value of the series that overflowing measurements are folded into
+OVERFLOW_VALUE = "__other__"
+
+DEFAULT_MAX_SERIES = 2000
+
+# Dropped attribute sets are remembered up to this many times the series cap
+# so each is counted once, past it repeats of forgotten sets count again
+_DROPPED_KEYS_FACTOR = 8
+
+
+class CardinalityLimiter:
+    """Caps the distinct attribute sets recorded on one instrument.
+
+    The first `max_series` attribute sets are admitted. Later ones are
+    refused, and callers record them on the overflow series instead, whose
+    attribute values are all `__other__`. `dropped_series` counts the
+    distinct attribute sets that were refused.
+    """
+
+    __slots__ = ("max_series", "dropped_series", "_series", "_dropped", "_lock")
+
+    def __init__(self, max_series: int = DEFAULT_MAX_SERIES):
+        if max_series < 1:
+            raise ValueError("max_series must be at least 1")
+
+        self.max_series = max_series
+        self.dropped_series = 0
+        self._series: Set[Hashable] = set()
+        self._dropped: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def _at_fork_reinit(self) -> None:
+        self._lock = threading.Lock()
+
+    def admit(self, key: Hashable) -> bool:
+        if key in self._series:
+            return True
+        with self._lock:
+            if len(self._series) < self.max_series:
+                self._series.add(key)
+                return True
+
+            # Only the hash is kept, the attribute values may be large
+            dropped = hash(key)
+            if dropped not in self._dropped:
+                self.dropped_series += 1
+                if len(self._dropped) < self.max_series * _DROPPED_KEYS_FACTOR:
+                    self._dropped.add(dropped)
+            return False
+
+
+def overflow_attributes(attributes: Dict[str, object]) -> Dict[str, str]:
+    return {key: OVERFLOW_VALUE for key in attributes}
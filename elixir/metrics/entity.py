@@ -0,0 +1,164 @@
+import threading
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+from opentelemetry.context import Context, get_value
+from opentelemetry.metrics import CallbackOptions, Meter, Observation
+
+from elixir.metrics.cardinality import (
+    DEFAULT_MAX_SERIES,
+    CardinalityLimiter,
+    overflow_attributes,
+)
+from elixir.metrics.semconv import Meters
+from elixir.tracing.semconv import ElixirContextValues, SpanAttributes
+
+ERROR_TYPE = "error.type"
+INSTRUMENT = "instrument"
+
+# Refused series are cached up to this many times the series cap, so repeat
+# calls skip the limiter; past it they go through the limiter every time
+_REFUSED_KEYS_FACTOR = 8
+
+
+class BoundEntity:
+    """Attributes of one entity series, built once."""
+
+    __slots__ = ("attributes",)
+
+    def __init__(self, attributes: Dict[str, Any]):
+        self.attributes = attributes
+
+
+class EntityMetrics:
+    """Instruments recorded by the observe/aobserve decorators.
+
+    Every call records its duration, on attributes bound once per series, and
+    nothing else: the call rate is the `count` of the duration histogram.
+    Errors are only counted when an entity raises. Metrics are recorded whether
+    or not the entity's span is sampled.
+
+    Series are keyed by chained entity name. Association properties only
+    reach metrics when their key is in `association_keys`, and each
+    instrument keeps at most `max_series` series before folding the rest into
+    an `__other__` series.
+    """
+
+    def __init__(
+        self,
+        meter: Meter,
+        association_keys: Optional[Iterable[str]] = None,
+        max_series: int = DEFAULT_MAX_SERIES,
+    ):
+        self.errors = meter.create_counter(
+            name=Meters.ELIXIR_ENTITY_ERRORS,
+            unit="error",
+            description="Number of exceptions raised by observed entities",
+        )
+        self.duration = meter.create_histogram(
+            name=Meters.ELIXIR_ENTITY_DURATION,
+            unit="s",
+            description="Duration of observed entity calls",
+        )
+        meter.create_observable_counter(
+            name=Meters.ELIXIR_METRICS_SERIES_DROPPED,
+            callbacks=[self._observe_dropped_series],
+            unit="series",
+            description="Attribute sets folded into the __other__ series",
+        )
+        # Association properties are stored in the context as span attributes
+        self.association_keys = tuple(
+            sorted(
+                f"{SpanAttributes.ELIXIR_ASSOCIATION_PROPERTIES}.{key}"
+                for key in association_keys or ()
+            )
+        )
+        self.series_limiter = CardinalityLimiter(max_series)
+        self.errors_limiter = CardinalityLimiter(max_series)
+        self._entities: Dict[Hashable, BoundEntity] = {}
+        self._overflow: Dict[Tuple[str, ...], BoundEntity] = {}
+        self._refused_keys = 0
+        self._lock = threading.Lock()
+
+    def _at_fork_reinit(self) -> None:
+        self._lock = threading.Lock()
+        self.series_limiter._at_fork_reinit()
+        self.errors_limiter._at_fork_reinit()
+
+    def bind(self, entity_name: str, context: Optional[Context] = None) -> BoundEntity:
+        associations = self._associations(context) if self.association_keys else ()
+        key = (entity_name, associations) if associations else entity_name
+        entity = self._entities.get(key)
+        if entity is None:
+            entity = self._bind(key, entity_name, associations)
+        return entity
+
+    def record_call(
+        self, entity_name: str, duration: float, context: Optional[Context] = None
+    ) -> None:
+        entity = self.bind(entity_name, context)
+        self.duration.record(duration, entity.attributes)
+
+    def record_error(
+        self,
+        entity_name: str,
+        exception: BaseException,
+        context: Optional[Context] = None,
+    ) -> None:
+        error_type = type(exception).__qualname__
+        associations = self._associations(context) if self.association_keys else ()
+        attributes = {
+            SpanAttributes.ELIXIR_ENTITY_NAME: entity_name,
+            **dict(associations),
+            ERROR_TYPE: error_type,
+        }
+        if not self.errors_limiter.admit((entity_name, associations, error_type)):
+            attributes = overflow_attributes(attributes)
+        self.errors.add(1, attributes)
+
+    def dropped_series(self) -> Dict[str, int]:
+        return {
+            Meters.ELIXIR_ENTITY_DURATION: self.series_limiter.dropped_series,
+            Meters.ELIXIR_ENTITY_ERRORS: self.errors_limiter.dropped_series,
+        }
+
+    def _associations(self, context: Optional[Context]) -> Tuple[Tuple[str, Any], ...]:
+        properties = get_value(ElixirContextValues.ASSOCIATION_PROPERTIES, context)
+        if not properties:
+            return ()
+        # Sequences aren't hashable and make poor metric attributes anyway
+        return tuple(
+            (key, properties[key])
+            for key in self.association_keys
+            if isinstance(properties.get(key), (str, bool, int, float))
+        )
+
+    def _bind(
+        self, key: Hashable, entity_name: str, associations: Tuple[Tuple[str, Any], ...]
+    ) -> BoundEntity:
+        attributes = {
+            SpanAttributes.ELIXIR_ENTITY_NAME: entity_name,
+            **dict(associations),
+        }
+        with self._lock:
+            if not self.series_limiter.admit(key):
+                # Refused series share the overflow series of their attributes
+                overflow_key = tuple(attributes)
+                entity = self._overflow.get(overflow_key)
+                if entity is None:
+                    entity = self._overflow[overflow_key] = BoundEntity(
+                        overflow_attributes(attributes)
+                    )
+                max_refused = self.series_limiter.max_series * _REFUSED_KEYS_FACTOR
+                if self._refused_keys < max_refused:
+                    self._refused_keys += 1
+                    self._entities[key] = entity
+                return entity
+            return self._entities.setdefault(key, BoundEntity(attributes))
+
+    def _observe_dropped_series(
+        self, options: CallbackOptions
+    ) -> Iterable[Observation]:
+        return [
+            Observation(dropped, {INSTRUMENT: instrument})
+            for instrument, dropped in self.dropped_series().items()
+        ]
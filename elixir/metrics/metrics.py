@@ -1,5 +1,8 @@
+import os
+import threading
+
 from opentelemetry import metrics
-from opentelemetry.sdk.metrics.view import View, ExplicitBucketHistogramAggregation
+from opentelemetry.sdk.metrics.view import View
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.metrics import MeterProvider
 
@@ -14,8 +17,26 @@ from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import (
 from opentelemetry.exporter.otlp.proto.http.metric_exporter import (
     OTLPMetricExporter as HTTPExporter,
 )
-from typing import Dict
-from collections.abc import Sequence
+from typing import Dict, Iterable, Optional, Sequence
+
+from elixir.config.transport import ExporterOptions, Protocol
+from elixir.metrics.cardinality import DEFAULT_MAX_SERIES
+from elixir.metrics.entity import EntityMetrics
+from elixir.metrics.pipeline import (
+    InstrumentedMetricExporter,
+    Signal,
+    pipeline_stats,
+)
+from elixir.metrics.readers import (
+    DEFAULT_EXPORT_INTERVAL_MILLIS,
+    AdaptiveMetricReader,
+    Temporality,
+    preferred_temporality,
+)
+from elixir.metrics.views import HistogramOptions, metric_views
+from elixir.startup import get_startup_report
+
+METER_NAME = "elixir.meter"
 
 
 class MetricsWrapper(object):
@@ -23,153 +44,167 @@ class MetricsWrapper(object):
     endpoint: str = None
     # if it needs headers?
     headers: Dict[str, str] = {}
+    exporter_options: ExporterOptions = ExporterOptions()
+    entity_metrics: Optional[EntityMetrics] = None
 
-    def __new__(cls, reader: MetricReader = None) -> "MetricsWrapper":
+    def __new__(
+        cls,
+        reader: MetricReader = None,
+        export_interval_millis: Optional[float] = None,
+        adaptive_export: bool = False,
+        temporality: str = Temporality.CUMULATIVE,
+        histogram_options: Optional[HistogramOptions] = None,
+        views: Sequence[View] = (),
+        association_keys: Optional[Iterable[str]] = None,
+        max_series: int = DEFAULT_MAX_SERIES,
+    ) -> "MetricsWrapper":
         if not hasattr(cls, "instance"):
             obj = cls.instance = super(MetricsWrapper, cls).__new__(cls)
             if not MetricsWrapper.endpoint:
                 return obj
 
-            obj.__metrics_exporter: MetricExporter = init_metrics_exporter(
-                MetricsWrapper.endpoint, MetricsWrapper.headers
-            )
+            obj.__temporality = temporality
+            obj.__histogram_options = histogram_options
+            with get_startup_report().measure("metrics_exporter"):
+                obj.__metrics_exporter: MetricExporter = init_metrics_exporter(
+                    MetricsWrapper.endpoint,
+                    MetricsWrapper.headers,
+                    MetricsWrapper.exporter_options,
+                    temporality,
+                    histogram_options,
+                )
 
-            obj.__metrics_provider: MeterProvider = init_metrics_provider(
-                obj.__metrics_exporter, reader, MetricsWrapper.resource_attributes
+            obj.__metrics_reader: MetricReader = reader or init_metrics_reader(
+                InstrumentedMetricExporter(obj.__metrics_exporter, pipeline_stats),
+                export_interval_millis=export_interval_millis,
+                adaptive=adaptive_export,
             )
+            with get_startup_report().measure("metrics_provider"):
+                obj.__metrics_provider: MeterProvider = init_metrics_provider(
+                    obj.__metrics_exporter,
+                    obj.__metrics_reader,
+                    MetricsWrapper.resource_attributes,
+                    histogram_options,
+                    views,
+                )
+            meter = obj.__metrics_provider.get_meter(METER_NAME)
+            obj.entity_metrics = EntityMetrics(meter, association_keys, max_series)
+            pipeline_stats.register_instruments(meter)
+
+            # The periodic reader restarts its thread in forked children, but
+            # keeps the parent's exporter connections
+            if reader is None and hasattr(os, "register_at_fork"):
+                os.register_at_fork(after_in_child=obj._at_fork_reinit)
 
         return cls.instance
 
+    def _at_fork_reinit(self):
+        self.__metrics_exporter = init_metrics_exporter(
+            MetricsWrapper.endpoint,
+            MetricsWrapper.headers,
+            MetricsWrapper.exporter_options,
+            self.__temporality,
+            self.__histogram_options,
+        )
+        self.__metrics_reader._exporter = InstrumentedMetricExporter(
+            self.__metrics_exporter, pipeline_stats
+        )
+        # Might have been held by the parent's export thread when forking
+        self.__metrics_reader._export_lock = threading.Lock()
+        self.entity_metrics._at_fork_reinit()
+
+    @classmethod
+    def get_entity_metrics(cls) -> Optional[EntityMetrics]:
+        # None when metrics are disabled or were never initialized
+        if not hasattr(cls, "instance"):
+            return None
+        return cls.instance.entity_metrics
+
     @staticmethod
     def set_static_params(
         resource_attributes: dict,
         endpoint: str,
         headers: Dict[str, str],
+        exporter_options: Optional[ExporterOptions] = None,
     ) -> None:
         MetricsWrapper.resource_attributes = resource_attributes
         MetricsWrapper.endpoint = endpoint
         MetricsWrapper.headers = headers
+        MetricsWrapper.exporter_options = exporter_options or ExporterOptions()
 
 
-def init_metrics_exporter(endpoint: str, headers: Dict[str, str]) -> MetricExporter:
-    if "http" in endpoint.lower():
-        return HTTPExporter(endpoint=f"{endpoint}/metrics", headers=headers)
+def init_metrics_exporter(
+    endpoint: str,
+    headers: Dict[str, str],
+    options: Optional[ExporterOptions] = None,
+    temporality: str = Temporality.CUMULATIVE,
+    histogram_options: Optional[HistogramOptions] = None,
+) -> MetricExporter:
+    options = options or ExporterOptions()
+    temporalities = preferred_temporality(temporality)
+    aggregations = (histogram_options or HistogramOptions()).preferred_aggregation()
+    if options.protocol_for(endpoint) == Protocol.HTTP:
+        session = options.http_session()
+        session.hooks["response"].append(pipeline_stats.bytes_hook(Signal.METRICS))
+        return HTTPExporter(
+            endpoint=f"{endpoint}/metrics",
+            headers=headers,
+            timeout=options.timeout,
+            compression=options.http_compression(),
+            session=session,
+            preferred_temporality=temporalities,
+            preferred_aggregation=aggregations,
+        )
     else:
-        return GRPCExporter(endpoint=endpoint, headers=headers)
+        exporter = GRPCExporter(
+            endpoint=endpoint,
+            headers=headers,
+            timeout=options.timeout,
+            compression=options.grpc_compression(),
+            preferred_temporality=temporalities,
+            preferred_aggregation=aggregations,
+        )
+        channel = options.grpc_channel(endpoint)
+        if channel is not None:
+            exporter._client = exporter._stub(channel)
+        exporter._translate_data = pipeline_stats.grpc_bytes_hook(
+            Signal.METRICS, exporter._translate_data
+        )
+        return exporter
+
+
+def init_metrics_reader(
+    exporter: MetricExporter,
+    export_interval_millis: Optional[float] = None,
+    adaptive: bool = False,
+) -> MetricReader:
+    export_interval_millis = export_interval_millis or DEFAULT_EXPORT_INTERVAL_MILLIS
+    if adaptive:
+        return AdaptiveMetricReader(
+            exporter, export_interval_millis=export_interval_millis
+        )
+    return PeriodicExportingMetricReader(
+        exporter, export_interval_millis=export_interval_millis
+    )
 
 
 def init_metrics_provider(
     exporter: MetricExporter,
     reader: MetricReader = None,
     resource_attributes: dict = None,
+    histogram_options: Optional[HistogramOptions] = None,
+    views: Sequence[View] = (),
 ) -> MeterProvider:
     resource = (
         Resource.create(resource_attributes)
         if resource_attributes
         else Resource.create()
     )
-    metric_reader = (
-        reader
-        if reader
-        else PeriodicExportingMetricReader(exporter, export_interval_millis=1000)
-    )
     provider = MeterProvider(
-        metric_readers=[metric_reader],
+        metric_readers=[reader or init_metrics_reader(exporter)],
         resource=resource,
-        views=metric_views(),
+        views=metric_views(histogram_options, views),
     )
 
     metrics.set_meter_provider(provider)
     return provider
-
-
-def metric_views() -> Sequence[View]:
-    return [
-        View(
-            instrument_name="gen_ai.client.operation.duration",
-            aggregation=ExplicitBucketHistogramAggregation(
-                [
-                    0.01,
-                    0.02,
-                    0.04,
-                    0.08,
-                    0.16,
-                    0.32,
-                    0.64,
-                    1.28,
-                    2.56,
-                    5.12,
-                    10.24,
-                    20.48,
-                    40.96,
-                    81.92,
-                ]
-            ),
-        ),
-        View(
-            instrument_name="gen_ai.client.token.usage",
-            aggregation=ExplicitBucketHistogramAggregation(
-                [
-                    1,
-                    4,
-                    16,
-                    64,
-                    256,
-                    1024,
-                    4096,
-                    16384,
-                    65536,
-                    262144,
-                    1048576,
-                    4194304,
-                    16777216,
-                    67108864,
-                ]
-            ),
-        ),
-        View(
-            instrument_name="db.pinecone.query.duration",
-            aggregation=ExplicitBucketHistogramAggregation(
-                [
-                    0.01,
-                    0.02,
-                    0.04,
-                    0.08,
-                    0.16,
-                    0.32,
-                    0.64,
-                    1.28,
-                    2.56,
-                    5.12,
-                    10.24,
-                    20.48,
-                    40.96,
-                    81.92,
-                ]
-            ),
-        ),
-        View(
-            instrument_name="db.pinecone.query.scores",
-            aggregation=ExplicitBucketHistogramAggregation(
-                [
-                    -1,
-                    -0.875,
-                    -0.75,
-                    -0.625,
-                    -0.5,
-                    -0.375,
-                    -0.25,
-                    -0.125,
-                    0,
-                    0.125,
-                    0.25,
-                    0.375,
-                    0.5,
-                    0.625,
-                    0.75,
-                    0.875,
-                    1,
-                ]
-            ),
-        ),
-    ]
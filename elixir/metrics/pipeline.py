@@ -0,0 +1,292 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Sequence
+
+import requests
+from opentelemetry.metrics import CallbackOptions, Histogram, Meter, Observation
+from opentelemetry.sdk.metrics.export import (
+    MetricExporter,
+    MetricExportResult,
+    MetricsData,
+)
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+from elixir.metrics.semconv import Meters
+
+SIGNAL = "signal"
+
+
+class Signal:
+    TRACES = "traces"
+    METRICS = "metrics"
+
+
+class SignalStats:
+    __slots__ = ("exports", "failures", "bytes_sent", "duration_total", "duration_max")
+
+    def __init__(self):
+        self.exports = 0
+        self.failures = 0
+        self.bytes_sent = 0
+        self.duration_total = 0.0
+        self.duration_max = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "exports": self.exports,
+            "failures": self.failures,
+            "bytes_sent": self.bytes_sent,
+            "duration_mean": self.duration_total / self.exports if self.exports else 0,
+            "duration_max": self.duration_max,
+        }
+
+
+class PipelineStats:
+    """Health of the SDK's own span and metric export pipeline.
+
+    Counters are kept in process for `Elixir.pipeline_stats()` and published
+    through the SDK's meter provider once `register_instruments` is called.
+    Nothing here runs on the request path, except counting spans dropped
+    because the batch queue is full.
+    """
+
+    def __init__(self):
+        self.spans_exported = 0
+        self.spans_dropped = 0
+        self.spans_spooled = 0
+        self.signals: Dict[str, SignalStats] = {
+            Signal.TRACES: SignalStats(),
+            Signal.METRICS: SignalStats(),
+        }
+        self.span_processor = None
+        # The span spool when spooling is enabled
+        self.spool = None
+        self._duration: Optional[Histogram] = None
+        self._lock = threading.Lock()
+
+    def _at_fork_reinit(self) -> None:
+        self._lock = threading.Lock()
+
+    def record_export(
+        self, signal: str, duration: float, success: bool, spans: int = 0
+    ) -> None:
+        with self._lock:
+            stats = self.signals[signal]
+            stats.exports += 1
+            stats.duration_total += duration
+            stats.duration_max = max(stats.duration_max, duration)
+            if not success:
+                stats.failures += 1
+            elif spans:
+                self.spans_exported += spans
+        if self._duration is not None:
+            self._duration.record(duration, {SIGNAL: signal})
+
+    def record_spooled(self, spans: int) -> None:
+        # The spooling exporter reports spooled batches as exported, they only
+        # count as exported once replayed
+        with self._lock:
+            self.spans_spooled += spans
+            self.spans_exported -= spans
+
+    def exported_spans(self) -> int:
+        replayed = self.spool.replayed_spans if self.spool is not None else 0
+        return self.spans_exported + replayed
+
+    def spool_stats(self) -> dict:
+        if self.spool is None:
+            return {}
+        return {
+            "size_bytes": self.spool.size,
+            "replayed_batches": self.spool.replayed_batches,
+            "dropped_batches": self.spool.dropped_batches,
+            "dropped_spans": self.spool.dropped_spans,
+        }
+
+    def record_dropped_span(self) -> None:
+        with self._lock:
+            self.spans_dropped += 1
+
+    def record_bytes_sent(self, signal: str, count: int) -> None:
+        with self._lock:
+            self.signals[signal].bytes_sent += count
+
+    def bytes_hook(self, signal: str) -> Callable:
+        """`requests` response hook counting the request body sent on the wire."""
+
+        def hook(response: requests.Response, *args, **kwargs):
+            body = response.request.body
+            if body:
+                self.record_bytes_sent(signal, len(body))
+
+        return hook
+
+    def grpc_bytes_hook(self, signal: str, translate: Callable) -> Callable:
+        """Wraps a gRPC exporter's `_translate_data` to count request bytes.
+
+        gRPC compresses below the exporter, so this counts the encoded request
+        before compression.
+        """
+
+        def translate_data(data):
+            request = translate(data)
+            self.record_bytes_sent(signal, request.ByteSize())
+            return request
+
+        return translate_data
+
+    def queue_size(self) -> int:
+        # Only the batch processors have a queue
+        queue_size = getattr(self.span_processor, "queue_size", None)
+        return queue_size() if queue_size is not None else 0
+
+    def queue_capacity(self) -> int:
+        queue_capacity = getattr(self.span_processor, "queue_capacity", None)
+        return queue_capacity() if queue_capacity is not None else 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "spans_exported": self.exported_spans(),
+                "spans_dropped": self.spans_dropped,
+                "spans_spooled": self.spans_spooled,
+                "spool": self.spool_stats(),
+                "queue_size": self.queue_size(),
+                "queue_capacity": self.queue_capacity(),
+                "exports": {
+                    signal: stats.to_dict() for signal, stats in self.signals.items()
+                },
+            }
+
+    def register_instruments(self, meter: Meter) -> None:
+        meter.create_observable_counter(
+            Meters.ELIXIR_PIPELINE_SPANS_EXPORTED,
+            callbacks=[lambda options: [Observation(self.exported_spans())]],
+            unit="span",
+            description="Spans successfully exported",
+        )
+        meter.create_observable_counter(
+            Meters.ELIXIR_PIPELINE_SPANS_DROPPED,
+            callbacks=[lambda options: [Observation(self.spans_dropped)]],
+            unit="span",
+            description="Spans dropped because the batch queue was full",
+        )
+        meter.create_observable_counter(
+            Meters.ELIXIR_PIPELINE_SPANS_SPOOLED,
+            callbacks=[lambda options: [Observation(self.spans_spooled)]],
+            unit="span",
+            description="Spans written to the spool while the collector was unreachable",
+        )
+        meter.create_observable_counter(
+            Meters.ELIXIR_PIPELINE_SPOOL_DROPPED,
+            callbacks=[
+                lambda options: [
+                    Observation(self.spool_stats().get("dropped_spans", 0))
+                ]
+            ],
+            unit="span",
+            description="Spooled spans evicted or rejected by the collector",
+        )
+        meter.create_observable_gauge(
+            Meters.ELIXIR_PIPELINE_QUEUE_SIZE,
+            callbacks=[lambda options: [Observation(self.queue_size())]],
+            unit="span",
+            description="Spans waiting in the batch queue",
+        )
+        meter.create_observable_gauge(
+            Meters.ELIXIR_PIPELINE_QUEUE_CAPACITY,
+            callbacks=[lambda options: [Observation(self.queue_capacity())]],
+            unit="span",
+            description="Maximum number of spans in the batch queue",
+        )
+        meter.create_observable_counter(
+            Meters.ELIXIR_PIPELINE_EXPORT_FAILURES,
+            callbacks=[self._observe("failures")],
+            unit="export",
+            description="Exports that failed",
+        )
+        meter.create_observable_counter(
+            Meters.ELIXIR_PIPELINE_EXPORT_BYTES,
+            callbacks=[self._observe("bytes_sent")],
+            unit="By",
+            description="Request bytes sent to the collector",
+        )
+        self._duration = meter.create_histogram(
+            Meters.ELIXIR_PIPELINE_EXPORT_DURATION,
+            unit="s",
+            description="Duration of exports to the collector",
+        )
+
+    def _observe(self, field: str):
+        def callback(options: CallbackOptions) -> Iterable[Observation]:
+            return [
+                Observation(getattr(stats, field), {SIGNAL: signal})
+                for signal, stats in self.signals.items()
+            ]
+
+        return callback
+
+
+class InstrumentedSpanExporter(SpanExporter):
+    def __init__(self, exporter: SpanExporter, stats: PipelineStats):
+        self._exporter = exporter
+        self._stats = stats
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        start = time.perf_counter()
+        result = SpanExportResult.FAILURE
+        try:
+            result = self._exporter.export(spans)
+            return result
+        finally:
+            self._stats.record_export(
+                Signal.TRACES,
+                time.perf_counter() - start,
+                result == SpanExportResult.SUCCESS,
+                len(spans),
+            )
+
+    def shutdown(self) -> None:
+        self._exporter.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._exporter.force_flush(timeout_millis)
+
+
+class InstrumentedMetricExporter(MetricExporter):
+    def __init__(self, exporter: MetricExporter, stats: PipelineStats):
+        # The reader reads the exporter's temporality and aggregation
+        super().__init__(
+            preferred_temporality=exporter._preferred_temporality,
+            preferred_aggregation=exporter._preferred_aggregation,
+        )
+        self._exporter = exporter
+        self._stats = stats
+
+    def export(
+        self, metrics_data: MetricsData, timeout_millis: float = 10_000, **kwargs
+    ) -> MetricExportResult:
+        start = time.perf_counter()
+        result = MetricExportResult.FAILURE
+        try:
+            result = self._exporter.export(metrics_data, timeout_millis, **kwargs)
+            return result
+        finally:
+            self._stats.record_export(
+                Signal.METRICS,
+                time.perf_counter() - start,
+                result == MetricExportResult.SUCCESS,
+            )
+
+    def force_flush(self, timeout_millis: float = 10_000) -> bool:
+        return self._exporter.force_flush(timeout_millis)
+
+    def shutdown(self, timeout_millis: float = 30_000, **kwargs) -> None:
+        self._exporter.shutdown(timeout_millis, **kwargs)
+
+
+pipeline_stats = PipelineStats()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=pipeline_stats._at_fork_reinit)
@@ -0,0 +1,159 @@
+import logging
+import time
+from typing import Dict, Hashable, List, Optional
+
+from opentelemetry.sdk.metrics import (
+    Counter,
+    Histogram,
+    MetricsTimeoutError,
+    ObservableCounter,
+    ObservableGauge,
+    ObservableUpDownCounter,
+    UpDownCounter,
+)
+from opentelemetry.sdk.metrics.export import (
+    AggregationTemporality,
+    MetricExporter,
+    MetricsData,
+    PeriodicExportingMetricReader,
+)
+
+DEFAULT_EXPORT_INTERVAL_MILLIS = 1000
+# Idle processes still export at least this often, so dashboards can tell an
+# idle process from a dead one
+DEFAULT_MAX_EXPORT_INTERVAL_MILLIS = 60_000
+
+# The SDK's own export pipeline metrics change with every export, including
+# the reader's own, so they don't count as changes
+PIPELINE_METRICS_PREFIX = "elixir.pipeline."
+
+
+class Temporality:
+    CUMULATIVE = "cumulative"
+    DELTA = "delta"
+
+
+TEMPORALITIES = (Temporality.CUMULATIVE, Temporality.DELTA)
+
+
+def preferred_temporality(
+    temporality: str,
+) -> Optional[Dict[type, AggregationTemporality]]:
+    """Exporter temporality for `temporality`, None keeps the exporter default.
+
+    Delta follows the OTLP exporters' DELTA preference: counters and
+    histograms report deltas, up down counters stay cumulative since their
+    deltas mean little on their own.
+    """
+    if temporality not in TEMPORALITIES:
+        raise ValueError(f"temporality must be one of {', '.join(TEMPORALITIES)}")
+    if temporality == Temporality.CUMULATIVE:
+        return None
+    return {
+        Counter: AggregationTemporality.DELTA,
+        UpDownCounter: AggregationTemporality.CUMULATIVE,
+        Histogram: AggregationTemporality.DELTA,
+        ObservableCounter: AggregationTemporality.DELTA,
+        ObservableUpDownCounter: AggregationTemporality.CUMULATIVE,
+        ObservableGauge: AggregationTemporality.CUMULATIVE,
+    }
+
+
+class AdaptiveMetricReader(PeriodicExportingMetricReader):
+    """Periodic reader that slows down while the metrics aren't changing.
+
+    Collects every `export_interval_millis` while measurements keep coming in.
+    Collections that find nothing new since the last export are not exported
+    and double the interval, up to `max_export_interval_millis`. An export
+    still goes out once that long has passed since the last one. The first
+    change brings the interval back to `export_interval_millis`. The SDK's own
+    `elixir.pipeline.*` metrics are exported but never count as changes.
+    """
+
+    def __init__(
+        self,
+        exporter: MetricExporter,
+        export_interval_millis: float = DEFAULT_EXPORT_INTERVAL_MILLIS,
+        max_export_interval_millis: float = DEFAULT_MAX_EXPORT_INTERVAL_MILLIS,
+        export_timeout_millis: Optional[float] = None,
+    ):
+        # The ticker thread starts in the base constructor and reads these
+        self.interval_millis = export_interval_millis
+        self.max_export_interval_millis = max(
+            max_export_interval_millis, export_interval_millis
+        )
+        self.skipped_exports = 0
+        self._last_state: Optional[Hashable] = None
+        self._last_export = time.monotonic()
+        super().__init__(
+            exporter,
+            export_interval_millis=export_interval_millis,
+            export_timeout_millis=export_timeout_millis,
+        )
+
+    def _ticker(self) -> None:
+        while not self._shutdown_event.wait(self.interval_millis / 1e3):
+            try:
+                self.collect(timeout_millis=self._export_timeout_millis)
+            except MetricsTimeoutError:
+                logging.warning(
+                    "Metric collection timed out, retrying in "
+                    f"{self.interval_millis / 1e3} seconds"
+                )
+        # One last collection before shutting down
+        self.collect(timeout_millis=self._export_interval_millis)
+
+    def _receive_metrics(
+        self,
+        metrics_data: MetricsData,
+        timeout_millis: float = 10_000,
+        **kwargs,
+    ) -> None:
+        changed, state = _metrics_state(metrics_data)
+        now = time.monotonic()
+        if (
+            not changed
+            and state == self._last_state
+            and now - self._last_export < self.max_export_interval_millis / 1e3
+        ):
+            self.skipped_exports += 1
+            self.interval_millis = min(
+                self.interval_millis * 2, self.max_export_interval_millis
+            )
+            return
+
+        if changed or state != self._last_state:
+            self.interval_millis = self._export_interval_millis
+        self._last_state = state
+        self._last_export = now
+        super()._receive_metrics(metrics_data, timeout_millis, **kwargs)
+
+
+def _metrics_state(metrics_data: Optional[MetricsData]):
+    # Returns whether any delta point recorded something, and the values of
+    # the cumulative points to compare with the previous collection. Delta
+    # points are never compared, equal deltas are still new measurements.
+    changed = False
+    state: List[Hashable] = []
+    if metrics_data is None:
+        return changed, ()
+    for resource_metrics in metrics_data.resource_metrics:
+        for scope_metrics in resource_metrics.scope_metrics:
+            for metric in scope_metrics.metrics:
+                if metric.name.startswith(PIPELINE_METRICS_PREFIX):
+                    continue
+                delta = (
+                    getattr(metric.data, "aggregation_temporality", None)
+                    == AggregationTemporality.DELTA
+                )
+                for point in metric.data.data_points:
+                    value = getattr(point, "value", None)
+                    if value is None:
+                        value = (point.count, point.sum)
+                    if delta:
+                        changed = changed or value not in (0, (0, 0))
+                    else:
+                        state.append(
+                            (metric.name, frozenset(point.attributes.items()), value)
+                        )
+    return changed, tuple(state)
@@ -0,0 +1,18 @@
+from opentelemetry.semconv.ai import Meters as BaseMeters
+
+
+class Meters(BaseMeters):
+    ELIXIR_ENTITY_ERRORS = "elixir.entity.errors"
+    ELIXIR_ENTITY_DURATION = "elixir.entity.duration"
+    ELIXIR_METRICS_SERIES_DROPPED = "elixir.metrics.series.dropped"
+
+    # Export pipeline of the SDK itself
+    ELIXIR_PIPELINE_SPANS_EXPORTED = "elixir.pipeline.spans.exported"
+    ELIXIR_PIPELINE_SPANS_DROPPED = "elixir.pipeline.spans.dropped"
+    ELIXIR_PIPELINE_SPANS_SPOOLED = "elixir.pipeline.spans.spooled"
+    ELIXIR_PIPELINE_SPOOL_DROPPED = "elixir.pipeline.spool.dropped"
+    ELIXIR_PIPELINE_QUEUE_SIZE = "elixir.pipeline.queue.size"
+    ELIXIR_PIPELINE_QUEUE_CAPACITY = "elixir.pipeline.queue.capacity"
+    ELIXIR_PIPELINE_EXPORT_DURATION = "elixir.pipeline.export.duration"
+    ELIXIR_PIPELINE_EXPORT_FAILURES = "elixir.pipeline.export.failures"
+    ELIXIR_PIPELINE_EXPORT_BYTES = "elixir.pipeline.export.bytes"
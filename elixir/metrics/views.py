@@ -0,0 +1,180 @@
+from typing import Dict, Optional, Sequence
+
+from opentelemetry.sdk.metrics import Histogram
+from opentelemetry.sdk.metrics.view import (
+    Aggregation,
+    ExplicitBucketHistogramAggregation,
+    ExponentialBucketHistogramAggregation,
+    View,
+)
+
+from elixir.metrics.semconv import Meters
+
+
+class HistogramAggregation:
+    EXPLICIT = "explicit"
+    EXPONENTIAL = "exponential"
+
+
+HISTOGRAM_AGGREGATIONS = (
+    HistogramAggregation.EXPLICIT,
+    HistogramAggregation.EXPONENTIAL,
+)
+
+# Defaults of the OTel SDK. The scale drops as needed to fit the recorded
+# range of each series into max_size buckets.
+DEFAULT_EXPONENTIAL_MAX_SCALE = 20
+DEFAULT_EXPONENTIAL_MAX_SIZE = 160
+
+DURATION_BUCKETS = [
+    0.01,
+    0.02,
+    0.04,
+    0.08,
+    0.16,
+    0.32,
+    0.64,
+    1.28,
+    2.56,
+    5.12,
+    10.24,
+    20.48,
+    40.96,
+    81.92,
+]
+
+# Explicit bucket boundaries of the histograms the SDK records
+HISTOGRAM_BUCKETS: Dict[str, Sequence[float]] = {
+    "gen_ai.client.operation.duration": DURATION_BUCKETS,
+    Meters.ELIXIR_ENTITY_DURATION: [
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1,
+        2.5,
+        5,
+        10,
+        30,
+        60,
+        120,
+    ],
+    "gen_ai.client.token.usage": [
+        1,
+        4,
+        16,
+        64,
+        256,
+        1024,
+        4096,
+        16384,
+        65536,
+        262144,
+        1048576,
+        4194304,
+        16777216,
+        67108864,
+    ],
+    Meters.ELIXIR_PIPELINE_EXPORT_DURATION: [
+        0.001,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1,
+        2.5,
+        5,
+        10,
+        30,
+    ],
+    "db.pinecone.query.duration": DURATION_BUCKETS,
+    "db.pinecone.query.scores": [
+        -1,
+        -0.875,
+        -0.75,
+        -0.625,
+        -0.5,
+        -0.375,
+        -0.25,
+        -0.125,
+        0,
+        0.125,
+        0.25,
+        0.375,
+        0.5,
+        0.625,
+        0.75,
+        0.875,
+        1,
+    ],
+}
+
+
+class HistogramOptions:
+    """How histograms are aggregated.
+
+    Explicit histograms use the fixed boundaries in `HISTOGRAM_BUCKETS`.
+    Exponential histograms pick their own boundaries from the recorded values,
+    at up to `max_scale` resolution with at most `max_size` buckets per
+    series. They also apply to histograms without a view of their own, such
+    as the application's histograms or user views left on the default
+    aggregation.
+    """
+
+    __slots__ = ("aggregation", "max_scale", "max_size")
+
+    def __init__(
+        self,
+        aggregation: str = HistogramAggregation.EXPLICIT,
+        max_scale: int = DEFAULT_EXPONENTIAL_MAX_SCALE,
+        max_size: int = DEFAULT_EXPONENTIAL_MAX_SIZE,
+    ):
+        if aggregation not in HISTOGRAM_AGGREGATIONS:
+            raise ValueError(
+                f"aggregation must be one of {', '.join(HISTOGRAM_AGGREGATIONS)}"
+            )
+        if not -10 <= max_scale <= 20:
+            raise ValueError("max_scale must be between -10 and 20")
+        if max_size < 2:
+            raise ValueError("max_size must be at least 2")
+
+        self.aggregation = aggregation
+        self.max_scale = max_scale
+        self.max_size = max_size
+
+    @property
+    def exponential(self) -> bool:
+        return self.aggregation == HistogramAggregation.EXPONENTIAL
+
+    def histogram_aggregation(self, boundaries: Sequence[float]) -> Aggregation:
+        if self.exponential:
+            return ExponentialBucketHistogramAggregation(
+                max_size=self.max_size, max_scale=self.max_scale
+            )
+        return ExplicitBucketHistogramAggregation(boundaries)
+
+    def preferred_aggregation(self) -> Optional[Dict[type, Aggregation]]:
+        # None keeps the exporter's default for histograms without a view
+        if not self.exponential:
+            return None
+        return {Histogram: self.histogram_aggregation(())}
+
+
+def metric_views(
+    histogram_options: Optional[HistogramOptions] = None,
+    views: Sequence[View] = (),
+) -> Sequence[View]:
+    histogram_options = histogram_options or HistogramOptions()
+    return [
+        View(
+            instrument_name=name,
+            aggregation=histogram_options.histogram_aggregation(boundaries),
+        )
+        for name, boundaries in HISTOGRAM_BUCKETS.items()
+    ] + list(views)
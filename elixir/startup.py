@@ -0,0 +1,125 @@
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+from opentelemetry import trace
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+STARTUP_SPAN_NAME = "elixir.startup"
+MEMORY_DELTA_ATTRIBUTE = "elixir.startup.memory_delta"
+
+
+def _rss_bytes() -> int:
+    if resource is None:
+        return 0
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        # Peak rather than current RSS, still shows which step grew memory
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class StartupStep:
+    __slots__ = ("name", "start_time", "end_time", "memory_delta")
+
+    def __init__(self, name: str, start_time: int, end_time: int, memory_delta: int):
+        self.name = name
+        self.start_time = start_time
+        self.end_time = end_time
+        self.memory_delta = memory_delta
+
+    @property
+    def seconds(self) -> float:
+        return (self.end_time - self.start_time) / 1e9
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "seconds": self.seconds,
+            "memory_delta_bytes": self.memory_delta,
+        }
+
+
+class StartupReport:
+    """Time and RSS delta of each step of `Elixir.init`.
+
+    Lazily initialized instrumentors are added when their library is imported.
+    """
+
+    def __init__(self):
+        self.steps: List[StartupStep] = []
+
+    @contextmanager
+    def measure(self, name: str):
+        start_time = time.time_ns()
+        start_rss = _rss_bytes()
+        try:
+            yield
+        finally:
+            self.steps.append(
+                StartupStep(name, start_time, time.time_ns(), _rss_bytes() - start_rss)
+            )
+
+    def wrap(self, name: str, fn: Callable) -> Callable:
+        def measured(*args, **kwargs):
+            with self.measure(name):
+                return fn(*args, **kwargs)
+
+        return measured
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(step.seconds for step in self.steps)
+
+    def slowest(self, count: int = 5) -> List[StartupStep]:
+        return sorted(self.steps, key=lambda step: step.seconds, reverse=True)[:count]
+
+    def to_dict(self) -> dict:
+        return {
+            "total_seconds": self.total_seconds,
+            "steps": [step.to_dict() for step in self.steps],
+        }
+
+    def record_spans(self, tracer: trace.Tracer) -> Optional[trace.Span]:
+        if not self.steps:
+            return None
+
+        try:
+            parent = tracer.start_span(
+                STARTUP_SPAN_NAME, start_time=self.steps[0].start_time
+            )
+            ctx = trace.set_span_in_context(parent)
+            for step in self.steps:
+                span = tracer.start_span(
+                    f"{STARTUP_SPAN_NAME}.{step.name}",
+                    context=ctx,
+                    start_time=step.start_time,
+                    attributes={MEMORY_DELTA_ATTRIBUTE: step.memory_delta},
+                )
+                span.end(end_time=step.end_time)
+            parent.end(end_time=max(step.end_time for step in self.steps))
+            return parent
+        except Exception as e:
+            logging.warning(f"Failed to record startup spans: {e}")
+            return None
+
+
+_startup_report = StartupReport()
+
+
+def get_startup_report() -> StartupReport:
+    return _startup_report
+
+
+def reset_startup_report() -> StartupReport:
+    global _startup_report
+    _startup_report = StartupReport()
+    return _startup_report
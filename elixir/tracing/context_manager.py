@@ -1,6 +1,9 @@
 from contextlib import contextmanager
+from typing import Optional
 
-from elixir.tracing.tracing import TracerWrapper
+from opentelemetry.context import Context, attach, detach, get_current
+
+from elixir.tracing.tracing import TracerWrapper, merge_association_properties
 
 
 @contextmanager
@@ -11,3 +14,35 @@ def get_tracer(flush_on_exit: bool = False):
     finally:
         if flush_on_exit:
             wrapper.flush()
+
+
+class AssociationScope:
+    """Adds association properties to spans started inside a `with` block.
+
+    The properties live in the current context, so they are isolated per
+    thread and per asyncio task and are removed when the block exits. Create a
+    new scope for each block, they are not reentrant.
+    """
+
+    __slots__ = ("properties", "_token")
+
+    def __init__(self, properties: dict):
+        self.properties = properties
+        self._token = None
+
+    def __enter__(self) -> "AssociationScope":
+        self._token = attach(self.context(get_current()))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        detach(self._token)
+        self._token = None
+
+    async def __aenter__(self) -> "AssociationScope":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        self.__exit__(exc_type, exc_value, traceback)
+
+    def context(self, context: Optional[Context] = None) -> Context:
+        return merge_association_properties(self.properties, context)
@@ -0,0 +1,144 @@
+import copy
+import logging
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.trace import Span
+
+from elixir.telemetry import Telemetry
+from elixir.tracing.limits import AttributeLimits
+from elixir.tracing.serialization import EntitySerializer
+
+# Payloads of spans that are dropped before export are evicted oldest first
+# once this many spans are pending
+DEFAULT_MAX_PENDING_SPANS = 8192
+
+
+class CopyPolicy:
+    NONE = "none"
+    SHALLOW = "shallow"
+    DEEP = "deep"
+
+
+COPY_POLICIES = (CopyPolicy.NONE, CopyPolicy.SHALLOW, CopyPolicy.DEEP)
+
+
+class DeferredPayloads:
+    """Entity payloads captured on the request path, keyed by span id.
+
+    Values are snapshotted according to the copy policy and kept until the
+    span is exported, when `DeferredSerializationExporter` encodes them.
+    """
+
+    def __init__(
+        self,
+        copy_policy: str = CopyPolicy.NONE,
+        max_pending_spans: int = DEFAULT_MAX_PENDING_SPANS,
+    ):
+        if copy_policy not in COPY_POLICIES:
+            raise ValueError(
+                f"payload_copy_policy must be one of {', '.join(COPY_POLICIES)}"
+            )
+
+        self.copy_policy = copy_policy
+        self.max_pending_spans = max_pending_spans
+        self._payloads: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def snapshot(self, value: Any) -> Any:
+        if self.copy_policy == CopyPolicy.NONE:
+            return value
+        try:
+            if self.copy_policy == CopyPolicy.SHALLOW:
+                return copy.copy(value)
+            return copy.deepcopy(value)
+        except Exception:
+            # Uncopyable values (locks, clients, ...) are captured by reference
+            return value
+
+    def snapshot_inputs(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        if self.copy_policy == CopyPolicy.NONE:
+            return inputs
+        return {name: self.snapshot(value) for name, value in inputs.items()}
+
+    def defer(self, span: Span, key: str, value: Any) -> None:
+        span_id = span.get_span_context().span_id
+        with self._lock:
+            payloads = self._payloads.get(span_id)
+            if payloads is None:
+                if len(self._payloads) >= self.max_pending_spans:
+                    del self._payloads[next(iter(self._payloads))]
+                payloads = self._payloads[span_id] = {}
+            payloads[key] = value
+
+    def pop(self, span_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._payloads.pop(span_id, None)
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+
+class DeferredSerializationExporter(SpanExporter):
+    """Encodes deferred entity payloads right before export.
+
+    With a `BatchSpanProcessor` this runs on the processor's worker thread, so
+    the request path only pays for capturing references. Spans that are
+    sampled out are never captured and spans dropped from the queue are never
+    encoded. Encoded payloads are truncated to `limits`, like attributes set
+    on the span.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        payloads: DeferredPayloads,
+        serializer: EntitySerializer,
+        limits: Optional[AttributeLimits] = None,
+    ):
+        self._exporter = exporter
+        self._payloads = payloads
+        self._serializer = serializer
+        self._limits = limits
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        return self._exporter.export([self._materialize(span) for span in spans])
+
+    def shutdown(self) -> None:
+        self._exporter.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._exporter.force_flush(timeout_millis)
+
+    def _materialize(self, span: ReadableSpan) -> ReadableSpan:
+        payloads = self._payloads.pop(span.context.span_id)
+        if not payloads:
+            return span
+
+        attributes = dict(span.attributes)
+        for key, value in payloads.items():
+            try:
+                value = self._serializer.serialize(value)
+                if self._limits is not None:
+                    value = self._limits.truncate(key, value)
+                attributes[key] = value
+            except Exception as e:
+                logging.warning(f"Failed to serialize deferred {key}: {e}")
+                Telemetry().log_exception(e)
+
+        return ReadableSpan(
+            name=span.name,
+            context=span.context,
+            parent=span.parent,
+            resource=span.resource,
+            attributes=attributes,
+            events=span.events,
+            links=span.links,
+            kind=span.kind,
+            status=span.status,
+            start_time=span.start_time,
+            end_time=span.end_time,
+            instrumentation_scope=span.instrumentation_scope,
+        )
@@ -0,0 +1,100 @@
+import logging
+import os
+import sys
+import threading
+from importlib.abc import Loader, MetaPathFinder
+from importlib.machinery import ModuleSpec
+from types import ModuleType
+from typing import Callable, Dict, List, Optional, Sequence
+
+from elixir.telemetry import Telemetry
+
+
+class _HookedLoader(Loader):
+    def __init__(self, loader: Loader, fullname: str, finder: "ImportHookFinder"):
+        self._loader = loader
+        self._fullname = fullname
+        self._finder = finder
+
+    def create_module(self, spec: ModuleSpec) -> Optional[ModuleType]:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        self._loader.exec_module(module)
+        self._finder.run_hooks(self._fullname)
+
+    def __getattr__(self, name: str):
+        # Keep resource readers, `get_source` and friends working
+        return getattr(self._loader, name)
+
+
+class ImportHookFinder(MetaPathFinder):
+    """Runs callbacks right after a watched module is first imported.
+
+    Installed at the front of `sys.meta_path`. It only intercepts watched
+    top-level module names, and it wraps the loader that the remaining finders
+    return. Each hook runs once.
+    """
+
+    def __init__(self):
+        self._hooks: Dict[str, List[Callable[[], None]]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, module_name: str, hook: Callable[[], None]) -> None:
+        if module_name in sys.modules:
+            _run_hook(module_name, hook)
+            return
+
+        with self._lock:
+            self._hooks.setdefault(module_name, []).append(hook)
+            if self not in sys.meta_path:
+                sys.meta_path.insert(0, self)
+
+    def _at_fork_reinit(self) -> None:
+        self._lock = threading.Lock()
+
+    def pending(self) -> List[str]:
+        return list(self._hooks)
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Optional[Sequence[str]],
+        target: Optional[ModuleType] = None,
+    ) -> Optional[ModuleSpec]:
+        if fullname not in self._hooks:
+            return None
+
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is None or not hasattr(spec.loader, "exec_module"):
+                return spec
+            spec.loader = _HookedLoader(spec.loader, fullname, self)
+            return spec
+        return None
+
+    def run_hooks(self, module_name: str) -> None:
+        with self._lock:
+            hooks = self._hooks.pop(module_name, [])
+            if not self._hooks and self in sys.meta_path:
+                sys.meta_path.remove(self)
+
+        for hook in hooks:
+            _run_hook(module_name, hook)
+
+
+def _run_hook(module_name: str, hook: Callable[[], None]) -> None:
+    try:
+        hook()
+    except Exception as e:
+        logging.error(f"Error running import hook for {module_name}: {e}")
+        Telemetry().log_exception(e)
+
+
+import_hook_finder = ImportHookFinder()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=import_hook_finder._at_fork_reinit)
@@ -0,0 +1,318 @@
+import importlib
+import importlib.util
+import logging
+import os
+import sys
+import threading
+from contextlib import nullcontext
+from functools import partial
+from importlib.metadata import entry_points
+from typing import Dict, List, Optional, Sequence, Set, Union
+
+from opentelemetry.instrumentation.instrumentor import BaseInstrumentor
+
+from elixir.instruments import Instruments
+from elixir.startup import get_startup_report
+from elixir.telemetry import Telemetry
+from elixir.tracing.import_hooks import import_hook_finder
+
+ENTRY_POINT_GROUP = "elixir.instrumentors"
+
+
+class InstrumentorSpec:
+    """Describes how to apply an OpenTelemetry instrumentor to a library.
+
+    `instrumentor` is either a `BaseInstrumentor` subclass or a
+    `"module:ClassName"` path that is only imported when the instrumentor is
+    enabled. `enrich_kwargs` are constructor arguments set to the
+    `should_enrich_metrics` init option.
+    """
+
+    __slots__ = (
+        "name",
+        "module_name",
+        "instrumentor",
+        "display_name",
+        "enrich_kwargs",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        module_name: str,
+        instrumentor: Union[str, type],
+        display_name: Optional[str] = None,
+        enrich_kwargs: Sequence[str] = (),
+    ):
+        self.name = name
+        self.module_name = module_name
+        self.instrumentor = instrumentor
+        self.display_name = display_name or name
+        self.enrich_kwargs = tuple(enrich_kwargs)
+
+    def load(self) -> type:
+        if not isinstance(self.instrumentor, str):
+            return self.instrumentor
+        module_path, class_name = self.instrumentor.split(":")
+        return getattr(importlib.import_module(module_path), class_name)
+
+    def create(self, should_enrich_metrics: bool) -> BaseInstrumentor:
+        kwargs = {name: should_enrich_metrics for name in self.enrich_kwargs}
+        return self.load()(
+            exception_logger=lambda e: Telemetry().log_exception(e), **kwargs
+        )
+
+
+BUILTIN_INSTRUMENTORS = [
+    InstrumentorSpec(
+        Instruments.OPENAI.value,
+        "openai",
+        "opentelemetry.instrumentation.openai:OpenAIInstrumentor",
+        display_name="OpenAI",
+        enrich_kwargs=("enrich_assistant", "enrich_token_usage"),
+    ),
+    InstrumentorSpec(
+        Instruments.ANTHROPIC.value,
+        "anthropic",
+        "opentelemetry.instrumentation.anthropic:AnthropicInstrumentor",
+        display_name="Anthropic",
+        enrich_kwargs=("enrich_token_usage",),
+    ),
+    InstrumentorSpec(
+        Instruments.COHERE.value,
+        "cohere",
+        "opentelemetry.instrumentation.cohere:CohereInstrumentor",
+        display_name="Cohere",
+    ),
+    InstrumentorSpec(
+        Instruments.PINECONE.value,
+        "pinecone",
+        "opentelemetry.instrumentation.pinecone:PineconeInstrumentor",
+        display_name="Pinecone",
+    ),
+    InstrumentorSpec(
+        Instruments.QDRANT.value,
+        "qdrant_client",
+        "opentelemetry.instrumentation.qdrant:QdrantInstrumentor",
+        display_name="Qdrant",
+    ),
+    InstrumentorSpec(
+        Instruments.CHROMA.value,
+        "chromadb",
+        "opentelemetry.instrumentation.chromadb:ChromaInstrumentor",
+        display_name="Chroma",
+    ),
+    InstrumentorSpec(
+        Instruments.HAYSTACK.value,
+        "haystack",
+        "opentelemetry.instrumentation.haystack:HaystackInstrumentor",
+        display_name="Haystack",
+    ),
+    # Every LangChain package (langchain, langchain_openai, ...) imports
+    # langchain_core, which is also what the instrumentor patches
+    InstrumentorSpec(
+        Instruments.LANGCHAIN.value,
+        "langchain_core",
+        "opentelemetry.instrumentation.langchain:LangchainInstrumentor",
+        display_name="LangChain",
+    ),
+    InstrumentorSpec(
+        Instruments.MISTRAL.value,
+        "mistralai",
+        "opentelemetry.instrumentation.mistralai:MistralAiInstrumentor",
+        display_name="MistralAI",
+    ),
+    InstrumentorSpec(
+        Instruments.OLLAMA.value,
+        "ollama",
+        "opentelemetry.instrumentation.ollama:OllamaInstrumentor",
+        display_name="Ollama",
+    ),
+    InstrumentorSpec(
+        Instruments.LLAMA_INDEX.value,
+        "llama_index",
+        "opentelemetry.instrumentation.llamaindex:LlamaIndexInstrumentor",
+        display_name="LlamaIndex",
+    ),
+    InstrumentorSpec(
+        Instruments.MILVUS.value,
+        "pymilvus",
+        "opentelemetry.instrumentation.milvus:MilvusInstrumentor",
+        display_name="Milvus",
+    ),
+    InstrumentorSpec(
+        Instruments.TRANSFORMERS.value,
+        "transformers",
+        "opentelemetry.instrumentation.transformers:TransformersInstrumentor",
+        display_name="Transformers",
+    ),
+    InstrumentorSpec(
+        Instruments.BEDROCK.value,
+        "boto3",
+        "opentelemetry.instrumentation.bedrock:BedrockInstrumentor",
+        display_name="Bedrock",
+        enrich_kwargs=("enrich_token_usage",),
+    ),
+    InstrumentorSpec(
+        Instruments.REPLICATE.value,
+        "replicate",
+        "opentelemetry.instrumentation.replicate:ReplicateInstrumentor",
+        display_name="Replicate",
+    ),
+    InstrumentorSpec(
+        Instruments.VERTEXAI.value,
+        "vertexai",
+        "opentelemetry.instrumentation.vertexai:VertexAIInstrumentor",
+        display_name="Vertex AI",
+    ),
+    InstrumentorSpec(
+        Instruments.WATSONX.value,
+        "ibm_watson_machine_learning",
+        "opentelemetry.instrumentation.watsonx:WatsonxInstrumentor",
+        display_name="Watsonx",
+    ),
+    InstrumentorSpec(
+        Instruments.WEAVIATE.value,
+        "weaviate",
+        "opentelemetry.instrumentation.weaviate:WeaviateInstrumentor",
+        display_name="Weaviate",
+    ),
+]
+
+
+class InstrumentorRegistry:
+    """Instrumentors that can be enabled and disabled at runtime.
+
+    Third party packages add instrumentors through the `elixir.instrumentors`
+    entry point group, pointing at an `InstrumentorSpec` or a callable that
+    returns one.
+    """
+
+    def __init__(self, specs: Sequence[InstrumentorSpec] = ()):
+        self._specs: Dict[str, InstrumentorSpec] = {}
+        self._active: Dict[str, BaseInstrumentor] = {}
+        # Instrumentors waiting for their library to be imported
+        self._pending: Set[str] = set()
+        self._lock = threading.RLock()
+        for spec in specs:
+            self.register(spec)
+
+    def _at_fork_reinit(self) -> None:
+        self._lock = threading.RLock()
+
+    def register(self, spec: InstrumentorSpec) -> None:
+        self._specs[spec.name] = spec
+
+    def get(self, name: Union[str, Instruments]) -> Optional[InstrumentorSpec]:
+        return self._specs.get(_instrument_name(name))
+
+    def names(self) -> List[str]:
+        return list(self._specs)
+
+    def enabled(self) -> List[str]:
+        return list(self._active)
+
+    def load_entry_points(self, group: str = ENTRY_POINT_GROUP) -> None:
+        for entry_point in entry_points(group=group):
+            try:
+                spec = entry_point.load()
+                if not isinstance(spec, InstrumentorSpec):
+                    spec = spec()
+                self.register(spec)
+            except Exception as e:
+                logging.error(f"Error loading instrumentor {entry_point.name}: {e}")
+                Telemetry().log_exception(e)
+
+    def enable(
+        self,
+        name: Union[str, Instruments],
+        should_enrich_metrics: bool = True,
+        lazy: bool = False,
+        startup: bool = False,
+    ) -> bool:
+        """Instruments the library, or waits for its import when `lazy`.
+
+        `startup` records the time spent in the startup report, for the
+        instrumentors enabled by `Elixir.init`.
+        """
+        spec = self.get(name)
+        if spec is None:
+            return False
+
+        if lazy and spec.module_name not in sys.modules:
+            with self._lock:
+                self._pending.add(spec.name)
+            # Defer importing the library until the application imports it
+            import_hook_finder.register(
+                spec.module_name,
+                partial(self._enable_on_import, spec, should_enrich_metrics, startup),
+            )
+            return True
+        with self._lock:
+            self._pending.discard(spec.name)
+        return self._instrument(spec, should_enrich_metrics, startup)
+
+    def disable(self, name: Union[str, Instruments]) -> bool:
+        spec = self.get(name)
+        if spec is None:
+            return False
+
+        with self._lock:
+            pending = spec.name in self._pending
+            self._pending.discard(spec.name)
+            instrumentor = self._active.pop(spec.name, None)
+        if instrumentor is None:
+            # Cancelling a lazy instrumentor before its import also succeeds
+            return pending
+
+        try:
+            instrumentor.uninstrument()
+            Telemetry().capture(f"instrumentation:{spec.name}:uninstrument")
+            return True
+        except Exception as e:
+            logging.error(f"Error uninstrumenting {spec.display_name}: {e}")
+            Telemetry().log_exception(e)
+            return False
+
+    def _enable_on_import(
+        self, spec: InstrumentorSpec, should_enrich_metrics: bool, startup: bool
+    ):
+        with self._lock:
+            if spec.name not in self._pending:
+                return
+            self._pending.discard(spec.name)
+        self._instrument(spec, should_enrich_metrics, startup)
+
+    def _instrument(
+        self, spec: InstrumentorSpec, should_enrich_metrics: bool, startup: bool
+    ) -> bool:
+        measure = (
+            get_startup_report().measure(f"instrumentor.{spec.name}")
+            if startup
+            else nullcontext()
+        )
+        with self._lock, measure:
+            try:
+                if importlib.util.find_spec(spec.module_name) is None:
+                    return False
+                Telemetry().capture(f"instrumentation:{spec.name}:init")
+                instrumentor = spec.create(should_enrich_metrics)
+                if not instrumentor.is_instrumented_by_opentelemetry:
+                    instrumentor.instrument()
+                self._active[spec.name] = instrumentor
+                return True
+            except Exception as e:
+                logging.error(
+                    f"Error initializing {spec.display_name} instrumentor: {e}"
+                )
+                Telemetry().log_exception(e)
+                return False
+
+
+def _instrument_name(name: Union[str, Instruments]) -> str:
+    return name.value if isinstance(name, Instruments) else name
+
+
+instrumentor_registry = InstrumentorRegistry(BUILTIN_INSTRUMENTORS)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=instrumentor_registry._at_fork_reinit)
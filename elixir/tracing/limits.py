@@ -0,0 +1,147 @@
+from functools import lru_cache
+from typing import Dict, Optional
+
+from opentelemetry.attributes import BoundedAttributes
+from opentelemetry.sdk.trace import SpanLimits
+
+from elixir.tracing.serialization import TRUNCATED
+
+# A UTF-8 encoded character takes at most this many bytes
+_MAX_CHAR_BYTES = 4
+
+
+class AttributeLimits:
+    """Size limits applied to span attributes as they are set.
+
+    `max_attribute_bytes` caps every string attribute, `key_limits` overrides
+    it per key. Keys ending in `*` match by prefix (`gen_ai.prompt.*`) and the
+    longest matching key wins. Limits are in UTF-8 bytes and truncated values
+    end with a `...[truncated]` marker. `max_attributes` caps the number of
+    attributes on a span, the oldest ones are dropped past it.
+    """
+
+    __slots__ = (
+        "max_attributes",
+        "max_attribute_bytes",
+        "key_limits",
+        "_prefix_limits",
+        "limit_for",
+    )
+
+    def __init__(
+        self,
+        max_attributes: Optional[int] = None,
+        max_attribute_bytes: Optional[int] = None,
+        key_limits: Optional[Dict[str, int]] = None,
+    ):
+        for limit in [max_attribute_bytes, *(key_limits or {}).values()]:
+            if limit is not None and limit < 0:
+                raise ValueError("attribute limits must not be negative")
+
+        self.max_attributes = max_attributes
+        self.max_attribute_bytes = max_attribute_bytes
+        self.key_limits = {
+            key: limit
+            for key, limit in (key_limits or {}).items()
+            if not key.endswith("*")
+        }
+        self._prefix_limits = sorted(
+            (
+                (key[:-1], limit)
+                for key, limit in (key_limits or {}).items()
+                if key.endswith("*")
+            ),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        # Instrumentors set the same few keys over and over
+        self.limit_for = lru_cache(1024)(self._limit_for)
+
+    @property
+    def truncates(self) -> bool:
+        return bool(
+            self.max_attribute_bytes is not None
+            or self.key_limits
+            or self._prefix_limits
+        )
+
+    def span_limits(self) -> Optional[SpanLimits]:
+        if self.max_attributes is None:
+            return None
+        return SpanLimits(max_span_attributes=self.max_attributes)
+
+    def _limit_for(self, key: str) -> Optional[int]:
+        if key in self.key_limits:
+            return self.key_limits[key]
+        for prefix, limit in self._prefix_limits:
+            if key.startswith(prefix):
+                return limit
+        return self.max_attribute_bytes
+
+    def truncate(self, key: str, value):
+        limit = self.limit_for(key)
+        if limit is None:
+            return value
+        if isinstance(value, str):
+            return truncate_utf8(value, limit)
+        if isinstance(value, (list, tuple)):
+            return [
+                truncate_utf8(item, limit) if isinstance(item, str) else item
+                for item in value
+            ]
+        return value
+
+
+def truncate_utf8(value: str, max_bytes: int) -> str:
+    # Most values are well under the limit, skip encoding those
+    if len(value) * _MAX_CHAR_BYTES <= max_bytes:
+        return value
+    encoded = value.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return value
+    if max_bytes < len(TRUNCATED) * 2:
+        return encoded[:max_bytes].decode("utf-8", "ignore")
+    # Cutting mid character leaves a partial sequence, drop it
+    head = encoded[: max_bytes - len(TRUNCATED)].decode("utf-8", "ignore")
+    return head + TRUNCATED
+
+
+class TruncatingAttributes(BoundedAttributes):
+    """Span attributes that apply `AttributeLimits` to every value set."""
+
+    def __init__(
+        self,
+        limits: AttributeLimits,
+        maxlen: Optional[int] = None,
+        attributes=None,
+        max_value_len: Optional[int] = None,
+    ):
+        # The base constructor sets the initial attributes through __setitem__
+        self.limits = limits
+        super().__init__(
+            maxlen, attributes, immutable=False, max_value_len=max_value_len
+        )
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, self.limits.truncate(key, value))
+
+
+def apply_attribute_limits(span, limits: AttributeLimits) -> None:
+    """Swaps a started span's attributes for ones that enforce `limits`.
+
+    Attributes passed to `start_span` are truncated here, the ones set later
+    are truncated as they are set.
+    """
+    attributes = getattr(span, "_attributes", None)
+    if not isinstance(attributes, BoundedAttributes) or isinstance(
+        attributes, TruncatingAttributes
+    ):
+        return
+    truncating = TruncatingAttributes(
+        limits,
+        attributes.maxlen,
+        attributes,
+        attributes.max_value_len,
+    )
+    truncating.dropped += attributes.dropped
+    span._attributes = truncating
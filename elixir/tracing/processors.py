@@ -0,0 +1,110 @@
+from typing import Optional
+
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter
+
+from elixir.metrics.pipeline import pipeline_stats
+
+# The adaptive processor runs at full speed once the queue is this full
+FULL_LOAD_QUEUE_RATIO = 0.25
+
+
+class MonitoredBatchSpanProcessor(BatchSpanProcessor):
+    """Batch processor that counts the spans dropped from its full queue.
+
+    The queue is internal to the SDK's processor, SDK versions without it
+    export as usual but report an empty queue and no dropped spans.
+    """
+
+    def queue_size(self) -> int:
+        queue = getattr(self, "queue", None)
+        return len(queue) if queue is not None else 0
+
+    def queue_capacity(self) -> int:
+        return getattr(self, "max_queue_size", 0)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        # The queue drops its oldest span to make room for this one
+        if self.queue_size() == self.queue_capacity() and not getattr(
+            self, "done", True
+        ):
+            pipeline_stats.record_dropped_span()
+        super().on_end(span)
+
+
+class AdaptiveBatchSpanProcessor(MonitoredBatchSpanProcessor):
+    """Batch processor that scales with the depth of its queue.
+
+    As the queue fills, batches grow from `max_export_batch_size` up to
+    `max_adaptive_batch_size` and the delay between exports shrinks from
+    `schedule_delay_millis` down to `min_schedule_delay_millis`. Both decay back
+    to their configured values once the queue drains. Adapting hooks into the
+    SDK processor's worker, on SDK versions it can't hook into the processor
+    keeps its configured batch size and delay.
+    """
+
+    def __init__(
+        self,
+        span_exporter: SpanExporter,
+        max_queue_size: Optional[int] = None,
+        schedule_delay_millis: Optional[float] = None,
+        max_export_batch_size: Optional[int] = None,
+        export_timeout_millis: Optional[float] = None,
+        min_schedule_delay_millis: Optional[float] = None,
+        max_adaptive_batch_size: Optional[int] = None,
+    ):
+        # The worker thread starts in the base constructor, hold off adapting
+        # until the limits below are set
+        self._adaptive = False
+        super().__init__(
+            span_exporter,
+            max_queue_size=max_queue_size,
+            schedule_delay_millis=schedule_delay_millis,
+            max_export_batch_size=max_export_batch_size,
+            export_timeout_millis=export_timeout_millis,
+        )
+
+        self.base_schedule_delay_millis = self.schedule_delay_millis
+        self.base_export_batch_size = self.max_export_batch_size
+        self.min_schedule_delay_millis = min(
+            (
+                min_schedule_delay_millis
+                if min_schedule_delay_millis is not None
+                else self.schedule_delay_millis / 10
+            ),
+            self.schedule_delay_millis,
+        )
+        self.max_adaptive_batch_size = min(
+            max(
+                max_adaptive_batch_size or self.max_export_batch_size * 8,
+                self.max_export_batch_size,
+            ),
+            self.max_queue_size,
+        )
+        self.load = 0.0
+        # The worker reuses this list for every batch, size it for the largest
+        self.spans_list = [None] * self.max_adaptive_batch_size
+        self._adaptive = True
+
+    def _get_and_unset_flush_request(self):
+        # Called by the worker every time it wakes up, including when idle
+        if self._adaptive:
+            self._adapt()
+        return super()._get_and_unset_flush_request()
+
+    def _adapt(self) -> None:
+        load = min(
+            self.queue_size() / (self.queue_capacity() * FULL_LOAD_QUEUE_RATIO), 1
+        )
+        # Ramp up right away but back off gradually, bursts tend to come in waves
+        self.load = max(load, self.load / 2 if self.load > 0.01 else 0.0)
+
+        self.max_export_batch_size = int(
+            self.base_export_batch_size
+            + (self.max_adaptive_batch_size - self.base_export_batch_size) * self.load
+        )
+        self.schedule_delay_millis = (
+            self.base_schedule_delay_millis
+            - (self.base_schedule_delay_millis - self.min_schedule_delay_millis)
+            * self.load
+        )
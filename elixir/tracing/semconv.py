@@ -8,6 +8,21 @@ class SpanAttributes(BaseSpanAttributes):
     ELIXIR_ENTITY_OUTPUT = "elixir.entity.output"
     ELIXIR_ASSOCIATION_PROPERTIES = "elixir.association.properties"
 
+    # Streaming entities, durations are in seconds
+    ELIXIR_STREAM_STATUS = "elixir.stream.status"
+    ELIXIR_STREAM_CHUNKS = "elixir.stream.chunks"
+    ELIXIR_STREAM_BYTES = "elixir.stream.bytes"
+    ELIXIR_STREAM_TIME_TO_FIRST_CHUNK = "elixir.stream.time_to_first_chunk"
+    ELIXIR_STREAM_CHUNK_LATENCY_MIN = "elixir.stream.chunk_latency.min"
+    ELIXIR_STREAM_CHUNK_LATENCY_MAX = "elixir.stream.chunk_latency.max"
+    ELIXIR_STREAM_CHUNK_LATENCY_MEAN = "elixir.stream.chunk_latency.mean"
+
+
+class StreamStatus:
+    COMPLETED = "completed"
+    CLOSED = "closed"
+    ERROR = "error"
+
 
 class ElixirContextValues:
     ASSOCIATION_PROPERTIES = "association_properties"
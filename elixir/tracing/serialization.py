@@ -0,0 +1,160 @@
+import datetime
+import json
+from collections.abc import Mapping
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+from typing import Any, Callable, Dict
+
+DEFAULT_MAX_BYTES = 32 * 1024
+DEFAULT_MAX_DEPTH = 6
+DEFAULT_MAX_ITEMS = 100
+DEFAULT_MAX_STRING_LENGTH = 8 * 1024
+
+TRUNCATED = "...[truncated]"
+
+# Rough encoded size of scalars and JSON punctuation, used to charge the budget
+# without encoding each value twice.
+_SCALAR_COST = 8
+_ITEM_COST = 3
+_MARKER_COST = len(TRUNCATED) + _ITEM_COST + 2
+
+
+class _Budget:
+    __slots__ = ("remaining",)
+
+    def __init__(self, remaining: int):
+        self.remaining = remaining
+
+
+class EntitySerializer:
+    """Bounded JSON encoder for entity inputs and outputs.
+
+    Values are first reduced to a JSON-safe structure that respects the depth,
+    item, string length and overall size limits, so large payloads are sliced
+    instead of being copied and encoded in full. UUIDs, decimals, dates and
+    enums are encoded by value, other types that JSON can't encode are
+    replaced with a cheap `<module.Type>` placeholder instead of raising.
+    The encoded output is hard capped at `max_bytes` characters.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        max_items: int = DEFAULT_MAX_ITEMS,
+        max_string_length: int = DEFAULT_MAX_STRING_LENGTH,
+    ):
+        self.max_bytes = max_bytes
+        self.max_depth = max_depth
+        self.max_items = max_items
+        self.max_string_length = max_string_length
+        self._encoders: Dict[type, Callable[[Any, int, _Budget], Any]] = {
+            type(None): self._encode_scalar,
+            bool: self._encode_scalar,
+            int: self._encode_scalar,
+            float: self._encode_scalar,
+            str: self._encode_str,
+            dict: self._encode_mapping,
+            list: self._encode_sequence,
+            tuple: self._encode_sequence,
+        }
+
+    def serialize(self, value: Any) -> str:
+        # Keep room for the truncation markers appended while unwinding nested
+        # containers, so truncated output stays valid JSON
+        reserve = (self.max_depth + 1) * _MARKER_COST
+        budget = _Budget(max(self.max_bytes - reserve, 0))
+        reduced = self._reduce(value, 0, budget)
+        encoded = json.dumps(reduced, ensure_ascii=False, separators=(",", ":"))
+        if len(encoded) > self.max_bytes:
+            encoded = encoded[: self.max_bytes] + TRUNCATED
+        return encoded
+
+    def _reduce(self, value: Any, depth: int, budget: _Budget) -> Any:
+        cls = type(value)
+        encoder = self._encoders.get(cls)
+        if encoder is None:
+            encoder = self._encoders[cls] = self._resolve_encoder(cls)
+        return encoder(value, depth, budget)
+
+    def _resolve_encoder(self, cls: type) -> Callable[[Any, int, _Budget], Any]:
+        if issubclass(cls, (bool, int, float)):
+            return self._encode_scalar
+        if issubclass(cls, str):
+            return self._encode_str
+        if issubclass(cls, Mapping):
+            return self._encode_mapping
+        if issubclass(cls, (list, tuple, set, frozenset)):
+            return self._encode_sequence
+        if issubclass(cls, (bytes, bytearray, memoryview)):
+            return self._encode_bytes
+        if issubclass(cls, (datetime.date, datetime.time)):
+            return self._encode_isoformat
+        if issubclass(cls, (UUID, Decimal)):
+            return self._encode_text
+        if issubclass(cls, Enum):
+            return self._encode_enum
+
+        placeholder = f"<{cls.__module__}.{cls.__qualname__}>"
+
+        def encode_placeholder(value: Any, depth: int, budget: _Budget) -> str:
+            budget.remaining -= len(placeholder)
+            return placeholder
+
+        return encode_placeholder
+
+    def _encode_scalar(self, value: Any, depth: int, budget: _Budget) -> Any:
+        budget.remaining -= _SCALAR_COST
+        return value
+
+    def _encode_str(self, value: str, depth: int, budget: _Budget) -> str:
+        limit = min(self.max_string_length, max(budget.remaining, 0))
+        if len(value) > limit:
+            value = value[:limit] + TRUNCATED
+        budget.remaining -= len(value) + _ITEM_COST
+        return value
+
+    def _encode_bytes(self, value: Any, depth: int, budget: _Budget) -> str:
+        placeholder = f"<{type(value).__name__} len={len(value)}>"
+        budget.remaining -= len(placeholder)
+        return placeholder
+
+    def _encode_isoformat(self, value: Any, depth: int, budget: _Budget) -> str:
+        return self._encode_str(value.isoformat(), depth, budget)
+
+    def _encode_text(self, value: Any, depth: int, budget: _Budget) -> str:
+        return self._encode_str(str(value), depth, budget)
+
+    def _encode_enum(self, value: Enum, depth: int, budget: _Budget) -> Any:
+        return self._reduce(value.value, depth, budget)
+
+    def _encode_mapping(self, value: Mapping, depth: int, budget: _Budget) -> Any:
+        if depth >= self.max_depth:
+            return self._encode_str(TRUNCATED, depth, budget)
+
+        budget.remaining -= _ITEM_COST
+        result = {}
+        for index, (key, item) in enumerate(value.items()):
+            if index >= self.max_items or budget.remaining <= 0:
+                result[TRUNCATED] = len(value) - index
+                break
+            if not isinstance(key, str):
+                key = str(key)
+            budget.remaining -= len(key) + _ITEM_COST + 1
+            result[key] = self._reduce(item, depth + 1, budget)
+        return result
+
+    def _encode_sequence(self, value: Any, depth: int, budget: _Budget) -> Any:
+        if depth >= self.max_depth:
+            return self._encode_str(TRUNCATED, depth, budget)
+
+        budget.remaining -= _ITEM_COST
+        result = []
+        for index, item in enumerate(value):
+            if index >= self.max_items or budget.remaining <= 0:
+                result.append(TRUNCATED)
+                break
+            budget.remaining -= _ITEM_COST
+            result.append(self._reduce(item, depth + 1, budget))
+        return result
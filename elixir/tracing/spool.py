@@ -0,0 +1,393 @@
+import logging
+import os
+import struct
+import threading
+import time
+from typing import BinaryIO, Callable, List, Optional, Sequence, Tuple
+
+from grpc import RpcError, StatusCode
+from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (
+    OTLPSpanExporter as GRPCExporter,
+)
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+    OTLPSpanExporter as HTTPExporter,
+)
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+    ExportTraceServiceRequest,
+)
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+from elixir.metrics.pipeline import PipelineStats, Signal
+
+DEFAULT_MAX_SPOOL_BYTES = 256 * 1024 * 1024
+DEFAULT_SEGMENT_BYTES = 8 * 1024 * 1024
+# Small spools are still split into this many segments, so eviction drops a
+# fraction of the spool instead of all of it
+MIN_SEGMENTS = 4
+SEGMENT_SUFFIX = ".spool"
+
+# Responses worth retrying along with any 5xx, other rejections are permanent
+RETRYABLE_HTTP_STATUSES = frozenset([408, 429])
+RETRYABLE_GRPC_CODES = frozenset(
+    [
+        StatusCode.CANCELLED,
+        StatusCode.DEADLINE_EXCEEDED,
+        StatusCode.RESOURCE_EXHAUSTED,
+        StatusCode.ABORTED,
+        StatusCode.OUT_OF_RANGE,
+        StatusCode.UNAVAILABLE,
+        StatusCode.DATA_LOSS,
+    ]
+)
+
+# Each record is a big endian length and span count followed by an encoded
+# OTLP request
+_RECORD_HEADER = struct.Struct(">II")
+
+
+class RejectedBatchError(Exception):
+    """The collector refused a batch for good, sending it again won't help."""
+
+
+class SpanSpool:
+    """Bounded on-disk log of encoded span batches.
+
+    Batches are appended to segment files named `<time_ns>-<pid>.spool`, so
+    sorting the names gives the order they were written in. Once the spool
+    grows past `max_bytes` the oldest segments are deleted. Segments left
+    behind by processes that are no longer running are adopted on startup.
+    Replay is at least once: a batch may be sent again if the process stops
+    while its segment is being replayed. Batches the collector rejects for
+    good are dropped during replay instead of blocking the ones behind them.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = DEFAULT_MAX_SPOOL_BYTES,
+        segment_bytes: Optional[int] = None,
+    ):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.segment_bytes = max(
+            min(
+                segment_bytes or DEFAULT_SEGMENT_BYTES,
+                max_bytes // MIN_SEGMENTS,
+            ),
+            1,
+        )
+        self.dropped_batches = 0
+        self.dropped_spans = 0
+        self.replayed_batches = 0
+        self.replayed_spans = 0
+        self._lock = threading.Lock()
+        self._writer: Optional[BinaryIO] = None
+        self._writer_path: Optional[str] = None
+        # Bytes of the oldest segment that were already replayed
+        self._read_offset = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._segments: List[str] = self._adopt_segments()
+        self._size = sum(_file_size(path) for path in self._segments)
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def append(self, data: bytes, spans: int = 0) -> None:
+        record = _RECORD_HEADER.pack(len(data), spans) + data
+        with self._lock:
+            if self._writer is None or self._writer.tell() >= self.segment_bytes:
+                self._rotate()
+            # Flushed to the OS, not fsynced, the spool only has to survive
+            # the collector going away, not the machine
+            self._writer.write(record)
+            self._writer.flush()
+            self._size += len(record)
+            self._evict()
+
+    def replay(self, send: Callable[[bytes], bool]) -> bool:
+        """Sends spooled batches oldest first until one fails.
+
+        Returns whether the spool was fully drained.
+        """
+        with self._lock:
+            while self._segments:
+                path = self._segments[0]
+                if path == self._writer_path:
+                    self._close_writer()
+
+                offset = self._replay_segment(path, send)
+                if offset is not None:
+                    self._read_offset = offset
+                    return False
+
+                self._remove_oldest()
+            return True
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_writer()
+
+    def record_dropped(self, spans: int = 0) -> None:
+        with self._lock:
+            self.dropped_batches += 1
+            self.dropped_spans += spans
+
+    def _replay_segment(self, path: str, send: Callable[[bytes], bool]):
+        # Returns the offset of the first batch that could not be sent, or
+        # None when the whole segment was sent
+        try:
+            with open(path, "rb") as f:
+                f.seek(self._read_offset)
+                while True:
+                    offset = f.tell()
+                    header = f.read(_RECORD_HEADER.size)
+                    if len(header) < _RECORD_HEADER.size:
+                        return None
+                    length, spans = _RECORD_HEADER.unpack(header)
+                    data = f.read(length)
+                    if len(data) < length:
+                        # Torn write from a process that died mid append
+                        return None
+                    try:
+                        if not send(data):
+                            return offset
+                    except RejectedBatchError as e:
+                        logging.warning(
+                            f"Dropped spooled spans rejected by collector: {e}"
+                        )
+                        self.dropped_batches += 1
+                        self.dropped_spans += spans
+                        continue
+                    self.replayed_batches += 1
+                    self.replayed_spans += spans
+        except OSError as e:
+            logging.warning(f"Failed to read span spool segment {path}: {e}")
+            return None
+
+    def _rotate(self) -> None:
+        self._close_writer()
+        self._writer_path = os.path.join(
+            self.directory, f"{time.time_ns():020d}-{os.getpid()}{SEGMENT_SUFFIX}"
+        )
+        self._writer = open(self._writer_path, "ab")
+        self._segments.append(self._writer_path)
+
+    def _close_writer(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._writer = None
+        self._writer_path = None
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and len(self._segments) > 1:
+            # Batches before the read offset were already replayed
+            batches, spans = _count_records(self._segments[0], self._read_offset)
+            self.dropped_batches += batches
+            self.dropped_spans += spans
+            self._remove_oldest()
+            logging.warning(
+                f"Span spool is over {self.max_bytes} bytes, dropped oldest segment"
+            )
+
+    def _remove_oldest(self) -> None:
+        path = self._segments.pop(0)
+        self._size -= _file_size(path)
+        self._read_offset = 0
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _adopt_segments(self) -> List[str]:
+        segments = []
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(SEGMENT_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            timestamp, _, pid = name[: -len(SEGMENT_SUFFIX)].partition("-")
+            if pid.isdigit() and int(pid) != os.getpid() and _is_running(int(pid)):
+                continue
+
+            # Renaming is atomic, only one process can win an orphaned segment
+            adopted = os.path.join(
+                self.directory, f"{timestamp}-{os.getpid()}{SEGMENT_SUFFIX}"
+            )
+            try:
+                os.rename(path, adopted)
+            except OSError:
+                continue
+            segments.append(adopted)
+        return segments
+
+
+class SpoolingSpanExporter(SpanExporter):
+    """Spools span batches to disk while the collector is unreachable.
+
+    Batches that fail to export are appended to a `SpanSpool`. Later exports
+    first replay the spool, backing off exponentially between attempts, and
+    new batches are spooled behind it until it is drained. Replaying sends the
+    encoded OTLP requests as is, so only OTLP exporters are supported.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        spool: SpanSpool,
+        initial_backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 60.0,
+        stats: Optional[PipelineStats] = None,
+    ):
+        self._exporter = exporter
+        self._spool = spool
+        self._stats = stats
+        self._send_request = _otlp_sender(exporter, stats)
+        self._initial_backoff_seconds = initial_backoff_seconds
+        self._max_backoff_seconds = max_backoff_seconds
+        self._backoff_seconds = 0.0
+        self._next_attempt = 0.0
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        data = encode_spans(spans).SerializePartialToString()
+        with self._lock:
+            try:
+                if (not len(self._spool) or self._replay()) and self._send(data):
+                    return SpanExportResult.SUCCESS
+            except RejectedBatchError as e:
+                logging.warning(f"Dropped spans rejected by collector: {e}")
+                self._spool.record_dropped(len(spans))
+                return SpanExportResult.FAILURE
+
+            self._spool.append(data, len(spans))
+            if self._stats is not None:
+                self._stats.record_spooled(len(spans))
+            if not self._backoff_seconds:
+                self._back_off()
+            # Delivered once the spool is replayed
+            return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._replay()
+        self._spool.close()
+        self._exporter.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        with self._lock:
+            drained = self._replay()
+        return self._exporter.force_flush(timeout_millis) and drained
+
+    def _replay(self) -> bool:
+        if time.monotonic() < self._next_attempt:
+            return False
+        if self._spool.replay(self._send):
+            self._backoff_seconds = 0.0
+            return True
+        self._back_off()
+        return False
+
+    def _back_off(self) -> None:
+        self._backoff_seconds = min(
+            max(self._backoff_seconds * 2, self._initial_backoff_seconds),
+            self._max_backoff_seconds,
+        )
+        self._next_attempt = time.monotonic() + self._backoff_seconds
+
+    def _send(self, data: bytes) -> bool:
+        try:
+            return self._send_request(data)
+        except RejectedBatchError:
+            raise
+        except Exception as e:
+            logging.debug(f"Failed to export spooled spans: {e}")
+            return False
+
+
+def _otlp_sender(
+    exporter: SpanExporter, stats: Optional[PipelineStats] = None
+) -> Callable[[bytes], bool]:
+    # Senders return whether the batch was delivered and raise
+    # RejectedBatchError when it never will be
+    if isinstance(exporter, HTTPExporter):
+
+        def send_http(data: bytes) -> bool:
+            response = exporter._export(data)
+            if response.ok:
+                return True
+            if response.status_code in RETRYABLE_HTTP_STATUSES or (
+                response.status_code >= 500
+            ):
+                return False
+            raise RejectedBatchError(f"HTTP {response.status_code}")
+
+        return send_http
+
+    if isinstance(exporter, GRPCExporter):
+
+        def send_grpc(data: bytes) -> bool:
+            # Sent without the exporter's _translate_data, count it here
+            if stats is not None:
+                stats.record_bytes_sent(Signal.TRACES, len(data))
+            try:
+                exporter._client.Export(
+                    request=ExportTraceServiceRequest.FromString(data),
+                    metadata=exporter._headers,
+                    timeout=exporter._timeout,
+                )
+            except RpcError as e:
+                code = e.code() if callable(getattr(e, "code", None)) else None
+                if code is None or code in RETRYABLE_GRPC_CODES:
+                    return False
+                raise RejectedBatchError(f"gRPC {code.name}") from e
+            return True
+
+        return send_grpc
+
+    raise ValueError("Span spooling requires an OTLP span exporter")
+
+
+def _count_records(path: str, offset: int = 0) -> Tuple[int, int]:
+    # Batches and spans in a segment from `offset` on
+    batches = spans = 0
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            while True:
+                header = f.read(_RECORD_HEADER.size)
+                if len(header) < _RECORD_HEADER.size:
+                    return batches, spans
+                length, count = _RECORD_HEADER.unpack(header)
+                f.seek(length, os.SEEK_CUR)
+                batches += 1
+                spans += count
+    except OSError:
+        return batches, spans
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _is_running(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
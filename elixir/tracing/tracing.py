@@ -1,7 +1,8 @@
 import atexit
 import logging
 import os
-import importlib.util
+from functools import lru_cache
+from types import MappingProxyType
 
 
 from colorama import Fore
@@ -12,23 +13,57 @@ from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (
     OTLPSpanExporter as GRPCExporter,
 )
+from opentelemetry.sdk.environment_variables import (
+    OTEL_BSP_MAX_EXPORT_BATCH_SIZE,
+    OTEL_BSP_MAX_QUEUE_SIZE,
+    OTEL_BSP_SCHEDULE_DELAY,
+)
 from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider, SpanProcessor
+from opentelemetry.sdk.trace import SpanLimits, TracerProvider, SpanProcessor
+from opentelemetry.sdk.trace.sampling import (
+    ParentBased,
+    Sampler,
+    TraceIdRatioBased,
+)
 from opentelemetry.sdk.trace.export import (
     SpanExporter,
     SimpleSpanProcessor,
-    BatchSpanProcessor,
 )
 from opentelemetry.trace import get_tracer_provider, ProxyTracerProvider
-from opentelemetry.context import get_value, attach, set_value
+from opentelemetry.context import Context, get_current, get_value, attach, set_value
 
 from elixir import Telemetry
+from elixir.config.transport import ExporterOptions, Protocol
 from elixir.instruments import Instruments
+from elixir.startup import get_startup_report
+from elixir.tracing.deferred import (
+    COPY_POLICIES,
+    CopyPolicy,
+    DeferredPayloads,
+    DeferredSerializationExporter,
+)
+from elixir.tracing.instrumentors import instrumentor_registry
+from elixir.tracing.limits import AttributeLimits, apply_attribute_limits
+from elixir.metrics.pipeline import InstrumentedSpanExporter, Signal, pipeline_stats
+from elixir.tracing.processors import (
+    AdaptiveBatchSpanProcessor,
+    MonitoredBatchSpanProcessor,
+)
 from elixir.tracing.semconv import ElixirContextValues, SpanAttributes
+from elixir.tracing.serialization import EntitySerializer
+from elixir.tracing.spool import (
+    DEFAULT_MAX_SPOOL_BYTES,
+    SpanSpool,
+    SpoolingSpanExporter,
+)
 from elixir.utils.ipython import is_notebook
-from typing import Dict, Optional, Set
+from typing import Any, Dict, Mapping, Optional, Set, Union
 
 TRACER_NAME = "elixir.tracer"
+# Batch span processor defaults, after the OTEL_BSP_* environment variables
+DEFAULT_MAX_QUEUE_SIZE = 2048
+DEFAULT_SCHEDULE_DELAY_MILLIS = 5000
+DEFAULT_MAX_EXPORT_BATCH_SIZE = 512
 EXCLUDED_URLS = """
     iam.cloud.ibm.com,
     dataplatform.cloud.ibm.com,
@@ -50,6 +85,12 @@ class TracerWrapper(object):
     resource_attributes: dict = {}
     endpoint: str = None
     headers: Dict[str, str] = {}
+    exporter_options: ExporterOptions = ExporterOptions()
+    entity_serializer: EntitySerializer = EntitySerializer()
+    # Set when entity payloads are serialized at export time instead of inline
+    deferred_payloads: Optional[DeferredPayloads] = None
+    # Set when span attributes are truncated as they are set
+    attribute_limits: Optional[AttributeLimits] = None
 
     def __new__(
         cls,
@@ -57,171 +98,97 @@ class TracerWrapper(object):
         should_enrich_metrics: bool = True,
         instruments: Optional[Set[Instruments]] = None,
         exporter: SpanExporter = None,
+        entity_serializer: Optional[EntitySerializer] = None,
+        sampler: Optional[Sampler] = None,
+        defer_serialization: bool = False,
+        payload_copy_policy: str = CopyPolicy.NONE,
+        lazy_instrumentation: bool = False,
+        adaptive_batching: bool = False,
+        max_queue_size: Optional[int] = None,
+        max_export_batch_size: Optional[int] = None,
+        schedule_delay_millis: Optional[float] = None,
+        export_timeout_millis: Optional[float] = None,
+        spool_directory: Optional[str] = None,
+        spool_max_bytes: int = DEFAULT_MAX_SPOOL_BYTES,
+        attribute_limits: Optional[AttributeLimits] = None,
     ) -> "TracerWrapper":
         if not hasattr(cls, "instance"):
+            # Fail before the singleton is set, so a bad option doesn't leave
+            # a half built instance behind
+            validate_options(
+                disable_batch=disable_batch,
+                payload_copy_policy=payload_copy_policy,
+                max_queue_size=max_queue_size,
+                max_export_batch_size=max_export_batch_size,
+                schedule_delay_millis=schedule_delay_millis,
+                spool_max_bytes=spool_max_bytes,
+            )
             obj = cls.instance = super(TracerWrapper, cls).__new__(cls)
+            if entity_serializer is not None:
+                obj.entity_serializer = entity_serializer
+            if defer_serialization:
+                obj.deferred_payloads = DeferredPayloads(payload_copy_policy)
+            if attribute_limits is not None and attribute_limits.truncates:
+                obj.attribute_limits = attribute_limits
             if not TracerWrapper.endpoint:
                 return obj
 
             obj.__resource = Resource(attributes=TracerWrapper.resource_attributes)
-            obj.__tracer_provider: TracerProvider = init_tracer_provider(
-                resource=obj.__resource
-            )
+            with get_startup_report().measure("tracer_provider"):
+                obj.__tracer_provider: TracerProvider = init_tracer_provider(
+                    resource=obj.__resource,
+                    sampler=sampler,
+                    span_limits=attribute_limits and attribute_limits.span_limits(),
+                )
+            # Tracers are immutable, create ours once instead of on every span
+            obj.__tracer = obj.__tracer_provider.get_tracer(TRACER_NAME)
 
             Telemetry().capture(
                 "tracer:init",
                 {
                     "exporter": "custom" if exporter else TracerWrapper.endpoint,
-                    "processor": "simple" if disable_batch else "batch",
+                    "processor": (
+                        "simple"
+                        if disable_batch
+                        else "adaptive" if adaptive_batching else "batch"
+                    ),
                 },
             )
 
-            obj.__spans_exporter: SpanExporter = (
-                exporter
-                if exporter
-                else init_spans_exporter(TracerWrapper.endpoint, TracerWrapper.headers)
+            obj.__exporter = exporter
+            obj.__spool_directory = spool_directory
+            obj.__spool_max_bytes = spool_max_bytes
+            with get_startup_report().measure("spans_exporter"):
+                obj.__spans_exporter: SpanExporter = obj._init_spans_exporter()
+            obj.__spans_processor: SpanProcessor = init_spans_processor(
+                obj.__spans_exporter,
+                disable_batch=disable_batch,
+                adaptive_batching=adaptive_batching,
+                max_queue_size=max_queue_size,
+                max_export_batch_size=max_export_batch_size,
+                schedule_delay_millis=schedule_delay_millis,
+                export_timeout_millis=export_timeout_millis,
             )
-            if disable_batch or is_notebook():
-                obj.__spans_processor: SpanProcessor = SimpleSpanProcessor(
-                    obj.__spans_exporter
-                )
-            else:
-                obj.__spans_processor: SpanProcessor = BatchSpanProcessor(
-                    obj.__spans_exporter
-                )
             obj.__spans_processor_original_on_start = None
+            pipeline_stats.span_processor = obj.__spans_processor
 
             obj.__spans_processor.on_start = obj._span_processor_on_start
             obj.__tracer_provider.add_span_processor(obj.__spans_processor)
 
+            obj.should_enrich_metrics = should_enrich_metrics
+            instrumentor_registry.load_entry_points()
+
             instrument_set = False
             if instruments is None:
-                init_instrumentations(should_enrich_metrics)
+                init_instrumentations(should_enrich_metrics, lazy=lazy_instrumentation)
                 instrument_set = True
             else:
                 for instrument in instruments:
-                    if instrument == Instruments.OPENAI:
-                        if not init_openai_instrumentor(should_enrich_metrics):
-                            print(Fore.RED + "Warning: OpenAI library does not exist.")
-                            print(Fore.RESET)
-                        else:
-                            instrument_set = True
-                    elif instrument == Instruments.ANTHROPIC:
-                        if not init_anthropic_instrumentor(should_enrich_metrics):
-                            print(
-                                Fore.RED + "Warning: Anthropic library does not exist."
-                            )
-                            print(Fore.RESET)
-                        else:
-                            instrument_set = True
-                    elif instrument == Instruments.COHERE:
-                        if not init_cohere_instrumentor():
-                            print(Fore.RED + "Warning: Cohere library does not exist.")
-                            print(Fore.RESET)
-                        else:
-                            instrument_set = True
-                    elif instrument == Instruments.PINECONE:
-                        if not init_pinecone_instrumentor():
-                            print(
-                                Fore.RED + "Warning: Pinecone library does not exist."
-                            )
-                            print(Fore.RESET)
-                        else:
-                            instrument_set = True
-                    elif instrument == Instruments.CHROMA:
-                        if not init_chroma_instrumentor():
-                            print(Fore.RED + "Warning: Chroma library does not exist.")
-                            print(Fore.RESET)
-                        else:
-                            instrument_set = True
-                    elif instrument == Instruments.LANGCHAIN:
-                        if not init_langchain_instrumentor():
-                            print(
-                                Fore.RED + "Warning: LangChain library does not exist."
-                            )
-                            print(Fore.RESET)
-                        else:
-                            instrument_set = True
-                    elif instrument == Instruments.MISTRAL:
-                        if not init_mistralai_instrumentor():
-                            print(
-                                Fore.RED + "Warning: MistralAI library does not exist."
-                            )
-                            print(Fore.RESET)
-                        else:
-                            instrument_set = True
-                    elif instrument == Instruments.OLLAMA:
-                        if not init_ollama_instrumentor():
-                            print(Fore.RED + "Warning: Ollama library does not exist.")
-                            print(Fore.RESET)
-                        else:
-                            instrument_set = True
-                    elif instrument == Instruments.LLAMA_INDEX:
-                        if not init_llama_index_instrumentor():
-                            print(
-                                Fore.RED + "Warning: LlamaIndex library does not exist."
-                            )
-                            print(Fore.RESET)
-                        else:
-                            instrument_set = True
-                    elif instrument == Instruments.MILVUS:
-                        if not init_milvus_instrumentor():
-                            print(Fore.RED + "Warning: Milvus library does not exist.")
-                            print(Fore.RESET)
-                        else:
-                            instrument_set = True
-                    elif instrument == Instruments.TRANSFORMERS:
-                        if not init_transformers_instrumentor():
-                            print(
-                                Fore.RED
-                                + "Warning: Transformers library does not exist."
-                            )
-                            print(Fore.RESET)
-                        else:
-                            instrument_set = True
-                    elif instrument == Instruments.BEDROCK:
-                        if not init_bedrock_instrumentor(should_enrich_metrics):
-                            print(Fore.RED + "Warning: Bedrock library does not exist.")
-                            print(Fore.RESET)
-                        else:
-                            instrument_set = True
-                    elif instrument == Instruments.REPLICATE:
-                        if not init_replicate_instrumentor():
-                            print(
-                                Fore.RED + "Warning: Replicate library does not exist."
-                            )
-                            print(Fore.RESET)
-                        else:
-                            instrument_set = True
-                    elif instrument == Instruments.VERTEXAI:
-                        if not init_vertexai_instrumentor():
-                            print(
-                                Fore.RED + "Warning: Vertex AI library does not exist."
-                            )
-                            print(Fore.RESET)
-                        else:
-                            instrument_set = True
-                    elif instrument == Instruments.WATSONX:
-                        if not init_watsonx_instrumentor():
-                            print(Fore.RED + "Warning: Watsonx library does not exist.")
-                            print(Fore.RESET)
-                        else:
-                            instrument_set = True
-                    elif instrument == Instruments.WEAVIATE:
-                        if not init_weaviate_instrumentor():
-                            print(
-                                Fore.RED + "Warning: Weaviate library does not exist."
-                            )
-                            print(Fore.RESET)
-                        else:
-                            instrument_set = True
-
-                    else:
+                    spec = instrumentor_registry.get(instrument)
+                    if spec is None:
                         print(
                             Fore.RED
-                            + "Warning: "
-                            + instrument
-                            + " instrumentation does not exist."
+                            + f"Warning: {instrument} instrumentation does not exist."
                         )
                         print(
                             "Usage:\n"
@@ -229,6 +196,19 @@ class TracerWrapper(object):
                             + 'Elixir.init(app_name="...", instruments=set([Instruments.OPENAI]))'
                         )
                         print(Fore.RESET)
+                    elif instrumentor_registry.enable(
+                        spec.name,
+                        should_enrich_metrics,
+                        lazy=lazy_instrumentation,
+                        startup=True,
+                    ):
+                        instrument_set = True
+                    else:
+                        print(
+                            Fore.RED
+                            + f"Warning: {spec.display_name} library does not exist."
+                        )
+                        print(Fore.RESET)
 
             if not instrument_set:
                 print(
@@ -239,23 +219,61 @@ class TracerWrapper(object):
 
             # Force flushes for debug environments (e.g. local development)
             atexit.register(obj.exit_handler)
+            # Background threads and connections don't survive a fork
+            if hasattr(os, "register_at_fork"):
+                os.register_at_fork(after_in_child=obj._at_fork_reinit)
 
         return cls.instance
 
     def exit_handler(self):
         self.flush()
 
+    def _init_spans_exporter(self) -> SpanExporter:
+        exporter = self.__exporter or init_spans_exporter(
+            TracerWrapper.endpoint,
+            TracerWrapper.headers,
+            TracerWrapper.exporter_options,
+        )
+        if self.__spool_directory:
+            spool = SpanSpool(self.__spool_directory, max_bytes=self.__spool_max_bytes)
+            exporter = SpoolingSpanExporter(exporter, spool, stats=pipeline_stats)
+            pipeline_stats.spool = spool
+        if self.deferred_payloads is not None:
+            exporter = DeferredSerializationExporter(
+                exporter,
+                self.deferred_payloads,
+                self.entity_serializer,
+                self.attribute_limits,
+            )
+        return InstrumentedSpanExporter(exporter, pipeline_stats)
+
+    def _at_fork_reinit(self):
+        # The batch processor restarts its own worker thread in the child, but
+        # the exporter's pooled connections, gRPC channel and spool file are
+        # still the parent's. Rebuild them, the resource, sampler and
+        # instrumentors carry over as they are.
+        if self.deferred_payloads is not None:
+            self.deferred_payloads = DeferredPayloads(
+                self.deferred_payloads.copy_policy
+            )
+        self.__spans_exporter = self._init_spans_exporter()
+        self.__spans_processor.span_exporter = self.__spans_exporter
+
     def _span_processor_on_start(self, span, parent_context):
-        entity_name = get_value(ElixirContextValues.ENTITY_NAME)
+        if self.attribute_limits is not None:
+            apply_attribute_limits(span, self.attribute_limits)
+
+        context = get_current()
+        entity_name = get_value(ElixirContextValues.ENTITY_NAME, context)
         if entity_name is not None:
             span.set_attribute(SpanAttributes.ELIXIR_ENTITY_NAME, entity_name)
 
-        association_properties = get_value(ElixirContextValues.ASSOCIATION_PROPERTIES)
-        if association_properties is not None:
-            for key, value in association_properties.items():
-                span.set_attribute(
-                    f"{SpanAttributes.ELIXIR_ASSOCIATION_PROPERTIES}.{key}", value
-                )
+        # Already prefixed by `set_association_properties`
+        association_attributes = get_value(
+            ElixirContextValues.ASSOCIATION_PROPERTIES, context
+        )
+        if association_attributes:
+            span.set_attributes(association_attributes)
 
         # Call original on_start method if it exists in custom processor
         if self.__spans_processor_original_on_start:
@@ -266,10 +284,12 @@ class TracerWrapper(object):
         resource_attributes: dict,
         endpoint: str,
         headers: Dict[str, str],
+        exporter_options: Optional[ExporterOptions] = None,
     ) -> None:
         TracerWrapper.resource_attributes = resource_attributes
         TracerWrapper.endpoint = endpoint
         TracerWrapper.headers = headers
+        TracerWrapper.exporter_options = exporter_options or ExporterOptions()
 
     @classmethod
     def verify_initialized(cls) -> bool:
@@ -286,19 +306,56 @@ class TracerWrapper(object):
         print(Fore.RESET)
         return False
 
-    def flush(self):
-        self.__spans_processor.force_flush()
+    def flush(self) -> bool:
+        return self.__spans_processor.force_flush()
 
     def get_tracer(self):
-        return self.__tracer_provider.get_tracer(TRACER_NAME)
+        return self.__tracer
+
+    def enable_instrument(self, instrument: Union[str, Instruments]) -> bool:
+        return instrumentor_registry.enable(instrument, self.should_enrich_metrics)
+
+    def disable_instrument(self, instrument: Union[str, Instruments]) -> bool:
+        return instrumentor_registry.disable(instrument)
 
 
 def set_association_properties(properties: dict) -> None:
-    attach(set_value(ElixirContextValues.ASSOCIATION_PROPERTIES, properties))
+    attach(merge_association_properties(properties))
+
 
+def merge_association_properties(
+    properties: dict, context: Optional[Context] = None
+) -> Context:
+    """Context with `properties` added to the association properties in it."""
+    parent = get_value(ElixirContextValues.ASSOCIATION_PROPERTIES, context)
+    return set_value(
+        ElixirContextValues.ASSOCIATION_PROPERTIES,
+        association_attributes(properties, parent),
+        context,
+    )
 
-def set_entity_name(entity_name: str) -> None:
-    attach(set_value(ElixirContextValues.ENTITY_NAME, entity_name))
+
+def association_attributes(
+    properties: dict, parent: Optional[Mapping[str, Any]] = None
+) -> Mapping[str, Any]:
+    """Span attributes for association properties.
+
+    Built once per change of the properties and shared by every span started
+    in that context.
+    """
+    attributes = dict(parent) if parent else {}
+    for key, value in properties.items():
+        attributes[association_attribute_key(key)] = value
+    return MappingProxyType(attributes)
+
+
+@lru_cache(maxsize=1024)
+def association_attribute_key(key: str) -> str:
+    return f"{SpanAttributes.ELIXIR_ASSOCIATION_PROPERTIES}.{key}"
+
+
+def set_entity_name(entity_name: str, context: Optional[Context] = None) -> Context:
+    return set_value(ElixirContextValues.ENTITY_NAME, entity_name, context)
 
 
 def get_chained_entity_name(entity_name: str) -> str:
@@ -309,19 +366,123 @@ def get_chained_entity_name(entity_name: str) -> str:
         return f"{parent}.{entity_name}"
 
 
-def init_spans_exporter(api_endpoint: str, headers: Dict[str, str]) -> SpanExporter:
-    if "http" in api_endpoint.lower():
-        return HTTPExporter(endpoint=f"{api_endpoint}/traces", headers=headers)
+def init_spans_exporter(
+    api_endpoint: str,
+    headers: Dict[str, str],
+    options: Optional[ExporterOptions] = None,
+) -> SpanExporter:
+    options = options or ExporterOptions()
+    if options.protocol_for(api_endpoint) == Protocol.HTTP:
+        session = options.http_session()
+        session.hooks["response"].append(pipeline_stats.bytes_hook(Signal.TRACES))
+        return HTTPExporter(
+            endpoint=f"{api_endpoint}/traces",
+            headers=headers,
+            timeout=options.timeout,
+            compression=options.http_compression(),
+            session=session,
+        )
     else:
-        return GRPCExporter(endpoint=f"{api_endpoint}", headers=headers)
-
+        exporter = GRPCExporter(
+            endpoint=f"{api_endpoint}",
+            headers=headers,
+            timeout=options.timeout,
+            compression=options.grpc_compression(),
+        )
+        channel = options.grpc_channel(api_endpoint)
+        if channel is not None:
+            exporter._client = exporter._stub(channel)
+        exporter._translate_data = pipeline_stats.grpc_bytes_hook(
+            Signal.TRACES, exporter._translate_data
+        )
+        return exporter
+
+
+def validate_options(
+    disable_batch: bool = False,
+    payload_copy_policy: str = CopyPolicy.NONE,
+    max_queue_size: Optional[int] = None,
+    max_export_batch_size: Optional[int] = None,
+    schedule_delay_millis: Optional[float] = None,
+    spool_max_bytes: int = DEFAULT_MAX_SPOOL_BYTES,
+) -> None:
+    if payload_copy_policy not in COPY_POLICIES:
+        raise ValueError(
+            f"payload_copy_policy must be one of {', '.join(COPY_POLICIES)}"
+        )
+    if spool_max_bytes <= 0:
+        raise ValueError("spool_max_bytes must be positive")
+    if disable_batch:
+        return
 
-def init_tracer_provider(resource: Resource) -> TracerProvider:
+    # Unset options resolve the same way the batch processor does
+    max_queue_size = _batch_option(
+        max_queue_size, OTEL_BSP_MAX_QUEUE_SIZE, DEFAULT_MAX_QUEUE_SIZE
+    )
+    schedule_delay_millis = _batch_option(
+        schedule_delay_millis, OTEL_BSP_SCHEDULE_DELAY, DEFAULT_SCHEDULE_DELAY_MILLIS
+    )
+    max_export_batch_size = _batch_option(
+        max_export_batch_size,
+        OTEL_BSP_MAX_EXPORT_BATCH_SIZE,
+        DEFAULT_MAX_EXPORT_BATCH_SIZE,
+    )
+    if max_queue_size <= 0:
+        raise ValueError("max_queue_size must be positive")
+    if schedule_delay_millis <= 0:
+        raise ValueError("schedule_delay_millis must be positive")
+    if max_export_batch_size <= 0:
+        raise ValueError("max_export_batch_size must be positive")
+    if max_export_batch_size > max_queue_size:
+        raise ValueError("max_export_batch_size must not exceed max_queue_size")
+
+
+def _batch_option(value: Optional[float], env_var: str, default: int) -> float:
+    if value is not None:
+        return value
+    try:
+        return int(os.getenv(env_var) or default)
+    except ValueError:
+        # The processor logs and falls back to the default as well
+        return default
+
+
+def init_spans_processor(
+    exporter: SpanExporter,
+    disable_batch: bool = False,
+    adaptive_batching: bool = False,
+    **batch_options,
+) -> SpanProcessor:
+    if disable_batch or is_notebook():
+        return SimpleSpanProcessor(exporter)
+    # Unset options fall back to the OTEL_BSP_* environment variables
+    if adaptive_batching:
+        return AdaptiveBatchSpanProcessor(exporter, **batch_options)
+    return MonitoredBatchSpanProcessor(exporter, **batch_options)
+
+
+def init_sampler(sampling_ratio: Optional[float]) -> Optional[Sampler]:
+    if sampling_ratio is None:
+        return None
+    if not 0.0 <= sampling_ratio <= 1.0:
+        raise ValueError("sampling_ratio must be between 0.0 and 1.0")
+
+    # Respect the parent's decision so a trace is either fully kept or dropped
+    return ParentBased(root=TraceIdRatioBased(sampling_ratio))
+
+
+def init_tracer_provider(
+    resource: Resource,
+    sampler: Optional[Sampler] = None,
+    span_limits: Optional[SpanLimits] = None,
+) -> TracerProvider:
     provider: TracerProvider = None
     default_provider: TracerProvider = get_tracer_provider()
 
     if isinstance(default_provider, ProxyTracerProvider):
-        provider = TracerProvider(resource=resource)
+        provider = TracerProvider(
+            resource=resource, sampler=sampler, span_limits=span_limits
+        )
         trace.set_tracer_provider(provider)
     elif not hasattr(default_provider, "add_span_processor"):
         logging.error(
@@ -329,355 +490,21 @@ def init_tracer_provider(resource: Resource) -> TracerProvider:
         )
         return
     else:
-        provider = default_provider
-
-    return provider
-
-
-def init_instrumentations(should_enrich_metrics: bool):
-    init_openai_instrumentor(should_enrich_metrics)
-    init_anthropic_instrumentor(should_enrich_metrics)
-    init_cohere_instrumentor()
-    init_pinecone_instrumentor()
-    init_qdrant_instrumentor()
-    init_chroma_instrumentor()
-    init_haystack_instrumentor()
-    init_langchain_instrumentor()
-    init_mistralai_instrumentor()
-    init_ollama_instrumentor()
-    init_llama_index_instrumentor()
-    init_milvus_instrumentor()
-    init_transformers_instrumentor()
-    init_bedrock_instrumentor(should_enrich_metrics)
-    init_replicate_instrumentor()
-    init_vertexai_instrumentor()
-    init_watsonx_instrumentor()
-    init_weaviate_instrumentor()
-
-
-def init_openai_instrumentor(should_enrich_metrics: bool):
-    try:
-        if importlib.util.find_spec("openai") is not None:
-            Telemetry().capture("instrumentation:openai:init")
-            from opentelemetry.instrumentation.openai import OpenAIInstrumentor
-
-            instrumentor = OpenAIInstrumentor(
-                exception_logger=lambda e: Telemetry().log_exception(e),
-                enrich_assistant=should_enrich_metrics,
-                enrich_token_usage=should_enrich_metrics,
-            )
-            if not instrumentor.is_instrumented_by_opentelemetry:
-                instrumentor.instrument()
-        return True
-    except Exception as e:
-        logging.error(f"Error initializing OpenAI instrumentor: {e}")
-        Telemetry().log_exception(e)
-        return False
-
-
-def init_anthropic_instrumentor(should_enrich_metrics: bool):
-    try:
-        if importlib.util.find_spec("anthropic") is not None:
-            Telemetry().capture("instrumentation:anthropic:init")
-            from opentelemetry.instrumentation.anthropic import AnthropicInstrumentor
-
-            instrumentor = AnthropicInstrumentor(
-                exception_logger=lambda e: Telemetry().log_exception(e),
-                enrich_token_usage=should_enrich_metrics,
-            )
-            if not instrumentor.is_instrumented_by_opentelemetry:
-                instrumentor.instrument()
-        return True
-    except Exception as e:
-        logging.error(f"Error initializing Anthropic instrumentor: {e}")
-        Telemetry().log_exception(e)
-        return False
-
-
-def init_cohere_instrumentor():
-    try:
-        if importlib.util.find_spec("cohere") is not None:
-            Telemetry().capture("instrumentation:cohere:init")
-            from opentelemetry.instrumentation.cohere import CohereInstrumentor
-
-            instrumentor = CohereInstrumentor(
-                exception_logger=lambda e: Telemetry().log_exception(e),
-            )
-            if not instrumentor.is_instrumented_by_opentelemetry:
-                instrumentor.instrument()
-        return True
-    except Exception as e:
-        logging.error(f"Error initializing Cohere instrumentor: {e}")
-        Telemetry().log_exception(e)
-        return False
-
-
-def init_pinecone_instrumentor():
-    try:
-        if importlib.util.find_spec("pinecone") is not None:
-            Telemetry().capture("instrumentation:pinecone:init")
-            from opentelemetry.instrumentation.pinecone import PineconeInstrumentor
-
-            instrumentor = PineconeInstrumentor(
-                exception_logger=lambda e: Telemetry().log_exception(e),
-            )
-            if not instrumentor.is_instrumented_by_opentelemetry:
-                instrumentor.instrument()
-        return True
-    except Exception as e:
-        logging.error(f"Error initializing Pinecone instrumentor: {e}")
-        Telemetry().log_exception(e)
-        return False
-
-
-def init_qdrant_instrumentor():
-    try:
-        if importlib.util.find_spec("qdrant_client") is not None:
-            Telemetry().capture("instrumentation:qdrant:init")
-            from opentelemetry.instrumentation.qdrant import QdrantInstrumentor
-
-            instrumentor = QdrantInstrumentor(
-                exception_logger=lambda e: Telemetry().log_exception(e),
-            )
-            if not instrumentor.is_instrumented_by_opentelemetry:
-                instrumentor.instrument()
-    except Exception as e:
-        logging.error(f"Error initializing Qdrant instrumentor: {e}")
-        Telemetry().log_exception(e)
-        return False
-
-
-def init_chroma_instrumentor():
-    try:
-        if importlib.util.find_spec("chromadb") is not None:
-            Telemetry().capture("instrumentation:chromadb:init")
-            from opentelemetry.instrumentation.chromadb import ChromaInstrumentor
-
-            instrumentor = ChromaInstrumentor(
-                exception_logger=lambda e: Telemetry().log_exception(e),
-            )
-            if not instrumentor.is_instrumented_by_opentelemetry:
-                instrumentor.instrument()
-        return True
-    except Exception as e:
-        logging.error(f"Error initializing Chroma instrumentor: {e}")
-        Telemetry().log_exception(e)
-        return False
-
-
-def init_haystack_instrumentor():
-    try:
-        if importlib.util.find_spec("haystack") is not None:
-            Telemetry().capture("instrumentation:haystack:init")
-            from opentelemetry.instrumentation.haystack import HaystackInstrumentor
-
-            instrumentor = HaystackInstrumentor(
-                exception_logger=lambda e: Telemetry().log_exception(e),
-            )
-            if not instrumentor.is_instrumented_by_opentelemetry:
-                instrumentor.instrument()
-        return True
-    except Exception as e:
-        logging.error(f"Error initializing Haystack instrumentor: {e}")
-        Telemetry().log_exception(e)
-        return False
-
-
-def init_langchain_instrumentor():
-    try:
-        if importlib.util.find_spec("langchain") is not None:
-            Telemetry().capture("instrumentation:langchain:init")
-            from opentelemetry.instrumentation.langchain import LangchainInstrumentor
-
-            instrumentor = LangchainInstrumentor(
-                exception_logger=lambda e: Telemetry().log_exception(e),
-            )
-            if not instrumentor.is_instrumented_by_opentelemetry:
-                instrumentor.instrument()
-        return True
-    except Exception as e:
-        logging.error(f"Error initializing LangChain instrumentor: {e}")
-        Telemetry().log_exception(e)
-        return False
-
-
-def init_mistralai_instrumentor():
-    try:
-        if importlib.util.find_spec("mistralai") is not None:
-            Telemetry().capture("instrumentation:mistralai:init")
-            from opentelemetry.instrumentation.mistralai import MistralAiInstrumentor
-
-            instrumentor = MistralAiInstrumentor(
-                exception_logger=lambda e: Telemetry().log_exception(e),
-            )
-            if not instrumentor.is_instrumented_by_opentelemetry:
-                instrumentor.instrument()
-        return True
-    except Exception as e:
-        logging.error(f"Error initializing MistralAI instrumentor: {e}")
-        Telemetry().log_exception(e)
-        return False
-
-
-def init_ollama_instrumentor():
-    try:
-        if importlib.util.find_spec("ollama") is not None:
-            Telemetry().capture("instrumentation:ollama:init")
-            from opentelemetry.instrumentation.ollama import OllamaInstrumentor
-
-            instrumentor = OllamaInstrumentor(
-                exception_logger=lambda e: Telemetry().log_exception(e),
-            )
-            if not instrumentor.is_instrumented_by_opentelemetry:
-                instrumentor.instrument()
-        return True
-    except Exception as e:
-        logging.error(f"Error initializing Ollama instrumentor: {e}")
-        Telemetry().log_exception(e)
-        return False
-
-
-def init_transformers_instrumentor():
-    try:
-        if importlib.util.find_spec("transformers") is not None:
-            Telemetry().capture("instrumentation:transformers:init")
-            from opentelemetry.instrumentation.transformers import (
-                TransformersInstrumentor,
-            )
-
-            instrumentor = TransformersInstrumentor(
-                exception_logger=lambda e: Telemetry().log_exception(e),
-            )
-            if not instrumentor.is_instrumented_by_opentelemetry:
-                instrumentor.instrument()
-        return True
-    except Exception as e:
-        logging.error(f"Error initializing Transformers instrumentor: {e}")
-        Telemetry().log_exception(e)
-        return False
-
-
-def init_llama_index_instrumentor():
-    try:
-        if importlib.util.find_spec("llama_index") is not None:
-            Telemetry().capture("instrumentation:llamaindex:init")
-            from opentelemetry.instrumentation.llamaindex import LlamaIndexInstrumentor
-
-            instrumentor = LlamaIndexInstrumentor(
-                exception_logger=lambda e: Telemetry().log_exception(e),
-            )
-            if not instrumentor.is_instrumented_by_opentelemetry:
-                instrumentor.instrument()
-        return True
-    except Exception as e:
-        logging.error(f"Error initializing LlamaIndex instrumentor: {e}")
-        Telemetry().log_exception(e)
-        return False
-
-
-def init_milvus_instrumentor():
-    try:
-        if importlib.util.find_spec("pymilvus") is not None:
-            Telemetry().capture("instrumentation:milvus:init")
-            from opentelemetry.instrumentation.milvus import MilvusInstrumentor
-
-            instrumentor = MilvusInstrumentor(
-                exception_logger=lambda e: Telemetry().log_exception(e),
-            )
-            if not instrumentor.is_instrumented_by_opentelemetry:
-                instrumentor.instrument()
-        return True
-    except Exception as e:
-        logging.error(f"Error initializing Milvus instrumentor: {e}")
-        Telemetry().log_exception(e)
-        return False
-
-
-def init_bedrock_instrumentor(should_enrich_metrics: bool):
-    try:
-        if importlib.util.find_spec("boto3") is not None:
-            from opentelemetry.instrumentation.bedrock import BedrockInstrumentor
-
-            instrumentor = BedrockInstrumentor(
-                exception_logger=lambda e: Telemetry().log_exception(e),
-                enrich_token_usage=should_enrich_metrics,
-            )
-            if not instrumentor.is_instrumented_by_opentelemetry:
-                instrumentor.instrument()
-        return True
-    except Exception as e:
-        logging.error(f"Error initializing Bedrock instrumentor: {e}")
-        Telemetry().log_exception(e)
-        return False
-
-
-def init_replicate_instrumentor():
-    try:
-        if importlib.util.find_spec("replicate") is not None:
-            Telemetry().capture("instrumentation:replicate:init")
-            from opentelemetry.instrumentation.replicate import ReplicateInstrumentor
-
-            instrumentor = ReplicateInstrumentor(
-                exception_logger=lambda e: Telemetry().log_exception(e),
+        if sampler is not None:
+            logging.warning(
+                "Sampler is ignored since a tracer provider is already configured"
             )
-            if not instrumentor.is_instrumented_by_opentelemetry:
-                instrumentor.instrument()
-        return True
-    except Exception as e:
-        logging.error(f"Error initializing Replicate instrumentor: {e}")
-        Telemetry().log_exception(e)
-        return False
-
-
-def init_vertexai_instrumentor():
-    try:
-        if importlib.util.find_spec("vertexai") is not None:
-            Telemetry().capture("instrumentation:vertexai:init")
-            from opentelemetry.instrumentation.vertexai import VertexAIInstrumentor
-
-            instrumentor = VertexAIInstrumentor(
-                exception_logger=lambda e: Telemetry().log_exception(e),
+        if span_limits is not None:
+            logging.warning(
+                "Span limits are ignored since a tracer provider is already configured"
             )
-            if not instrumentor.is_instrumented_by_opentelemetry:
-                instrumentor.instrument()
-        return True
-    except Exception as e:
-        logging.warning(f"Error initializing Vertex AI instrumentor: {e}")
-        Telemetry().log_exception(e)
-        return False
-
-
-def init_watsonx_instrumentor():
-    try:
-        if importlib.util.find_spec("ibm_watson_machine_learning") is not None:
-            Telemetry().capture("instrumentation:watsonx:init")
-            from opentelemetry.instrumentation.watsonx import WatsonxInstrumentor
+        provider = default_provider
 
-            instrumentor = WatsonxInstrumentor(
-                exception_logger=lambda e: Telemetry().log_exception(e),
-            )
-            if not instrumentor.is_instrumented_by_opentelemetry:
-                instrumentor.instrument()
-        return True
-    except Exception as e:
-        logging.warning(f"Error initializing Watsonx instrumentor: {e}")
-        Telemetry().log_exception(e)
-        return False
+    return provider
 
 
-def init_weaviate_instrumentor():
-    try:
-        if importlib.util.find_spec("weaviate") is not None:
-            Telemetry().capture("instrumentation:weaviate:init")
-            from opentelemetry.instrumentation.weaviate import WeaviateInstrumentor
-
-            instrumentor = WeaviateInstrumentor(
-                exception_logger=lambda e: Telemetry().log_exception(e),
-            )
-            if not instrumentor.is_instrumented_by_opentelemetry:
-                instrumentor.instrument()
-        return True
-    except Exception as e:
-        logging.warning(f"Error initializing Weaviate instrumentor: {e}")
-        Telemetry().log_exception(e)
-        return False
+def init_instrumentations(should_enrich_metrics: bool, lazy: bool = False):
+    for name in instrumentor_registry.names():
+        instrumentor_registry.enable(
+            name, should_enrich_metrics, lazy=lazy, startup=True
+        )
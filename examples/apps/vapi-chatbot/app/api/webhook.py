@@ -14,9 +14,15 @@ async def webhook_route():
     request_data = request.get_json()
     payload = request_data.get("message")
 
-    Elixir.track_conversation(payload["call"]["id"])
-    Elixir.track_user("test-user", {"name": "Test User"})
+    async with Elixir.conversation(
+        payload["call"]["id"],
+        user_id="test-user",
+        user_properties={"name": "Test User"},
+    ):
+        return await handle_message(payload)
 
+
+async def handle_message(payload):
     if payload["type"] == "tool-calls":
         response = await tool_calls_handler(payload)
         return jsonify(response), 201
@@ -1,12 +1,23 @@
 """Unit tests configuration module."""
 
+import gzip
 import os
+import threading
+from typing import List, Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import PropertyMock, patch
 import pytest
 from elixir import Elixir
 from elixir.instruments import Instruments
 from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
-from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader, MetricsData
+from opentelemetry.proto.collector.metrics.v1.metrics_service_pb2 import (
+    ExportMetricsServiceRequest,
+)
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+    ExportTraceServiceRequest,
+)
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
 from opentelemetry.trace import set_tracer_provider
 
 
@@ -16,6 +27,127 @@ class OTelReceivers:
         self.metrics_reader = InMemoryMetricReader()
 
 
+def find_metric(metrics: MetricsData, name: str):
+    return next(
+        metric
+        for scope_metrics in metrics.resource_metrics[0].scope_metrics
+        for metric in scope_metrics.metrics
+        if metric.name == name
+    )
+
+
+def make_spans(*names: str, attributes: Optional[dict] = None) -> List[ReadableSpan]:
+    tracer = TracerProvider().get_tracer("test")
+    spans = []
+    for name in names:
+        span = tracer.start_span(name, attributes=attributes)
+        span.end()
+        spans.append(span)
+    return spans
+
+
+class Collector:
+    """OTLP/HTTP collector that records the spans and metrics it receives."""
+
+    def __init__(self):
+        self.available = True
+        # Batches with any of these span names are refused with a 400
+        self.rejected_span_names = set()
+        # Requests to these paths are held until `resume` is set, `held` is
+        # set once one is waiting
+        self.held_paths = set()
+        self.held = threading.Event()
+        self.resume = threading.Event()
+        self.span_names = []
+        self.span_attributes = []
+        # (metric name, string attributes) of each data point received
+        self.metric_points = []
+        self.bytes_received = 0
+
+        collector = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep connections alive so exporters reuse pooled connections
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                collector.bytes_received += len(body)
+                if any(self.path.endswith(path) for path in collector.held_paths):
+                    collector.held.set()
+                    collector.resume.wait(10)
+                if self.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                if not collector.available:
+                    self.send_response(503)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                status = 200
+                if self.path.endswith("/traces"):
+                    status = collector.receive(
+                        ExportTraceServiceRequest.FromString(body)
+                    )
+                elif self.path.endswith("/metrics"):
+                    collector.receive_metrics(
+                        ExportMetricsServiceRequest.FromString(body)
+                    )
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.endpoint = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def receive(self, request: ExportTraceServiceRequest) -> int:
+        names = {
+            span.name
+            for resource_spans in request.resource_spans
+            for scope_spans in resource_spans.scope_spans
+            for span in scope_spans.spans
+        }
+        if names & self.rejected_span_names:
+            return 400
+        for resource_spans in request.resource_spans:
+            for scope_spans in resource_spans.scope_spans:
+                for span in scope_spans.spans:
+                    self.span_names.append(span.name)
+                    self.span_attributes.append(
+                        {
+                            attribute.key: attribute.value.string_value
+                            for attribute in span.attributes
+                        }
+                    )
+        return 200
+
+    def receive_metrics(self, request: ExportMetricsServiceRequest) -> None:
+        for resource_metrics in request.resource_metrics:
+            for scope_metrics in resource_metrics.scope_metrics:
+                for metric in scope_metrics.metrics:
+                    data = getattr(metric, metric.WhichOneof("data"))
+                    for point in data.data_points:
+                        self.metric_points.append(
+                            (
+                                metric.name,
+                                {
+                                    attribute.key: attribute.value.string_value
+                                    for attribute in point.attributes
+                                },
+                            )
+                        )
+
+
+@pytest.fixture
+def collector():
+    collector = Collector()
+    yield collector
+    collector.server.shutdown()
+
+
 @pytest.fixture
 def openai_client():
     from openai import OpenAI
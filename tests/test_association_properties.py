@@ -1,6 +1,10 @@
+import asyncio
 import json
+import pytest
+from opentelemetry.context import get_value
 from elixir import Elixir
-from elixir.decorators import observe
+from elixir.decorators import aobserve, observe
+from elixir.tracing.semconv import ElixirContextValues
 
 
 def test_user_without_traits(exporter):
@@ -112,3 +116,67 @@ def test_association_properties_with_user_and_conversation(exporter):
         workflow_span.attributes["elixir.association.properties.conversation_id"]
         == "conversation1"
     )
+
+
+def test_association_attributes_are_shared(exporter):
+    Elixir.track_user("user1")
+    attributes = get_value(ElixirContextValues.ASSOCIATION_PROPERTIES)
+
+    @observe()
+    def run_workflow():
+        assert get_value(ElixirContextValues.ASSOCIATION_PROPERTIES) is attributes
+
+    run_workflow()
+    run_workflow()
+
+    assert dict(attributes) == {"elixir.association.properties.user_id": "user1"}
+    for span in exporter.get_finished_spans():
+        assert span.attributes["elixir.association.properties.user_id"] == "user1"
+
+
+def test_conversation_scope(exporter):
+    @observe()
+    def run_workflow():
+        pass
+
+    with Elixir.conversation("conversation1", user_id="user1"):
+        run_workflow()
+        with Elixir.conversation(
+            "conversation2", conversation_properties={"type": "sales_call"}
+        ):
+            run_workflow()
+        run_workflow()
+    run_workflow()
+
+    spans = exporter.get_finished_spans()
+    assert [
+        span.attributes.get("elixir.association.properties.conversation_id")
+        for span in spans
+    ] == ["conversation1", "conversation2", "conversation1", None]
+    assert spans[1].attributes["elixir.association.properties.user_id"] == "user1"
+    assert spans[1].attributes[
+        "elixir.association.properties.conversation_properties"
+    ] == json.dumps({"type": "sales_call"})
+    assert "elixir.association.properties.user_id" not in spans[3].attributes
+
+
+@pytest.mark.asyncio
+async def test_conversation_scope_is_task_local(exporter):
+    @aobserve()
+    async def run_workflow(expected: str):
+        await asyncio.sleep(0)
+
+    async def handle_call(conversation_id: str):
+        async with Elixir.conversation(conversation_id):
+            for _ in range(3):
+                await run_workflow(conversation_id)
+
+    await asyncio.gather(*(handle_call(f"call{i}") for i in range(10)))
+
+    spans = exporter.get_finished_spans()
+    assert len(spans) == 30
+    for span in spans:
+        expected = json.loads(span.attributes["elixir.entity.input"])["expected"]
+        assert (
+            span.attributes["elixir.association.properties.conversation_id"] == expected
+        )
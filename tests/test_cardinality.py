@@ -0,0 +1,136 @@
+from types import SimpleNamespace
+
+import pytest
+
+from elixir import Elixir
+from elixir.decorators import observe
+from elixir.metrics.cardinality import OVERFLOW_VALUE, CardinalityLimiter
+from elixir.metrics.metrics import MetricsWrapper
+from elixir.metrics.semconv import Meters
+from elixir.tracing.semconv import SpanAttributes
+from tests.conftest import OTelReceivers, find_metric
+
+CONVERSATION_ID = f"{SpanAttributes.ELIXIR_ASSOCIATION_PROPERTIES}.conversation_id"
+USER_ID = f"{SpanAttributes.ELIXIR_ASSOCIATION_PROPERTIES}.user_id"
+
+
+def test_limiter_counts_each_dropped_series_once():
+    limiter = CardinalityLimiter(max_series=2)
+
+    assert limiter.admit("a")
+    assert limiter.admit("b")
+    assert limiter.admit("a")
+    assert not limiter.admit("c")
+    assert not limiter.admit("c")
+    assert not limiter.admit("d")
+    assert len(limiter) == 2
+    assert limiter.dropped_series == 2
+
+    with pytest.raises(ValueError):
+        CardinalityLimiter(max_series=0)
+
+
+def test_association_keys_reach_metrics_only_when_allowed():
+    receivers = OTelReceivers()
+    Elixir.init(
+        disable_batch=True,
+        metric_association_keys={"conversation_id"},
+        _test_exporter=receivers.exporter,
+        _test_metrics_reader=receivers.metrics_reader,
+    )
+
+    @observe(name="turn")
+    def turn():
+        pass
+
+    with Elixir.conversation("c1", user_id="u1"):
+        turn()
+
+    metrics = receivers.metrics_reader.get_metrics_data()
+    (point,) = find_metric(metrics, Meters.ELIXIR_ENTITY_DURATION).data.data_points
+    assert point.attributes[CONVERSATION_ID] == "c1"
+    assert USER_ID not in point.attributes
+
+
+def test_overflow_series():
+    receivers = OTelReceivers()
+    Elixir.init(
+        disable_batch=True,
+        metric_association_keys={"conversation_id"},
+        max_metric_series=3,
+        _test_exporter=receivers.exporter,
+        _test_metrics_reader=receivers.metrics_reader,
+    )
+
+    @observe(name="turn")
+    def turn(fail: bool = False):
+        if fail:
+            raise ValueError("boom")
+
+    for i in range(10):
+        with Elixir.conversation(f"c{i}"):
+            turn()
+            turn()
+            with pytest.raises(ValueError):
+                turn(fail=True)
+
+    metrics = receivers.metrics_reader.get_metrics_data()
+    calls = {
+        point.attributes[CONVERSATION_ID]: point.count
+        for point in find_metric(
+            metrics, Meters.ELIXIR_ENTITY_DURATION
+        ).data.data_points
+    }
+    assert calls == {"c0": 3, "c1": 3, "c2": 3, OVERFLOW_VALUE: 21}
+
+    errors = find_metric(metrics, Meters.ELIXIR_ENTITY_ERRORS).data.data_points
+    assert len(errors) == 4
+    assert sum(point.value for point in errors) == 10
+
+    dropped = {
+        point.attributes["instrument"]: point.value
+        for point in find_metric(
+            metrics, Meters.ELIXIR_METRICS_SERIES_DROPPED
+        ).data.data_points
+    }
+    assert dropped[Meters.ELIXIR_ENTITY_DURATION] == 7
+    assert dropped[Meters.ELIXIR_ENTITY_ERRORS] == 7
+    assert Elixir.pipeline_stats()["metric_series_dropped"] == dropped
+
+
+def test_refused_series_take_the_fast_path():
+    receivers = OTelReceivers()
+    Elixir.init(
+        disable_batch=True,
+        metric_association_keys={"conversation_id"},
+        max_metric_series=1,
+        _test_exporter=receivers.exporter,
+        _test_metrics_reader=receivers.metrics_reader,
+    )
+
+    @observe(name="turn")
+    def turn():
+        pass
+
+    for conversation_id in ["c0", "c1", "c1", "c1"]:
+        with Elixir.conversation(conversation_id):
+            turn()
+
+    entity_metrics = MetricsWrapper.get_entity_metrics()
+    admitted = []
+    admit = entity_metrics.series_limiter.admit
+    entity_metrics.series_limiter = SimpleNamespace(
+        max_series=1, admit=lambda key: admitted.append(key) or admit(key)
+    )
+    with Elixir.conversation("c1"):
+        turn()
+    assert admitted == []
+
+    metrics = receivers.metrics_reader.get_metrics_data()
+    calls = {
+        point.attributes[CONVERSATION_ID]: point.count
+        for point in find_metric(
+            metrics, Meters.ELIXIR_ENTITY_DURATION
+        ).data.data_points
+    }
+    assert calls == {"c0": 1, OVERFLOW_VALUE: 4}
@@ -0,0 +1,139 @@
+import json
+import os
+import time
+
+import pytest
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+from elixir import Elixir
+from elixir.decorators import observe
+from elixir.metrics import metrics
+from elixir.metrics.semconv import Meters
+from elixir.tracing.semconv import SpanAttributes
+from elixir.tracing.tracing import TracerWrapper
+from tests.conftest import OTelReceivers
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_workers_export(collector, monkeypatch):
+    monkeypatch.setenv("ELIXIR_COLLECTOR_URL", collector.endpoint)
+    Elixir.init(
+        schedule_delay_millis=50,
+        _test_metrics_reader=InMemoryMetricReader(),
+    )
+
+    @observe(name="work")
+    def work(pid: int):
+        return pid
+
+    # Open a pooled connection in the parent before forking, like a preloaded app
+    work(os.getpid())
+    assert TracerWrapper.instance.flush()
+
+    workers = []
+    for _ in range(3):
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 1
+            try:
+                work(os.getpid())
+                if TracerWrapper.instance.flush():
+                    exit_code = 0
+            finally:
+                os._exit(exit_code)
+        workers.append(pid)
+
+    for pid in workers:
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+
+    exported_pids = {
+        json.loads(attributes["elixir.entity.input"])["pid"]
+        for attributes in collector.span_attributes
+    }
+    assert exported_pids == {os.getpid(), *workers}
+
+
+def entity_calls_exported(collector) -> set:
+    return {
+        attributes[SpanAttributes.ELIXIR_ENTITY_NAME]
+        for name, attributes in collector.metric_points
+        if name == Meters.ELIXIR_ENTITY_DURATION
+    }
+
+
+def wait_for(condition, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_workers_export_metrics(collector, monkeypatch):
+    monkeypatch.setenv("ELIXIR_COLLECTOR_URL", collector.endpoint)
+    providers = []
+    init = metrics.init_metrics_provider
+
+    def init_metrics_provider(*args, **kwargs):
+        providers.append(init(*args, **kwargs))
+        return providers[-1]
+
+    monkeypatch.setattr(metrics, "init_metrics_provider", init_metrics_provider)
+    Elixir.init(metrics_export_interval_millis=50)
+
+    observe(name="parent")(lambda: None)()
+    assert wait_for(lambda: "parent" in entity_calls_exported(collector))
+
+    # Fork while the parent's export thread is mid-export, holding the
+    # reader's export lock and a pooled connection
+    collector.held_paths.add("/metrics")
+    assert collector.held.wait(10)
+
+    workers = []
+    for _ in range(3):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                observe(name=f"worker_{os.getpid()}")(lambda: None)()
+                # Left to the restarted periodic reader
+                time.sleep(1)
+            finally:
+                os._exit(0)
+        workers.append(pid)
+    collector.held_paths.clear()
+    collector.resume.set()
+
+    for pid in workers:
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+
+    expected = {"parent", *(f"worker_{pid}" for pid in workers)}
+    assert wait_for(lambda: entity_calls_exported(collector) >= expected, 1)
+    assert TracerWrapper.instance.flush()
+    providers[0].shutdown()
+
+
+def test_fork_reinit_rebuilds_exporter_state():
+    receivers = OTelReceivers()
+    Elixir.init(
+        disable_batch=True,
+        defer_serialization=True,
+        _test_exporter=receivers.exporter,
+        _test_metrics_reader=receivers.metrics_reader,
+    )
+    deferred_payloads = TracerWrapper.instance.deferred_payloads
+
+    TracerWrapper.instance._at_fork_reinit()
+
+    @observe(name="work")
+    def work(value: str):
+        return value
+
+    work("child")
+
+    assert TracerWrapper.instance.deferred_payloads is not deferred_payloads
+    spans = receivers.exporter.get_finished_spans()
+    assert json.loads(spans[0].attributes["elixir.entity.input"]) == {"value": "child"}
@@ -0,0 +1,35 @@
+import sys
+
+from elixir.tracing.import_hooks import ImportHookFinder
+
+
+def test_hook_runs_after_import(tmp_path, monkeypatch):
+    (tmp_path / "elixir_lazy_module.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    finder = ImportHookFinder()
+    calls = []
+    finder.register(
+        "elixir_lazy_module", lambda: calls.append(sys.modules["elixir_lazy_module"])
+    )
+
+    assert calls == []
+    assert finder in sys.meta_path
+
+    import elixir_lazy_module
+
+    assert calls == [elixir_lazy_module]
+    assert elixir_lazy_module.VALUE == 1
+    assert finder.pending() == []
+    assert finder not in sys.meta_path
+
+    del sys.modules["elixir_lazy_module"]
+
+
+def test_hook_runs_immediately_if_imported():
+    finder = ImportHookFinder()
+    calls = []
+    finder.register("json", lambda: calls.append(1))
+
+    assert calls == [1]
+    assert finder not in sys.meta_path
@@ -0,0 +1,129 @@
+import sys
+
+from elixir import Elixir
+from elixir.instruments import Instruments
+from elixir.startup import StartupReport
+from elixir.tracing import instrumentors
+from elixir.tracing.instrumentors import InstrumentorRegistry, InstrumentorSpec
+
+
+class FakeInstrumentor:
+    instances = []
+
+    def __init__(self, exception_logger=None, enrich_token_usage=None):
+        self.enrich_token_usage = enrich_token_usage
+        self.is_instrumented_by_opentelemetry = False
+        FakeInstrumentor.instances.append(self)
+
+    def instrument(self):
+        self.is_instrumented_by_opentelemetry = True
+
+    def uninstrument(self):
+        self.is_instrumented_by_opentelemetry = False
+
+
+def fake_spec(module_name="json"):
+    return InstrumentorSpec(
+        "fake", module_name, FakeInstrumentor, enrich_kwargs=("enrich_token_usage",)
+    )
+
+
+def test_enable_and_disable():
+    registry = InstrumentorRegistry([fake_spec()])
+
+    assert registry.enable("fake", should_enrich_metrics=False)
+    instrumentor = FakeInstrumentor.instances[-1]
+    assert instrumentor.is_instrumented_by_opentelemetry
+    assert instrumentor.enrich_token_usage is False
+    assert registry.enabled() == ["fake"]
+
+    assert registry.disable("fake")
+    assert not instrumentor.is_instrumented_by_opentelemetry
+    assert registry.enabled() == []
+    assert not registry.disable("fake")
+
+
+def test_unknown_and_missing_libraries():
+    registry = InstrumentorRegistry([fake_spec("elixir_missing_library")])
+
+    assert not registry.enable("unknown")
+    assert not registry.enable("fake")
+    assert registry.enabled() == []
+
+
+def test_disable_before_lazy_import(tmp_path, monkeypatch):
+    (tmp_path / "elixir_lazy_library.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    registry = InstrumentorRegistry([fake_spec("elixir_lazy_library")])
+
+    assert registry.enable("fake", lazy=True)
+    assert registry.disable("fake")
+    assert not registry.disable("fake")
+    import elixir_lazy_library  # noqa: F401
+
+    assert registry.enabled() == []
+    del sys.modules["elixir_lazy_library"]
+
+
+def test_lazy_import_through_dependent_package(tmp_path, monkeypatch):
+    (tmp_path / "elixir_lazy_core.py").write_text("")
+    (tmp_path / "elixir_lazy_partner.py").write_text("import elixir_lazy_core\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    registry = InstrumentorRegistry([fake_spec("elixir_lazy_core")])
+
+    assert registry.enable("fake", lazy=True)
+    assert registry.enabled() == []
+    import elixir_lazy_partner  # noqa: F401
+
+    assert registry.enabled() == ["fake"]
+    del sys.modules["elixir_lazy_partner"]
+    del sys.modules["elixir_lazy_core"]
+
+
+def test_langchain_is_keyed_on_langchain_core():
+    spec = instrumentors.instrumentor_registry.get(Instruments.LANGCHAIN)
+
+    assert spec.module_name == "langchain_core"
+
+
+def test_startup_report_only_records_init(tmp_path, monkeypatch):
+    (tmp_path / "elixir_lazy_startup.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    report = StartupReport()
+    monkeypatch.setattr(instrumentors, "get_startup_report", lambda: report)
+    registry = InstrumentorRegistry([fake_spec("elixir_lazy_startup")])
+
+    assert registry.enable("fake")
+    assert report.steps == []
+
+    registry.disable("fake")
+    assert registry.enable("fake", lazy=True, startup=True)
+    import elixir_lazy_startup  # noqa: F401
+
+    assert [step.name for step in report.steps] == ["instrumentor.fake"]
+    del sys.modules["elixir_lazy_startup"]
+
+
+def test_entry_points(monkeypatch):
+    class EntryPoint:
+        name = "fake"
+
+        def load(self):
+            return fake_spec
+
+    monkeypatch.setattr(instrumentors, "entry_points", lambda group: [EntryPoint()])
+    registry = InstrumentorRegistry()
+    registry.load_entry_points()
+
+    assert registry.names() == ["fake"]
+
+
+def test_elixir_enable_and_disable_instrument(exporter, monkeypatch):
+    monkeypatch.setitem(instrumentors.instrumentor_registry._specs, "fake", fake_spec())
+
+    assert Elixir.enable_instrument("fake")
+    assert "fake" in instrumentors.instrumentor_registry.enabled()
+    assert Elixir.disable_instrument("fake")
+    assert "fake" not in instrumentors.instrumentor_registry.enabled()
+    assert Elixir.disable_instrument(Instruments.OPENAI)
+    assert not Elixir.enable_instrument("unknown")
@@ -0,0 +1,119 @@
+import pytest
+
+from elixir import Elixir
+from elixir.decorators import observe
+from elixir.tracing.limits import AttributeLimits, truncate_utf8
+from elixir.tracing.semconv import SpanAttributes
+from elixir.tracing.serialization import TRUNCATED
+from elixir.tracing.tracing import TracerWrapper
+from tests.conftest import OTelReceivers
+
+
+def test_truncate_utf8_respects_byte_limit():
+    assert truncate_utf8("short", 100) == "short"
+
+    truncated = truncate_utf8("é" * 100, 51)
+    assert truncated.endswith(TRUNCATED)
+    assert len(truncated.encode("utf-8")) <= 51
+
+    # Too small for the marker, cut on a character boundary
+    assert truncate_utf8("é" * 10, 5) == "éé"
+
+
+def test_key_limits_most_specific_wins():
+    limits = AttributeLimits(
+        max_attribute_bytes=1000,
+        key_limits={
+            "gen_ai.*": 500,
+            "gen_ai.prompt.*": 100,
+            "gen_ai.prompt.0.role": 10,
+        },
+    )
+
+    assert limits.limit_for("gen_ai.prompt.0.content") == 100
+    assert limits.limit_for("gen_ai.prompt.0.role") == 10
+    assert limits.limit_for("gen_ai.completion.0.content") == 500
+    assert limits.limit_for("http.url") == 1000
+    assert not AttributeLimits().truncates
+
+
+def test_negative_limit_raises():
+    with pytest.raises(ValueError):
+        AttributeLimits(key_limits={"gen_ai.*": -1})
+
+
+def test_span_attributes_truncated_when_set():
+    receivers = OTelReceivers()
+    Elixir.init(
+        disable_batch=True,
+        attribute_key_limits={
+            SpanAttributes.ELIXIR_ENTITY_INPUT: 64,
+            "gen_ai.prompt.*": 128,
+        },
+        _test_exporter=receivers.exporter,
+        _test_metrics_reader=receivers.metrics_reader,
+    )
+
+    @observe(name="task")
+    def task(prompt):
+        tracer = TracerWrapper.instance.get_tracer()
+        with tracer.start_as_current_span(
+            "openai.chat", attributes={"gen_ai.prompt.0.content": prompt}
+        ) as span:
+            span.set_attribute("gen_ai.prompt.1.content", prompt)
+            span.set_attribute("gen_ai.completion.0.content", prompt)
+
+    task("x" * 100_000)
+
+    spans = {span.name: span for span in receivers.exporter.get_finished_spans()}
+    chat = spans["openai.chat"].attributes
+    assert len(chat["gen_ai.prompt.0.content"]) == 128
+    assert len(chat["gen_ai.prompt.1.content"]) == 128
+    assert len(chat["gen_ai.completion.0.content"]) == 100_000
+
+    entity_input = spans["task"].attributes[SpanAttributes.ELIXIR_ENTITY_INPUT]
+    assert len(entity_input) <= 64
+    assert entity_input.endswith(TRUNCATED)
+
+
+def test_deferred_payloads_truncated():
+    receivers = OTelReceivers()
+    Elixir.init(
+        disable_batch=True,
+        defer_serialization=True,
+        max_attribute_bytes=100,
+        _test_exporter=receivers.exporter,
+        _test_metrics_reader=receivers.metrics_reader,
+    )
+
+    @observe(name="task")
+    def task(prompt):
+        return prompt * 2
+
+    task("x" * 10_000)
+
+    (span,) = receivers.exporter.get_finished_spans()
+    for key in [
+        SpanAttributes.ELIXIR_ENTITY_INPUT,
+        SpanAttributes.ELIXIR_ENTITY_OUTPUT,
+    ]:
+        assert len(span.attributes[key].encode("utf-8")) <= 100
+        assert span.attributes[key].endswith(TRUNCATED)
+
+
+def test_max_span_attributes():
+    receivers = OTelReceivers()
+    Elixir.init(
+        disable_batch=True,
+        max_span_attributes=4,
+        _test_exporter=receivers.exporter,
+        _test_metrics_reader=receivers.metrics_reader,
+    )
+
+    with TracerWrapper.instance.get_tracer().start_as_current_span("span") as span:
+        for i in range(10):
+            span.set_attribute(f"extra.{i}", i)
+
+    (span,) = receivers.exporter.get_finished_spans()
+    assert len(span.attributes) == 4
+    assert span.dropped_attributes == 6
@@ -0,0 +1,150 @@
+from typing import List
+
+import pytest
+from opentelemetry.sdk.metrics import Counter, MeterProvider, UpDownCounter
+from opentelemetry.sdk.metrics.export import (
+    AggregationTemporality,
+    MetricExporter,
+    MetricExportResult,
+    MetricsData,
+    PeriodicExportingMetricReader,
+)
+
+from elixir.config.constants import get_metrics_export_interval
+from elixir.metrics.metrics import init_metrics_exporter, init_metrics_reader
+from elixir.metrics.pipeline import InstrumentedMetricExporter, PipelineStats
+from elixir.metrics.readers import (
+    AdaptiveMetricReader,
+    Temporality,
+    preferred_temporality,
+)
+
+
+class CapturingExporter(MetricExporter):
+    def __init__(self, temporality: str = Temporality.CUMULATIVE):
+        super().__init__(preferred_temporality=preferred_temporality(temporality))
+        self.exports: List[MetricsData] = []
+
+    def export(self, metrics_data, timeout_millis=10_000, **kwargs):
+        self.exports.append(metrics_data)
+        return MetricExportResult.SUCCESS
+
+    def force_flush(self, timeout_millis=10_000):
+        return True
+
+    def shutdown(self, timeout_millis=30_000, **kwargs):
+        pass
+
+
+def make_reader(temporality: str = Temporality.CUMULATIVE):
+    exporter = CapturingExporter(temporality)
+    # Long enough for the ticker to stay out of the way, collect by hand
+    reader = AdaptiveMetricReader(
+        exporter, export_interval_millis=60_000, max_export_interval_millis=600_000
+    )
+    provider = MeterProvider(metric_readers=[reader])
+    return (
+        exporter,
+        reader,
+        provider,
+        provider.get_meter("test").create_counter("calls"),
+    )
+
+
+def test_delta_temporality_preference():
+    temporalities = preferred_temporality(Temporality.DELTA)
+    assert temporalities[Counter] == AggregationTemporality.DELTA
+    assert temporalities[UpDownCounter] == AggregationTemporality.CUMULATIVE
+    assert preferred_temporality(Temporality.CUMULATIVE) is None
+
+    with pytest.raises(ValueError):
+        preferred_temporality("lowmemory")
+
+    exporter = init_metrics_exporter("http://localhost:4318", {}, None, "delta")
+    assert exporter._preferred_temporality[Counter] == AggregationTemporality.DELTA
+
+
+def test_adaptive_reader_skips_unchanged_cumulative_metrics():
+    exporter, reader, provider, counter = make_reader()
+
+    counter.add(1)
+    reader.collect()
+    reader.collect()
+    reader.collect()
+    assert len(exporter.exports) == 1
+    assert reader.skipped_exports == 2
+    assert reader.interval_millis == 240_000
+
+    counter.add(1)
+    reader.collect()
+    assert len(exporter.exports) == 2
+    assert reader.interval_millis == 60_000
+
+    provider.shutdown()
+
+
+def test_adaptive_reader_ignores_its_own_exports():
+    exporter = CapturingExporter()
+    stats = PipelineStats()
+    reader = init_metrics_reader(
+        InstrumentedMetricExporter(exporter, stats),
+        export_interval_millis=60_000,
+        adaptive=True,
+    )
+    provider = MeterProvider(metric_readers=[reader])
+    meter = provider.get_meter("test")
+    stats.register_instruments(meter)
+    meter.create_counter("calls").add(1)
+
+    for _ in range(6):
+        reader.collect()
+    assert len(exporter.exports) == 1
+    assert reader.skipped_exports == 5
+
+    provider.shutdown()
+
+
+def test_adaptive_reader_exports_repeated_deltas():
+    exporter, reader, provider, counter = make_reader(Temporality.DELTA)
+
+    counter.add(1)
+    reader.collect()
+    counter.add(1)
+    reader.collect()
+    assert len(exporter.exports) == 2
+
+    reader.collect()
+    assert len(exporter.exports) == 2
+
+    provider.shutdown()
+
+
+def test_adaptive_reader_exports_when_idle_too_long():
+    exporter, reader, provider, counter = make_reader()
+    counter.add(1)
+    reader.collect()
+
+    reader._last_export -= reader.max_export_interval_millis / 1e3
+    reader.collect()
+    assert len(exporter.exports) == 2
+
+    provider.shutdown()
+
+
+def test_export_interval(monkeypatch):
+    reader = init_metrics_reader(CapturingExporter())
+    assert isinstance(reader, PeriodicExportingMetricReader)
+    assert reader._export_interval_millis == 1000
+    reader.shutdown()
+
+    reader = init_metrics_reader(
+        CapturingExporter(), export_interval_millis=30_000, adaptive=True
+    )
+    assert isinstance(reader, AdaptiveMetricReader)
+    assert reader.interval_millis == 30_000
+    reader.shutdown()
+
+    monkeypatch.setenv("ELIXIR_METRICS_EXPORT_INTERVAL", "15000")
+    assert get_metrics_export_interval() == 15_000
+    monkeypatch.setenv("ELIXIR_METRICS_EXPORT_INTERVAL", "soon")
+    assert get_metrics_export_interval() is None
@@ -1,4 +1,22 @@
-from opentelemetry.sdk.metrics.export import MetricsData
+import asyncio
+
+import pytest
+from opentelemetry.sdk.metrics import Histogram, MeterProvider
+from opentelemetry.sdk.metrics.export import (
+    ExponentialHistogram,
+    HistogramDataPoint,
+    InMemoryMetricReader,
+    MetricsData,
+)
+from opentelemetry.sdk.metrics.view import ExponentialBucketHistogramAggregation
+
+from elixir import Elixir
+from elixir.decorators import aobserve, observe
+from elixir.metrics.semconv import Meters
+from elixir.tracing.semconv import SpanAttributes
+from tests.conftest import OTelReceivers, find_metric
+from elixir.metrics.metrics import init_metrics_exporter, init_metrics_provider
+from elixir.metrics.views import HistogramAggregation, HistogramOptions, metric_views
 
 
 def test_metrics(metrics_reader, openai_client):
@@ -14,3 +32,176 @@ def test_metrics(metrics_reader, openai_client):
     data_point = metric.data.data_points[0]
     assert data_point.attributes["gen_ai.system"] == "openai"
     assert data_point.attributes["gen_ai.response.model"] == "gpt-3.5-turbo-0125"
+
+
+@pytest.mark.asyncio
+async def test_entity_error_metrics(metrics_reader):
+    @aobserve(name="failing_task")
+    async def failing_task():
+        raise ValueError("boom")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            await failing_task()
+
+    metrics: MetricsData = metrics_reader.get_metrics_data()
+    metric = next(
+        metric
+        for scope_metrics in metrics.resource_metrics[0].scope_metrics
+        for metric in scope_metrics.metrics
+        if metric.name == "elixir.entity.errors"
+    )
+
+    data_point = metric.data.data_points[0]
+    assert data_point.value == 2
+    assert data_point.attributes["elixir.entity.name"] == "failing_task"
+    assert data_point.attributes["error.type"] == "ValueError"
+
+
+def test_exponential_histogram_views():
+    reader = InMemoryMetricReader()
+    provider = init_metrics_provider(
+        None,
+        reader,
+        histogram_options=HistogramOptions(
+            aggregation=HistogramAggregation.EXPONENTIAL, max_scale=8, max_size=64
+        ),
+    )
+
+    duration = provider.get_meter("test").create_histogram(
+        "gen_ai.client.operation.duration"
+    )
+    for value in (0.002, 0.004, 0.9, 12.5):
+        duration.record(value)
+
+    metric = find_metric(reader.get_metrics_data(), "gen_ai.client.operation.duration")
+    assert isinstance(metric.data, ExponentialHistogram)
+    (point,) = metric.data.data_points
+    assert point.count == 4
+    assert point.scale <= 8
+    assert len(point.positive.bucket_counts) <= 64
+    provider.shutdown()
+
+
+def test_explicit_histogram_views_by_default():
+    views = metric_views()
+    assert all(
+        not isinstance(view._aggregation, ExponentialBucketHistogramAggregation)
+        for view in views
+    )
+
+
+def test_exponential_histograms_for_user_histograms():
+    options = HistogramOptions(aggregation=HistogramAggregation.EXPONENTIAL)
+    exporter = init_metrics_exporter(
+        "http://localhost:4318", {}, None, "cumulative", options
+    )
+    assert isinstance(
+        exporter._preferred_aggregation[Histogram],
+        ExponentialBucketHistogramAggregation,
+    )
+
+    reader = InMemoryMetricReader(preferred_aggregation=options.preferred_aggregation())
+    provider = MeterProvider(metric_readers=[reader], views=metric_views(options))
+    provider.get_meter("test").create_histogram("app.latency").record(0.5)
+
+    metric = find_metric(reader.get_metrics_data(), "app.latency")
+    assert not isinstance(metric.data.data_points[0], HistogramDataPoint)
+    provider.shutdown()
+
+
+def test_invalid_histogram_options():
+    with pytest.raises(ValueError):
+        HistogramOptions(aggregation="summary")
+    with pytest.raises(ValueError):
+        HistogramOptions(max_scale=21)
+
+
+@pytest.mark.asyncio
+async def test_entity_red_metrics_ignore_sampling():
+    receivers = OTelReceivers()
+    Elixir.init(
+        disable_batch=True,
+        sampling_ratio=0.0,
+        _test_exporter=receivers.exporter,
+        _test_metrics_reader=receivers.metrics_reader,
+    )
+
+    @observe(name="task")
+    def task(fail: bool):
+        if fail:
+            raise ValueError("boom")
+
+    @aobserve(name="workflow")
+    async def workflow():
+        task(False)
+        with pytest.raises(ValueError):
+            task(True)
+
+    @observe(name="stream")
+    def stream():
+        yield from range(3)
+
+    for _ in range(3):
+        await workflow()
+    assert list(stream()) == [0, 1, 2]
+
+    metrics = receivers.metrics_reader.get_metrics_data()
+    assert not receivers.exporter.get_finished_spans()
+
+    # Calls are counted by the duration histogram
+    calls = {
+        point.attributes[SpanAttributes.ELIXIR_ENTITY_NAME]: point.count
+        for point in find_metric(
+            metrics, Meters.ELIXIR_ENTITY_DURATION
+        ).data.data_points
+    }
+    assert calls == {"workflow": 3, "workflow.task": 6, "stream": 1}
+
+    (errors,) = find_metric(metrics, Meters.ELIXIR_ENTITY_ERRORS).data.data_points
+    assert errors.value == 3
+    assert errors.attributes[SpanAttributes.ELIXIR_ENTITY_NAME] == "workflow.task"
+
+
+@pytest.mark.asyncio
+async def test_cancellation_is_not_an_entity_error():
+    receivers = OTelReceivers()
+    Elixir.init(
+        disable_batch=True,
+        _test_exporter=receivers.exporter,
+        _test_metrics_reader=receivers.metrics_reader,
+    )
+
+    @aobserve(name="wait")
+    async def wait():
+        await asyncio.sleep(60)
+
+    @observe(name="interrupted")
+    def interrupted():
+        raise KeyboardInterrupt
+
+    task = asyncio.create_task(wait())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    with pytest.raises(KeyboardInterrupt):
+        interrupted()
+
+    spans = receivers.exporter.get_finished_spans()
+    assert sorted(span.name for span in spans) == ["interrupted", "wait"]
+    assert all(span.status.status_code.name == "UNSET" for span in spans)
+
+    metrics = receivers.metrics_reader.get_metrics_data()
+    calls = {
+        point.attributes[SpanAttributes.ELIXIR_ENTITY_NAME]: point.count
+        for point in find_metric(
+            metrics, Meters.ELIXIR_ENTITY_DURATION
+        ).data.data_points
+    }
+    assert calls == {"wait": 1, "interrupted": 1}
+    assert not any(
+        metric.name == Meters.ELIXIR_ENTITY_ERRORS
+        for scope_metrics in metrics.resource_metrics[0].scope_metrics
+        for metric in scope_metrics.metrics
+    )
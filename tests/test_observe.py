@@ -1,4 +1,13 @@
-from elixir.decorators import observe
+import json
+from unittest.mock import patch
+
+import pytest
+from opentelemetry import context as context_api
+
+from elixir import Elixir
+from elixir.decorators import no_observe, observe
+from elixir.tracing.serialization import EntitySerializer
+from tests.conftest import OTelReceivers
 
 
 def test_base_name(exporter):
@@ -68,3 +77,159 @@ def test_nested_tasks(exporter):
         outer_task_span.attributes["elixir.entity.name"] == "some_workflow.outer_task"
     )
     assert some_workflow_span.attributes["elixir.entity.name"] == "some_workflow"
+
+
+def test_sampled_out_skips_capture():
+    receivers = OTelReceivers()
+    Elixir.init(
+        disable_batch=True,
+        sampling_ratio=0.0,
+        _test_exporter=receivers.exporter,
+        _test_metrics_reader=receivers.metrics_reader,
+    )
+
+    @observe(name="sampled_out")
+    def run_workflow(value):
+        return value
+
+    with patch.object(EntitySerializer, "serialize") as serialize:
+        assert run_workflow("input") == "input"
+
+    serialize.assert_not_called()
+    assert receivers.exporter.get_finished_spans() == ()
+
+
+def test_context_is_restored(exporter):
+    @observe(name="task")
+    def task():
+        return
+
+    @observe(name="stream")
+    def stream():
+        task()
+        yield 1
+
+    before = context_api.get_current()
+
+    task()
+    list(stream())
+    task()
+
+    assert context_api.get_current() is before
+
+    spans = exporter.get_finished_spans()
+    assert [span.attributes["elixir.entity.name"] for span in spans] == [
+        "task",
+        "stream.task",
+        "stream",
+        "task",
+    ]
+
+
+def test_named_inputs(exporter):
+    class Agent:
+        @observe(name="respond")
+        def respond(self, message, *history, temperature=0.5, **options):
+            return message
+
+    Agent().respond("hi", "earlier", temperature=0.1, top_p=1)
+
+    spans = exporter.get_finished_spans()
+    assert json.loads(spans[0].attributes["elixir.entity.input"]) == {
+        "message": "hi",
+        "history": ["earlier"],
+        "temperature": 0.1,
+        "top_p": 1,
+    }
+
+
+def test_unnamed_entity_name(exporter):
+    @observe()
+    def run_workflow():
+        pass
+
+    run_workflow()
+
+    spans = exporter.get_finished_spans()
+    assert spans[0].attributes["elixir.entity.name"] == "run_workflow"
+
+
+@pytest.mark.asyncio
+async def test_class_instrumentation(exporter):
+    @observe()
+    class SchedulingAgent:
+        def respond(self, message):
+            return message
+
+        async def arespond(self, message):
+            return message
+
+        def stream(self):
+            yield "chunk"
+
+        @staticmethod
+        def parse(message):
+            return message
+
+        @no_observe
+        def get_name(self):
+            return "agent"
+
+        def _helper(self):
+            return
+
+    agent = SchedulingAgent()
+    agent.respond("hi")
+    await agent.arespond("hi")
+    list(agent.stream())
+    SchedulingAgent.parse("hi")
+    agent.get_name()
+    agent._helper()
+
+    spans = exporter.get_finished_spans()
+    assert [span.name for span in spans] == [
+        "scheduling_agent.respond",
+        "scheduling_agent.arespond",
+        "scheduling_agent.stream",
+        "scheduling_agent.parse",
+    ]
+    assert set(SchedulingAgent.__elixir_entities__) == {
+        "respond",
+        "arespond",
+        "stream",
+        "parse",
+    }
+
+
+def test_class_instrumentation_subset(exporter):
+    @observe(name="agent", methods=["respond"])
+    class Agent:
+        def respond(self, message):
+            return message
+
+        def other(self):
+            return
+
+    Agent().respond("hi")
+    Agent().other()
+
+    spans = exporter.get_finished_spans()
+    assert [span.name for span in spans] == ["agent.respond"]
+
+
+def test_exception_ends_span(exporter):
+    @observe(name="failing_task")
+    def failing_task():
+        raise ValueError("boom")
+
+    before = context_api.get_current()
+    with pytest.raises(ValueError):
+        failing_task()
+
+    assert context_api.get_current() is before
+
+    spans = exporter.get_finished_spans()
+    assert [span.name for span in spans] == ["failing_task"]
+    assert spans[0].status.status_code.name == "ERROR"
+    assert spans[0].attributes["error.type"] == "ValueError"
+    assert spans[0].events[0].name == "exception"
@@ -0,0 +1,118 @@
+from types import SimpleNamespace
+
+from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (
+    OTLPSpanExporter as GRPCExporter,
+)
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SpanExportResult
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from elixir import Elixir
+from elixir.decorators import observe
+from elixir.metrics.pipeline import PipelineStats, pipeline_stats
+from elixir.tracing import processors
+from elixir.tracing.processors import MonitoredBatchSpanProcessor
+from elixir.tracing.tracing import TracerWrapper, init_spans_exporter
+from tests.conftest import OTelReceivers
+
+
+def test_pipeline_stats():
+    receivers = OTelReceivers()
+    Elixir.init(
+        _test_exporter=receivers.exporter,
+        _test_metrics_reader=receivers.metrics_reader,
+    )
+    before = Elixir.pipeline_stats()
+
+    @observe(name="task")
+    def task():
+        pass
+
+    for _ in range(5):
+        task()
+    TracerWrapper.instance.flush()
+
+    stats = Elixir.pipeline_stats()
+    assert stats["spans_exported"] - before["spans_exported"] == 5
+    assert stats["queue_size"] == 0
+    assert stats["queue_capacity"] == 2048
+    assert (
+        stats["exports"]["traces"]["exports"] > before["exports"]["traces"]["exports"]
+    )
+
+    metrics = {
+        metric.name: metric
+        for scope_metrics in receivers.metrics_reader.get_metrics_data()
+        .resource_metrics[0]
+        .scope_metrics
+        for metric in scope_metrics.metrics
+    }
+    assert metrics["elixir.pipeline.spans.exported"].data.data_points[0].value >= 5
+    assert metrics["elixir.pipeline.queue.capacity"].data.data_points[0].value == 2048
+    duration = metrics["elixir.pipeline.export.duration"].data.data_points[0]
+    assert duration.attributes["signal"] == "traces"
+    assert duration.count >= 1
+
+
+def test_dropped_spans_are_counted(monkeypatch):
+    stats = PipelineStats()
+    monkeypatch.setattr(processors, "pipeline_stats", stats)
+    processor = MonitoredBatchSpanProcessor(
+        InMemorySpanExporter(),
+        max_queue_size=4,
+        max_export_batch_size=4,
+        schedule_delay_millis=60_000,
+    )
+    # Keep the worker from draining the queue
+    processor.max_export_batch_size = 100
+
+    tracer = TracerProvider().get_tracer("test")
+    for _ in range(10):
+        span = tracer.start_span("span")
+        span.end()
+        processor.on_end(span)
+
+    assert stats.snapshot()["spans_dropped"] == 6
+    processor.shutdown()
+
+
+def test_processor_without_sdk_queue():
+    # Stands in for SDK versions whose processor keeps the queue elsewhere
+    processor = SimpleNamespace()
+    assert MonitoredBatchSpanProcessor.queue_size(processor) == 0
+    assert MonitoredBatchSpanProcessor.queue_capacity(processor) == 0
+
+
+def test_bytes_sent(collector):
+    before = pipeline_stats.snapshot()["exports"]["traces"]["bytes_sent"]
+    tracer = TracerProvider().get_tracer("test")
+    span = tracer.start_span("span")
+    span.end()
+
+    init_spans_exporter(collector.endpoint, {}).export([span])
+
+    after = pipeline_stats.snapshot()["exports"]["traces"]["bytes_sent"]
+    assert after - before == collector.bytes_received > 0
+
+
+def test_grpc_bytes_sent():
+    requests = []
+
+    class Client:
+        def Export(self, request, metadata=None, timeout=None):
+            requests.append(request)
+
+    before = pipeline_stats.snapshot()["exports"]["traces"]["bytes_sent"]
+    tracer = TracerProvider().get_tracer("test")
+    span = tracer.start_span("span")
+    span.end()
+
+    exporter = init_spans_exporter("localhost:4317", {})
+    assert isinstance(exporter, GRPCExporter)
+    exporter._client = Client()
+    assert exporter.export([span]) == SpanExportResult.SUCCESS
+
+    after = pipeline_stats.snapshot()["exports"]["traces"]["bytes_sent"]
+    (request,) = requests
+    assert after - before == request.ByteSize() > 0
+    exporter.shutdown()
@@ -0,0 +1,86 @@
+import pytest
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from elixir import Elixir
+from elixir.decorators import observe
+from elixir.tracing.processors import AdaptiveBatchSpanProcessor
+from elixir.tracing.tracing import (
+    TracerWrapper,
+    init_spans_processor,
+    validate_options,
+)
+from tests.conftest import OTelReceivers
+
+
+def test_adaptive_batch_size_follows_queue_depth():
+    processor = AdaptiveBatchSpanProcessor(
+        InMemorySpanExporter(),
+        max_queue_size=1000,
+        schedule_delay_millis=5000,
+        max_export_batch_size=10,
+        max_adaptive_batch_size=100,
+    )
+
+    processor.queue.extend([None] * 250)
+    processor._adapt()
+    assert processor.max_export_batch_size == 100
+    assert processor.schedule_delay_millis == 500
+
+    processor.queue.clear()
+    processor._adapt()
+    assert 10 < processor.max_export_batch_size < 100
+    for _ in range(10):
+        processor._adapt()
+    assert processor.max_export_batch_size == 10
+    assert processor.schedule_delay_millis == 5000
+
+    processor.shutdown()
+
+
+def test_init_spans_processor_options():
+    processor = init_spans_processor(
+        InMemorySpanExporter(), max_queue_size=100, max_export_batch_size=20
+    )
+
+    assert isinstance(processor, BatchSpanProcessor)
+    assert not isinstance(processor, AdaptiveBatchSpanProcessor)
+    assert processor.max_queue_size == 100
+    assert processor.max_export_batch_size == 20
+
+    processor.shutdown()
+
+
+def test_adaptive_batching_exports_spans():
+    receivers = OTelReceivers()
+    Elixir.init(
+        adaptive_batching=True,
+        max_queue_size=512,
+        schedule_delay_millis=10_000,
+        _test_exporter=receivers.exporter,
+        _test_metrics_reader=receivers.metrics_reader,
+    )
+
+    @observe(name="task")
+    def task():
+        pass
+
+    for _ in range(300):
+        task()
+    TracerWrapper.instance.flush()
+
+    assert len(receivers.exporter.get_finished_spans()) == 300
+
+
+def test_validate_options_resolves_environment(monkeypatch):
+    validate_options(max_export_batch_size=1000)
+    monkeypatch.setenv("OTEL_BSP_MAX_QUEUE_SIZE", "500")
+    with pytest.raises(ValueError):
+        validate_options(max_export_batch_size=1000)
+    validate_options(disable_batch=True, max_export_batch_size=1000)
+
+    monkeypatch.delenv("OTEL_BSP_MAX_QUEUE_SIZE")
+    monkeypatch.setenv("OTEL_BSP_SCHEDULE_DELAY", "soon")
+    validate_options()
+    with pytest.raises(ValueError):
+        validate_options(schedule_delay_millis=0)
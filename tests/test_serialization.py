@@ -0,0 +1,131 @@
+import datetime
+import json
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+
+from elixir import Elixir
+from elixir.decorators import observe
+from elixir.tracing.deferred import CopyPolicy
+from elixir.tracing.serialization import TRUNCATED, EntitySerializer
+from elixir.tracing.tracing import TracerWrapper
+from tests.conftest import OTelReceivers
+
+
+def test_serialize_json_values():
+    serializer = EntitySerializer()
+
+    value = {"args": ["joke", 1, 2.5, None, True], "kwargs": {"subject": "otel"}}
+
+    assert json.loads(serializer.serialize(value)) == value
+
+
+def test_serialize_truncates_long_strings():
+    serializer = EntitySerializer(max_string_length=10)
+
+    result = json.loads(serializer.serialize("a" * 1000))
+
+    assert result == "a" * 10 + TRUNCATED
+
+
+def test_serialize_respects_max_bytes():
+    serializer = EntitySerializer(max_bytes=1024)
+
+    result = serializer.serialize({"context": ["x" * 500 for _ in range(100)]})
+
+    assert len(result) <= 1024 + len(TRUNCATED)
+    assert json.loads(result)["context"][-1] == TRUNCATED
+
+
+def test_serialize_truncates_depth_and_items():
+    serializer = EntitySerializer(max_depth=2, max_items=3)
+
+    result = json.loads(serializer.serialize({"a": {"b": {"c": 1}}, "l": [1, 2, 3, 4]}))
+
+    assert result == {"a": {"b": TRUNCATED}, "l": [1, 2, 3, TRUNCATED]}
+
+
+def test_serialize_unserializable_values():
+    class Custom:
+        pass
+
+    serializer = EntitySerializer()
+
+    result = json.loads(serializer.serialize({"obj": Custom(), 1: b"abc"}))
+
+    assert result == {
+        "obj": f"<{Custom.__module__}.{Custom.__qualname__}>",
+        "1": "<bytes len=3>",
+    }
+
+
+def test_serialize_standard_value_types():
+    class Color(Enum):
+        RED = "red"
+
+    serializer = EntitySerializer(max_string_length=8)
+    uuid = UUID("12345678-1234-5678-1234-567812345678")
+
+    result = json.loads(
+        serializer.serialize(
+            {
+                "uuid": uuid,
+                "at": datetime.datetime(2024, 5, 1, 12, 30),
+                "on": datetime.date(2024, 5, 1),
+                "price": Decimal("9.99"),
+                "color": Color.RED,
+            }
+        )
+    )
+
+    assert result == {
+        "uuid": "12345678" + TRUNCATED,
+        "at": "2024-05-" + TRUNCATED,
+        "on": "2024-05-" + TRUNCATED,
+        "price": "9.99",
+        "color": "red",
+    }
+    assert json.loads(EntitySerializer().serialize(uuid)) == str(uuid)
+
+
+def test_entity_input_is_truncated(exporter):
+    @observe(name="rag_task")
+    def rag_task(context: str):
+        return context
+
+    rag_task("x" * 1_000_000)
+
+    spans = exporter.get_finished_spans()
+    assert len(spans[0].attributes["elixir.entity.input"]) < 64 * 1024
+    assert len(spans[0].attributes["elixir.entity.output"]) < 64 * 1024
+
+
+def test_deferred_serialization():
+    receivers = OTelReceivers()
+    Elixir.init(
+        disable_batch=True,
+        defer_serialization=True,
+        payload_copy_policy=CopyPolicy.DEEP,
+        _test_exporter=receivers.exporter,
+        _test_metrics_reader=receivers.metrics_reader,
+    )
+
+    @observe(name="append_task")
+    def append_task(items: list):
+        items.append("task")
+        return items
+
+    items = ["input"]
+    append_task(items)
+    items.append("after")
+
+    # Deep copies are taken when the entity is called and returns
+    spans = receivers.exporter.get_finished_spans()
+    assert json.loads(spans[0].attributes["elixir.entity.input"]) == {
+        "items": ["input"]
+    }
+    assert json.loads(spans[0].attributes["elixir.entity.output"]) == [
+        "input",
+        "task",
+    ]
+    assert len(TracerWrapper.instance.deferred_payloads) == 0
@@ -0,0 +1,242 @@
+import pytest
+from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (
+    OTLPSpanExporter as GRPCExporter,
+)
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+    OTLPSpanExporter as HTTPExporter,
+)
+from opentelemetry.sdk.trace.export import SpanExportResult
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from elixir import Elixir
+from elixir.metrics.pipeline import InstrumentedSpanExporter, PipelineStats, Signal
+from elixir.tracing.spool import (
+    DEFAULT_SEGMENT_BYTES,
+    RejectedBatchError,
+    SpanSpool,
+    SpoolingSpanExporter,
+)
+from elixir.tracing.tracing import TracerWrapper
+from tests.conftest import OTelReceivers, make_spans
+
+
+def sender(sent, limit=None):
+    def send(data):
+        if limit is not None and len(sent) >= limit:
+            return False
+        sent.append(data)
+        return True
+
+    return send
+
+
+def test_spool_replays_in_order(tmp_path):
+    spool = SpanSpool(str(tmp_path), max_bytes=1024, segment_bytes=16)
+    for i in range(5):
+        spool.append(f"batch{i}".encode())
+
+    sent = []
+    assert not spool.replay(sender(sent, limit=2))
+    assert spool.replay(sender(sent))
+
+    assert sent == [b"batch0", b"batch1", b"batch2", b"batch3", b"batch4"]
+    assert len(spool) == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spool_evicts_oldest_segments(tmp_path):
+    spool = SpanSpool(str(tmp_path), max_bytes=64, segment_bytes=16)
+    for i in range(20):
+        spool.append(f"batch{i:02d}".encode())
+
+    sent = []
+    spool.replay(sender(sent))
+
+    assert spool.dropped_batches > 0
+    assert sent[-1] == b"batch19"
+    assert len(sent) + spool.dropped_batches == 20
+
+
+def test_eviction_skips_replayed_batches(tmp_path):
+    # Two 15 byte records per segment, eviction starts at the third segment
+    spool = SpanSpool(str(tmp_path), max_bytes=64, segment_bytes=16)
+    for i in range(2):
+        spool.append(f"batch{i:02d}".encode(), spans=1)
+    sent = []
+    assert not spool.replay(sender(sent, limit=1))
+
+    for i in range(2, 6):
+        spool.append(f"batch{i:02d}".encode(), spans=1)
+    assert spool.dropped_batches == 1
+    assert spool.dropped_spans == 1
+
+    assert spool.replay(sender(sent))
+    assert sent == [b"batch00", b"batch02", b"batch03", b"batch04", b"batch05"]
+
+
+def test_spool_survives_restart(tmp_path):
+    spool = SpanSpool(str(tmp_path))
+    spool.append(b"batch")
+    spool.close()
+
+    sent = []
+    assert SpanSpool(str(tmp_path)).replay(sender(sent))
+    assert sent == [b"batch"]
+
+
+def test_spooling_exporter_replays_after_outage(tmp_path, collector):
+    exporter = SpoolingSpanExporter(
+        HTTPExporter(endpoint=f"{collector.endpoint}/traces"),
+        SpanSpool(str(tmp_path)),
+        initial_backoff_seconds=0,
+    )
+
+    collector.available = False
+    exporter.export(make_spans("first"))
+    exporter.export(make_spans("second"))
+    assert collector.span_names == []
+
+    collector.available = True
+    exporter.export(make_spans("third"))
+
+    assert collector.span_names == ["first", "second", "third"]
+    exporter.shutdown()
+
+
+def test_spooled_spans_are_not_reported_as_exported(tmp_path, collector):
+    stats = PipelineStats()
+    spool = SpanSpool(str(tmp_path))
+    stats.spool = spool
+    exporter = InstrumentedSpanExporter(
+        SpoolingSpanExporter(
+            HTTPExporter(endpoint=f"{collector.endpoint}/traces"),
+            spool,
+            initial_backoff_seconds=0,
+            stats=stats,
+        ),
+        stats,
+    )
+
+    collector.available = False
+    exporter.export(make_spans("first", "second"))
+    snapshot = stats.snapshot()
+    assert snapshot["spans_exported"] == 0
+    assert snapshot["spans_spooled"] == 2
+    assert snapshot["spool"]["size_bytes"] > 0
+
+    collector.available = True
+    exporter.export(make_spans("third"))
+    snapshot = stats.snapshot()
+    assert snapshot["spans_exported"] == 3
+    assert snapshot["spans_spooled"] == 2
+    assert snapshot["spool"]["size_bytes"] == 0
+    assert snapshot["spool"]["dropped_spans"] == 0
+    exporter.shutdown()
+
+
+def test_grpc_sends_count_bytes_on_exporter_stats(tmp_path):
+    requests = []
+
+    class Client:
+        def Export(self, request, metadata=None, timeout=None):
+            requests.append(request)
+
+    stats = PipelineStats()
+    grpc_exporter = GRPCExporter(endpoint="localhost:4317", insecure=True)
+    grpc_exporter._client = Client()
+    exporter = SpoolingSpanExporter(
+        grpc_exporter, SpanSpool(str(tmp_path)), stats=stats
+    )
+
+    exporter.export(make_spans("first"))
+
+    (request,) = requests
+    assert stats.signals[Signal.TRACES].bytes_sent == request.ByteSize() > 0
+    exporter.shutdown()
+
+
+def test_force_flush_flushes_wrapped_exporter(tmp_path, collector):
+    flushes = []
+    http_exporter = HTTPExporter(endpoint=f"{collector.endpoint}/traces")
+    http_exporter.force_flush = lambda timeout_millis: flushes.append(timeout_millis)
+    exporter = SpoolingSpanExporter(http_exporter, SpanSpool(str(tmp_path)))
+
+    exporter.force_flush(1000)
+    assert flushes == [1000]
+    exporter.shutdown()
+
+
+def test_spooling_requires_otlp_exporter(tmp_path):
+    with pytest.raises(ValueError):
+        SpoolingSpanExporter(InMemorySpanExporter(), SpanSpool(str(tmp_path)))
+
+
+def test_small_spool_clamps_segment_size(tmp_path):
+    assert SpanSpool(str(tmp_path), max_bytes=1024).segment_bytes == 256
+    assert (
+        SpanSpool(str(tmp_path), max_bytes=1024**3).segment_bytes
+        == DEFAULT_SEGMENT_BYTES
+    )
+
+
+def test_small_spool_max_bytes_initializes(tmp_path):
+    receivers = OTelReceivers()
+    Elixir.init(
+        spool_directory=str(tmp_path),
+        spool_max_bytes=64 * 1024,
+        _test_metrics_reader=receivers.metrics_reader,
+    )
+    assert TracerWrapper.verify_initialized()
+
+
+def test_invalid_options_leave_no_instance(tmp_path):
+    with pytest.raises(ValueError):
+        Elixir.init(spool_directory=str(tmp_path), spool_max_bytes=0)
+    assert not hasattr(TracerWrapper, "instance")
+
+    with pytest.raises(ValueError):
+        Elixir.init(max_queue_size=10, max_export_batch_size=20)
+    assert not hasattr(TracerWrapper, "instance")
+
+
+def test_replay_drops_rejected_batches(tmp_path):
+    spool = SpanSpool(str(tmp_path))
+    for i in range(3):
+        spool.append(f"batch{i}".encode(), spans=2)
+
+    sent = []
+
+    def send(data):
+        if data == b"batch1":
+            raise RejectedBatchError("HTTP 400")
+        sent.append(data)
+        return True
+
+    assert spool.replay(send)
+    assert sent == [b"batch0", b"batch2"]
+    assert spool.dropped_batches == 1
+    assert spool.dropped_spans == 2
+    assert spool.replayed_spans == 4
+
+
+def test_spooling_exporter_drops_rejected_batches(tmp_path, collector):
+    spool = SpanSpool(str(tmp_path))
+    exporter = SpoolingSpanExporter(
+        HTTPExporter(endpoint=f"{collector.endpoint}/traces"),
+        spool,
+        initial_backoff_seconds=0,
+    )
+    collector.rejected_span_names = {"poison"}
+
+    collector.available = False
+    exporter.export(make_spans("poison"))
+    exporter.export(make_spans("first"))
+    collector.available = True
+
+    assert exporter.export(make_spans("poison")) == SpanExportResult.FAILURE
+    exporter.export(make_spans("second"))
+
+    assert collector.span_names == ["first", "second"]
+    assert spool.dropped_batches == 2
+    assert len(spool) == 0
+    exporter.shutdown()
@@ -0,0 +1,31 @@
+from elixir import Elixir
+from tests.conftest import OTelReceivers
+
+
+def test_startup_report(exporter):
+    report = Elixir.startup_report()
+
+    step_names = [step.name for step in report.steps]
+    assert step_names[:3] == ["telemetry", "tracer_provider", "spans_exporter"]
+    assert "metrics_exporter" in step_names
+    assert "metrics_provider" in step_names
+    assert any(name.startswith("instrumentor.") for name in step_names)
+    assert report.total_seconds > 0
+    assert report.to_dict()["steps"][0]["name"] == "telemetry"
+    assert len(report.slowest(2)) == 2
+
+
+def test_startup_span():
+    receivers = OTelReceivers()
+    Elixir.init(
+        disable_batch=True,
+        emit_startup_span=True,
+        _test_exporter=receivers.exporter,
+        _test_metrics_reader=receivers.metrics_reader,
+    )
+
+    spans = {span.name: span for span in receivers.exporter.get_finished_spans()}
+    parent = spans["elixir.startup"]
+    step = spans["elixir.startup.tracer_provider"]
+    assert step.parent.span_id == parent.context.span_id
+    assert "elixir.startup.memory_delta" in step.attributes
@@ -0,0 +1,101 @@
+import grpc
+import pytest
+from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (
+    OTLPSpanExporter as GRPCExporter,
+)
+from opentelemetry.exporter.otlp.proto.http import Compression as HTTPCompression
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+    OTLPSpanExporter as HTTPExporter,
+)
+
+from elixir.config.transport import Compression, ExporterOptions, Protocol
+from elixir.metrics.metrics import init_metrics_exporter
+from elixir.tracing.tracing import init_spans_exporter
+from tests.conftest import make_spans
+
+
+def test_protocol_selection():
+    assert isinstance(init_spans_exporter("http://localhost:4318", {}), HTTPExporter)
+    assert isinstance(init_spans_exporter("localhost:4317", {}), GRPCExporter)
+    assert isinstance(
+        init_spans_exporter(
+            "http://localhost:4317", {}, ExporterOptions(protocol=Protocol.GRPC)
+        ),
+        GRPCExporter,
+    )
+
+
+def test_invalid_options():
+    with pytest.raises(ValueError):
+        ExporterOptions(protocol="http/json")
+    with pytest.raises(ValueError):
+        ExporterOptions(compression="zstd")
+    with pytest.raises(ValueError):
+        ExporterOptions(keepalive_time_ms=0)
+
+
+def test_compression_is_opt_in(monkeypatch):
+    exporter = init_spans_exporter("http://localhost:4318", {})
+    assert exporter._compression is HTTPCompression.NoCompression
+
+    monkeypatch.setenv("OTEL_EXPORTER_OTLP_COMPRESSION", "gzip")
+    exporter = init_spans_exporter("http://localhost:4318", {})
+    assert exporter._compression is HTTPCompression.Gzip
+
+
+def test_grpc_channel_options(monkeypatch):
+    channels = []
+    create_channel = grpc.insecure_channel
+
+    def insecure_channel(target, options=None, compression=None):
+        channels.append((target, options, compression))
+        return create_channel(target, options, compression)
+
+    monkeypatch.setattr(grpc, "insecure_channel", insecure_channel)
+    options = ExporterOptions(
+        protocol=Protocol.GRPC,
+        compression=Compression.GZIP,
+        keepalive_time_ms=30_000,
+        grpc_channel_options=[("grpc.max_send_message_length", 1 << 22)],
+    )
+    init_spans_exporter("http://localhost:4317", {}, options)
+    init_metrics_exporter("http://localhost:4317", {}, options)
+
+    assert channels[-1] == channels[-2]
+    target, channel_options, compression = channels[-1]
+    assert target == "localhost:4317"
+    assert channel_options == [
+        ("grpc.keepalive_time_ms", 30_000),
+        ("grpc.keepalive_timeout_ms", 20_000),
+        ("grpc.max_send_message_length", 1 << 22),
+    ]
+    assert compression is grpc.Compression.Gzip
+
+
+def test_grpc_channel_without_options():
+    assert ExporterOptions().grpc_channel("http://localhost:4317") is None
+
+
+def test_http_exporters_use_pooled_sessions():
+    options = ExporterOptions(timeout=3, pool_maxsize=8)
+    spans_exporter = init_spans_exporter("http://localhost:4318", {}, options)
+    metrics_exporter = init_metrics_exporter("http://localhost:4318", {}, options)
+
+    assert spans_exporter._session is not metrics_exporter._session
+    assert spans_exporter._session.get_adapter("https://x")._pool_maxsize == 8
+    assert spans_exporter._timeout == 3
+
+
+def test_gzip_compression(collector):
+    spans = make_spans(*["llm"] * 10, attributes={"prompt": "tell me a joke " * 500})
+    sizes = {}
+    for compression in (Compression.NONE, Compression.GZIP):
+        collector.bytes_received = 0
+        exporter = init_spans_exporter(
+            collector.endpoint, {}, ExporterOptions(compression=compression)
+        )
+        exporter.export(spans)
+        sizes[compression] = collector.bytes_received
+
+    assert collector.span_names == ["llm"] * 20
+    assert sizes[Compression.GZIP] < sizes[Compression.NONE] / 10
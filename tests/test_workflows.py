@@ -34,8 +34,8 @@ def test_simple_workflow(exporter, openai_client):
 
     task_span = spans[1]
     assert json.loads(task_span.attributes["elixir.entity.input"]) == {
-        "args": ["joke"],
-        "kwargs": {"subject": "OpenTelemetry"},
+        "what": "joke",
+        "subject": "OpenTelemetry",
     }
 
     assert json.loads(task_span.attributes.get("elixir.entity.output")) == joke
@@ -95,3 +95,203 @@ async def test_unserializable_async_workflow(exporter):
 
     spans = exporter.get_finished_spans()
     assert [span.name for span in spans] == ["unserializable_task"]
+
+
+def test_generator_workflow(exporter):
+    calls = []
+
+    @observe(name="chunk_generator")
+    def chunk_generator():
+        calls.append(1)
+        yield "hello "
+        yield "world"
+
+    assert "".join(chunk_generator()) == "hello world"
+    assert len(calls) == 1
+
+    spans = exporter.get_finished_spans()
+    assert [span.name for span in spans] == ["chunk_generator"]
+    attributes = spans[0].attributes
+    assert attributes["elixir.stream.status"] == "completed"
+    assert attributes["elixir.stream.chunks"] == 2
+    assert attributes["elixir.stream.bytes"] == len("hello world")
+    assert attributes["elixir.stream.time_to_first_chunk"] >= 0
+    assert attributes["elixir.stream.chunk_latency.max"] >= 0
+
+
+def test_generator_workflow_closed_early(exporter):
+    @observe(name="chunk_generator")
+    def chunk_generator():
+        yield from range(10)
+
+    stream = chunk_generator()
+    next(stream)
+    stream.close()
+
+    spans = exporter.get_finished_spans()
+    assert spans[0].attributes["elixir.stream.status"] == "closed"
+    assert spans[0].attributes["elixir.stream.chunks"] == 1
+
+
+def test_generator_workflow_closed_before_start(exporter):
+    @observe(name="chunk_generator")
+    def chunk_generator():
+        yield from range(10)
+
+    chunk_generator().close()
+    # dropped without being iterated
+    chunk_generator()
+
+    spans = exporter.get_finished_spans()
+    assert [span.name for span in spans] == ["chunk_generator", "chunk_generator"]
+    for span in spans:
+        assert span.attributes["elixir.stream.status"] == "closed"
+        assert span.attributes["elixir.stream.chunks"] == 0
+
+
+def test_observed_function_returning_observed_generator(exporter):
+    @observe(name="chunk_generator")
+    def chunk_generator():
+        yield "hello "
+        yield "world"
+
+    @observe(name="stream")
+    def stream():
+        return chunk_generator()
+
+    assert "".join(stream()) == "hello world"
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert spans.keys() == {"chunk_generator", "stream"}
+    for span in spans.values():
+        assert span.attributes["elixir.stream.status"] == "completed"
+        assert span.attributes["elixir.stream.chunks"] == 2
+        assert "elixir.entity.output" not in span.attributes
+    assert spans["chunk_generator"].parent.span_id == spans["stream"].context.span_id
+
+
+def test_generator_workflow_send_and_throw(exporter):
+    @observe(name="echo")
+    def echo():
+        received = yield "ready"
+        while True:
+            try:
+                received = yield received
+            except ValueError:
+                received = "caught"
+
+    @observe(name="counter")
+    def counter():
+        total = 0
+        while True:
+            value = yield total
+            if value is None:
+                return total
+            total += value
+
+    stream = echo()
+    assert next(stream) == "ready"
+    assert stream.send("a") == "a"
+    assert stream.throw(ValueError("boom")) == "caught"
+    stream.close()
+
+    stream = counter()
+    next(stream)
+    stream.send(2)
+    with pytest.raises(StopIteration) as stop:
+        stream.send(None)
+    assert stop.value.value == 2
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert spans["echo"].attributes["elixir.stream.status"] == "closed"
+    assert spans["echo"].status.status_code.name == "UNSET"
+    assert spans["counter"].attributes["elixir.stream.status"] == "completed"
+
+
+def test_generator_workflow_error(exporter):
+    @observe(name="chunk_generator")
+    def chunk_generator():
+        yield "hello"
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        list(chunk_generator())
+
+    spans = exporter.get_finished_spans()
+    assert spans[0].attributes["elixir.stream.status"] == "error"
+    assert spans[0].status.status_code.name == "ERROR"
+
+
+@pytest.mark.asyncio
+async def test_async_generator_workflow(exporter):
+    calls = []
+
+    @aobserve(name="token_generator")
+    async def token_generator():
+        calls.append(1)
+        yield "hello "
+        yield "world"
+
+    assert "".join([part async for part in token_generator()]) == "hello world"
+    assert len(calls) == 1
+
+    spans = exporter.get_finished_spans()
+    assert [span.name for span in spans] == ["token_generator"]
+    attributes = spans[0].attributes
+    assert attributes["elixir.stream.status"] == "completed"
+    assert attributes["elixir.stream.chunks"] == 2
+    assert attributes["elixir.stream.time_to_first_chunk"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_async_generator_workflow_closed_early(exporter):
+    @aobserve(name="token_generator")
+    async def token_generator():
+        for i in range(10):
+            yield i
+
+    stream = token_generator()
+    await stream.__anext__()
+    await stream.aclose()
+
+    spans = exporter.get_finished_spans()
+    assert spans[0].attributes["elixir.stream.status"] == "closed"
+    assert spans[0].attributes["elixir.stream.chunks"] == 1
+
+
+@pytest.mark.asyncio
+async def test_async_generator_workflow_closed_before_start(exporter):
+    @aobserve(name="token_generator")
+    async def token_generator():
+        for i in range(10):
+            yield i
+
+    await token_generator().aclose()
+
+    spans = exporter.get_finished_spans()
+    assert [span.name for span in spans] == ["token_generator"]
+    assert spans[0].attributes["elixir.stream.status"] == "closed"
+    assert spans[0].attributes["elixir.stream.chunks"] == 0
+
+
+@pytest.mark.asyncio
+async def test_async_observed_function_returning_observed_generator(exporter):
+    @aobserve(name="token_generator")
+    async def token_generator():
+        received = yield "ready"
+        yield received
+
+    @aobserve(name="stream")
+    async def stream():
+        return token_generator()
+
+    tokens = await stream()
+    assert await tokens.__anext__() == "ready"
+    assert await tokens.asend("hello") == "hello"
+    await tokens.aclose()
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert spans.keys() == {"token_generator", "stream"}
+    for span in spans.values():
+        assert span.attributes["elixir.stream.chunks"] == 2
+        assert "elixir.entity.output" not in span.attributes